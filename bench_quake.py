@@ -0,0 +1,454 @@
+# bench_quake.py
+"""
+Checks and benchmarks for the earthquake feed helpers, run against the
+local usgs_standin server (no network needed).
+
+    python bench_quake.py cache --events 10000
+    python bench_quake.py stream --events 100000 --limit 5
+    python bench_quake.py stream --events 100000 --rate 2000000
+    python bench_quake.py feeds --events 20000 --latency 0.2 --fail-rate 0.1
+    python bench_quake.py store --events 15000
+    python bench_quake.py spatial --events 100000 --queries 200
+    python bench_quake.py table --events 100000
+    python bench_quake.py poll --events 10000
+"""
+
+import argparse
+import collections
+import heapq
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import quakeasync
+import quakefetch
+import quakeindex
+import quakepoll
+import quakestore
+import quakestream
+import quaketable
+import usgs_standin
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+# ---------------------- conditional GET cache ----------------------
+def bench_cache(args):
+    catalog = usgs_standin.make_catalog(args.events)
+    cache_dir = tempfile.mkdtemp()
+    try:
+        with usgs_standin.StandinServer(catalog, max_age=args.max_age) as server:
+            url = server.url("all_week")
+            cache = quakefetch.FeedCache(cache_dir)
+            session = quakefetch.make_session()
+
+            def step(label, expect, requests, **kwargs):
+                before_bytes, before_hits = server.bytes_sent, sum(server.hits.values())
+                resp, elapsed = timed(quakefetch.fetch, url, session=session, cache=cache, **kwargs)
+                requests_made = sum(server.hits.values()) - before_hits
+                wire = server.bytes_sent - before_bytes
+                print(f"  {label:<28} {resp.source:<12} {requests_made:>3} {wire:>12,} "
+                      f"{elapsed * 1e3:>9.2f}ms")
+                assert resp.source == expect, f"{label}: {resp.source}, expected {expect}"
+                assert requests_made == requests, f"{label}: {requests_made} requests"
+                if expect != "network":
+                    assert wire == 0, f"{label}: {wire} body bytes sent"
+                return resp, wire
+
+            print(f"{'':2}{'step':<28} {'source':<12} {'req':>3} {'bytes on wire':>12} {'time':>11}")
+            raw, packed, etag, _ = server.body("all_week")
+            first, wire = step("cold", "network", 1)
+            assert first.content == raw, "gzip body should be cached decoded"
+            assert wire == len(packed) < len(raw), "body should travel gzipped"
+            assert step("within max-age", "cache", 0)[0].content == raw
+            assert step("forced, unchanged", "revalidated", 1, force=True)[0].content == raw
+            server.max_age = 0
+            step("expired, unchanged", "revalidated", 1, force=True)
+            assert step("max-age=0, unchanged", "revalidated", 1)[0].content == raw
+            assert cache.load(url)[0]["etag"] == etag
+            server.set_catalog(usgs_standin.make_catalog(args.events, seed=2))
+            changed, _ = step("expired, feed changed", "network", 1)
+            raw, _, new_etag, _ = server.body("all_week")
+            assert new_etag != etag and cache.load(url)[0]["etag"] == new_etag
+            assert changed.content == raw and first.json()["features"] != changed.json()["features"]
+            step("max-age=0, new copy", "revalidated", 1)
+
+            # stream=True: features parse from the network chunks, then the body is cached
+            server.set_catalog(usgs_standin.make_catalog(args.events, seed=3))
+            raw = server.body("all_week")[0]
+            streamed = quakefetch.fetch(url, session=session, cache=cache, stream=True)
+            assert streamed.source == "network" and cache.load(url)[1] != raw
+            parsed = sum(1 for _ in quakestream.iter_features(streamed.iter_content()))
+            assert parsed == len(json.loads(raw)["features"])
+            assert streamed.finish() == raw and cache.load(url)[1] == raw
+            assert step("streamed copy cached", "revalidated", 1)[0].content == raw
+            print(f"  uncompressed body {len(raw):,} bytes; statuses {server.status_counts}")
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+# ---------------------- streaming parser ----------------------
+def _peak_rss_mb():
+    # VmHWM is reset by exec; ru_maxrss can carry over the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def bench_stream_child(args):
+    """One measurement in a fresh process (peak RSS is per process)."""
+    session = quakefetch.make_session()
+    base = _peak_rss_mb()
+    start = time.perf_counter()
+    first = None
+    if args.mode == "json":
+        data = session.get(args.url, timeout=60).json()
+        for quake in data["features"][:args.limit]:
+            first = first or time.perf_counter()
+            quakestream.compact(quake)
+    else:
+        for quake in quakestream.stream_url(args.url, session=session, limit=args.limit):
+            first = first or time.perf_counter()
+    total = time.perf_counter() - start
+    print(json.dumps({"first": first - start, "total": total,
+                      "peak_mb": _peak_rss_mb(), "base_mb": base}))
+
+
+def bench_stream(args):
+    catalog = usgs_standin.make_catalog(args.events)
+    with usgs_standin.StandinServer(catalog, rate=args.rate) as server:
+        url = server.url("all_month")
+        size = len(server.body("all_month")[0])
+        wire = len(server.body("all_month")[1])
+        print(f"all_month: {args.events:,} events, {size / 2 ** 20:.1f} MB JSON, "
+              f"{wire / 2 ** 20:.1f} MB gzipped, first {args.limit} features")
+        print(f"{'':2}{'approach':<24} {'first result':>12} {'total':>9} {'peak RSS':>10} {'over base':>10}")
+        for mode, label in (("json", ".json()[:limit]"), ("stream", "quakestream")):
+            out = subprocess.run(
+                [sys.executable, __file__, "stream-child", "--mode", mode, "--url", url,
+                 "--limit", str(args.limit)],
+                check=True, capture_output=True, text=True).stdout
+            r = json.loads(out)
+            print(f"  {label:<24} {r['first'] * 1e3:>10.1f}ms {r['total']:>8.3f}s "
+                  f"{r['peak_mb']:>8.1f}MB {r['peak_mb'] - r['base_mb']:>8.1f}MB")
+
+
+# ---------------------- concurrent feeds ----------------------
+def _serial_events(urls, session):
+    seen = {}
+    for url in urls:
+        for attempt in range(4):
+            resp = session.get(url, timeout=30)
+            if resp.status_code not in quakeasync.RETRY_STATUSES:
+                break
+            time.sleep(0.25 * 2 ** attempt)
+        resp.raise_for_status()
+        for quake in quakestream.iter_quakes([resp.content]):
+            old = seen.get(quake.id)
+            if old is None or (quake.updated or -1) > (old.updated or -1):
+                seen[quake.id] = quake
+    return list(seen.values())
+
+
+def bench_feeds(args):
+    catalog = usgs_standin.make_catalog(args.events)
+    with usgs_standin.StandinServer(catalog, latency=args.latency,
+                                    fail_rate=args.fail_rate, seed=3) as server:
+        urls = quakeasync.feed_urls(base=server.base_url)
+        for feed in usgs_standin.FEEDS:
+            server.body(feed)  # build bodies up front so neither side pays for it
+        print(f"{len(urls)} feeds, {args.events:,} events, {args.latency * 1e3:.0f} ms latency, "
+              f"{args.fail_rate:.0%} of requests answered 503")
+        serial, serial_t = timed(_serial_events, urls, quakefetch.make_session())
+        errors = []
+        merged, async_t = timed(quakeasync.merged_events, urls, errors)
+        assert set(merged) == set(serial), "merged streams differ"
+        assert len(merged) == len({q.id for q in merged}), "duplicate ids"
+        print(f"  serial (requests)  {serial_t:8.3f}s  {len(serial):,} distinct events")
+        print(f"  asyncio            {async_t:8.3f}s  {len(merged):,} distinct events"
+              f"   x{serial_t / async_t:.1f}   failed feeds: {len(errors)}")
+        print(f"  server statuses {server.status_counts}")
+
+        # one feed now carries a revision of the newest event, the others the old copy
+        newest = max(catalog, key=lambda f: f["properties"]["time"])
+        props = dict(newest["properties"], mag=newest["properties"]["mag"] + 1,
+                     updated=newest["properties"]["updated"] + 1)
+        stale = dict(server._bodies)
+        server.fail_rate = 0
+        server.set_catalog([dict(f, properties=props) if f is newest else f for f in catalog])
+        server.body("all_month")
+        server._bodies.update((feed, body) for feed, body in stale.items() if feed != "all_month")
+        merged = {q.id: q for q in quakeasync.merged_events(urls)}
+        assert merged[newest["id"]].updated == props["updated"], "kept an older copy"
+
+
+# ---------------------- event store ----------------------
+def _scan_bbox(features, min_lon, min_lat, max_lon, max_lat):
+    return [f for f in features
+            if min_lon <= f["geometry"]["coordinates"][0] <= max_lon
+            and min_lat <= f["geometry"]["coordinates"][1] <= max_lat]
+
+
+def bench_store(args):
+    features = usgs_standin.make_catalog(args.events)  # a month of events
+    tmp = tempfile.mkdtemp()
+    try:
+        store = quakestore.EventStore(f"{tmp}/quakes.db")
+        written, cold_t = timed(store.ingest_features, features)
+        _, again_t = timed(store.ingest_features, features)
+        rng = random.Random(4)
+        revised = [dict(f, properties=dict(f["properties"], mag=f["properties"]["mag"] + 0.1,
+                                           updated=f["properties"]["updated"] + 1))
+                   for f in rng.sample(features, len(features) // 10)]
+        _, revise_t = timed(store.ingest_features, revised)
+        print(f"{args.events:,} events (one month)")
+        print(f"  first ingest    {cold_t * 1e3:8.1f} ms  ({written:,} rows)")
+        print(f"  same feed again {again_t * 1e3:8.1f} ms")
+        print(f"  {len(revised):,} revised     {revise_t * 1e3:8.1f} ms")
+
+        # what the store should now hold: the feed with the revisions applied
+        features = list({f["id"]: f for f in features + revised}.values())
+        now = max(f["properties"]["time"] for f in features)
+        day = 86400 * 1000
+        queries = [
+            ("last day", lambda: store.window(now - day, now + 1),
+             lambda: [f for f in features if f["properties"]["time"] >= now - day]),
+            ("mag >= 4.5", lambda: store.above(4.5),
+             lambda: [f for f in features if f["properties"]["mag"] >= 4.5]),
+            ("California box", lambda: store.in_bbox(-125, 32, -114, 42),
+             lambda: _scan_bbox(features, -125, 32, -114, 42)),
+            ("box, last week, M2.5+", lambda: store.in_bbox(-60, -40, 60, 40, now - 7 * day, 2.5),
+             lambda: [f for f in _scan_bbox(features, -60, -40, 60, 40)
+                      if f["properties"]["time"] >= now - 7 * day and f["properties"]["mag"] >= 2.5]),
+        ]
+        print(f"  {'query':<22} {'rows':>6} {'sqlite':>10} {'list scan':>10}")
+        for label, query, scan in queries:
+            rows, db_t = timed(query)
+            expected, scan_t = timed(scan)
+            assert len(rows) == len(expected), label
+            print(f"  {label:<22} {len(rows):>6} {db_t * 1e3:>8.2f}ms {scan_t * 1e3:>8.2f}ms")
+
+        # a copy without "updated" (e.g. from quakestream) is older than any stamped one
+        newest = revised[0]
+        stale = dict(newest, properties=dict(newest["properties"], updated=None, mag=-1.0))
+        store.ingest_features([stale])
+        assert store.get(newest["id"]).mag == newest["properties"]["mag"], "NULL updated overwrote a row"
+        store.close()
+    finally:
+        shutil.rmtree(tmp)
+
+
+# ---------------------- spatial index ----------------------
+def _brute_nearest(quakes, lon, lat, k):
+    return heapq.nsmallest(k, ((quakeindex.haversine_km(lon, lat, q.lon, q.lat), q.id) for q in quakes))
+
+
+def _brute_within(quakes, lon, lat, km):
+    return [q for q in quakes if quakeindex.haversine_km(lon, lat, q.lon, q.lat) <= km]
+
+
+def bench_spatial(args):
+    rng = random.Random(5)
+    quakes = [quakestream.compact(f) for f in usgs_standin.make_catalog(args.events)]
+    sites = [(rng.uniform(-180, 180), rng.uniform(-70, 70)) for _ in range(args.queries)]
+    brute_sites = sites[:max(1, args.queries // 10)]  # a full scan per query is slow
+
+    index, build_t = timed(quakeindex.QuakeIndex, quakes)
+    print(f"{args.events:,} events; bulk build {build_t:.2f}s")
+    print(f"  {'query':<22} {'index':>10} {'brute force':>12} {'speed-up':>9}")
+    for label, fast, slow in (
+        ("nearest 10", lambda s: index.nearest(*s, k=10),
+         lambda s: _brute_nearest(quakes, *s, 10)),
+        ("within 200 km", lambda s: index.within(*s, 200),
+         lambda s: _brute_within(quakes, *s, 200)),
+    ):
+        for s in brute_sites:
+            got, expected = fast(s), slow(s)
+            assert len(got) == len(expected), label
+        _, fast_t = timed(lambda: [fast(s) for s in sites])
+        _, slow_t = timed(lambda: [slow(s) for s in brute_sites])
+        fast_ms = fast_t / len(sites) * 1e3
+        slow_ms = slow_t / len(brute_sites) * 1e3
+        print(f"  {label:<22} {fast_ms:>8.3f}ms {slow_ms:>10.2f}ms {slow_ms / fast_ms:>8.0f}x")
+
+    extra = [q._replace(id=f"new{i}") for i, q in enumerate(quakes[:args.events // 2])]
+    rebuilds = index.rebuilds
+    _, insert_t = timed(lambda: [index.insert(q) for q in extra])
+    _, after_t = timed(lambda: [index.nearest(*s, k=10) for s in sites])
+    print(f"  {len(extra):,} incremental inserts {insert_t:.2f}s "
+          f"({insert_t / len(extra) * 1e6:.0f} us each, {index.rebuilds - rebuilds} rebuilds); "
+          f"nearest 10 afterwards {after_t / len(sites) * 1e3:.3f}ms")
+
+
+# ---------------------- columnar table ----------------------
+def _retained(build):
+    """(object, bytes still allocated by build() once it returns)."""
+    tracemalloc.start()
+    try:
+        obj = build()
+        return obj, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def _dict_buckets(features, bucket_ms):
+    buckets = {}
+    for f in features:
+        p = f["properties"]
+        b = buckets.setdefault(p["time"] // bucket_ms, [0, float("-inf"), 0.0])
+        b[0] += 1
+        b[1] = max(b[1], p["mag"])
+        b[2] += p["mag"]
+    return buckets
+
+
+def bench_table(args):
+    body = json.dumps(usgs_standin.feed_document(
+        usgs_standin.make_catalog(args.events), "all_month")).encode()
+    features, dict_bytes = _retained(lambda: json.loads(body)["features"])
+    table, table_bytes = _retained(lambda: quaketable.EventTable.from_chunks(
+        body[i:i + 65536] for i in range(0, len(body), 65536)))
+    print(f"{len(table):,} events")
+    print(f"  memory: dict-of-dicts {dict_bytes / 2 ** 20:8.1f} MB   "
+          f"columns {table_bytes / 2 ** 20:6.1f} MB   x{dict_bytes / table_bytes:.0f}")
+
+    now = int(table.time.max())
+    day = 86400 * 1000
+    queries = [
+        ("M4.5+ in last week",
+         lambda: table.filter(min_mag=4.5, since=now - 7 * day),
+         lambda: [f for f in features
+                  if f["properties"]["mag"] >= 4.5 and f["properties"]["time"] >= now - 7 * day]),
+        ("box + depth < 70 km",
+         lambda: table.filter(bbox=(-125, 32, -114, 42), max_depth=70),
+         lambda: [f for f in features
+                  if -125 <= f["geometry"]["coordinates"][0] <= -114
+                  and 32 <= f["geometry"]["coordinates"][1] <= 42
+                  and f["geometry"]["coordinates"][2] <= 70]),
+        ("top 10 by mag", lambda: table.top_k(10),
+         lambda: heapq.nlargest(10, features, key=lambda f: f["properties"]["mag"])),
+        ("mag histogram", lambda: table.mag_histogram(0.5),
+         lambda: collections.Counter(f["properties"]["mag"] // 0.5 for f in features)),
+        ("hourly buckets", lambda: table.time_buckets(3600 * 1000),
+         lambda: _dict_buckets(features, 3600 * 1000)),
+    ]
+    print(f"  {'query':<22} {'columns':>10} {'dict loop':>10} {'speed-up':>9}")
+    for label, fast, slow in queries:
+        _, fast_t = timed(lambda: [fast() for _ in range(10)])
+        _, slow_t = timed(lambda: [slow() for _ in range(10)])
+        print(f"  {label:<22} {fast_t * 100:>8.2f}ms {slow_t * 100:>8.2f}ms {slow_t / fast_t:>8.0f}x")
+    assert len(queries[0][1]()) == len(queries[0][2]())
+    assert len(queries[1][1]()) == len(queries[1][2]())
+
+
+# ---------------------- incremental polling ----------------------
+def _revise(catalog, rng, revised, added, seq):
+    """Copy of catalog with `revised` events updated and `added` new ones, plus their ids."""
+    catalog = list(catalog)
+    changed = set()
+    for i in rng.sample(range(len(catalog)), revised):
+        f = catalog[i]
+        props = dict(f["properties"], mag=round(f["properties"]["mag"] + 0.1, 2),
+                     updated=f["properties"]["updated"] + 60000)
+        catalog[i] = dict(f, properties=props)
+        changed.add(f["id"])
+    now = catalog[0]["properties"]["time"] + 1000
+    fresh = [usgs_standin.make_feature(rng, now, 60, seq + i) for i in range(added)]
+    changed.update(f["id"] for f in fresh)
+    fresh.sort(key=lambda f: f["properties"]["time"], reverse=True)
+    return fresh + catalog, changed
+
+
+def _full_cycle(url, session, cache):
+    """What the loop did before: decode and report every event, every time."""
+    feed = quakefetch.fetch(url, session=session, cache=cache)
+    return [f"Magnitude {q.mag} - {q.place}" for q in map(quakestream.compact, feed.json()["features"])]
+
+
+def _cpu(fn, *args):
+    start = time.thread_time()  # this thread only, not the stand-in server's
+    result = fn(*args)
+    return result, time.thread_time() - start
+
+
+def bench_poll(args):
+    rng = random.Random(6)
+    catalog = usgs_standin.make_catalog(args.events)
+    tmp = tempfile.mkdtemp()
+    try:
+        with usgs_standin.StandinServer(catalog, max_age=0) as server:
+            url = server.url("all_month")
+            session = quakefetch.make_session()
+            full_cache = quakefetch.FeedCache(f"{tmp}/full")
+            poller = quakepoll.FeedPoller(url, lambda changes: None, quakepoll.PollState(f"{tmp}/state"),
+                                          session=session)
+            print(f"all_month, {args.events:,} events; CPU per cycle in the polling thread")
+            print(f"  {'cycle':<24} {'changes':>8} {'full reprocess':>15} {'poller':>10}")
+            seq = args.events
+            expected = {f["id"] for f in catalog}
+            for label, revised, added in (("first poll", 0, 0), ("feed unchanged", 0, 0),
+                                          ("1 new", 0, 1), ("10 revised + 5 new", 10, 5),
+                                          ("100 revised + 20 new", 100, 20),
+                                          ("1000 revised + 100 new", 1000, 100)):
+                if revised or added:
+                    catalog, expected = _revise(catalog, rng, revised, added, seq)
+                    seq += added
+                    server.set_catalog(catalog)
+                server.body("all_month")  # built by the server up front, outside the timings
+                changes, poll_t = _cpu(poller.poll)
+                _, full_t = _cpu(_full_cycle, url, session, full_cache)
+                assert {c.feature["id"] for c in changes} == expected, label
+                expected = set()
+                print(f"  {label:<24} {len(changes):>8,} {full_t * 1e3:>13.1f}ms {poll_t * 1e3:>8.2f}ms")
+
+            restarted, load_t = timed(quakepoll.PollState, f"{tmp}/state")
+            # ids that aged out of the feed stay in the log until it is compacted
+            assert all(restarted.seen.get(i) == u for i, u in poller.state.seen.items())
+            print(f"  state reload {load_t * 1e3:.1f} ms, {len(restarted.seen):,} ids, "
+                  f"log {os.path.getsize(f'{tmp}/state'):,} bytes")
+    finally:
+        shutil.rmtree(tmp)
+
+
+BENCHES = {
+    "cache": bench_cache,
+    "feeds": bench_feeds,
+    "poll": bench_poll,
+    "spatial": bench_spatial,
+    "table": bench_table,
+    "store": bench_store,
+    "stream": bench_stream,
+    "stream-child": bench_stream_child,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bench", choices=sorted(BENCHES))
+    parser.add_argument("--events", type=int, default=10000, help="events in the stand-in catalog")
+    parser.add_argument("--max-age", type=int, default=60, help="Cache-Control max-age the server sends")
+    parser.add_argument("--limit", type=int, default=5, help="features wanted by the stream bench")
+    parser.add_argument("--rate", type=int, default=None, help="stand-in send rate, bytes/s")
+    parser.add_argument("--queries", type=int, default=200, help="query sites for the spatial bench")
+    parser.add_argument("--latency", type=float, default=0.2, help="stand-in latency per request, s")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--mode", choices=("json", "stream"), help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    BENCHES[args.bench](args)
@@ -1,9 +1,43 @@
-import requests
+import sys
+
+import quakefetch
+import quakeindex
+import quakepoll
+import quakestore
+import quakestream
 
 url = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/all_day.geojson"
-data = requests.get(url).json()
+# disk-cached; an unchanged feed costs a 304 (or nothing) instead of a download,
+# and a download is parsed feature by feature as its chunks arrive
+feed = quakefetch.fetch(url, stream=True)
+
+# events are kept across runs in quakes.db; only new downloads need ingesting
+store = quakestore.EventStore()
+if feed.source == "network" or store.count() == 0:
+    store.ingest_features(quakestream.iter_features(feed.iter_content()))
+    feed.finish()  # the parser stops at the last feature; read the rest so it is cached
+
+# python "earthquake live.py" --poll: keep polling, print only new or revised quakes
+if sys.argv[1:] == ["--poll"]:
+    to_store = quakepoll.store_sink(store)
+
+    def sink(changes):
+        to_store(changes)
+        quakepoll.print_changes(changes)
+
+    try:
+        quakepoll.FeedPoller(url, sink).run()
+    except KeyboardInterrupt:
+        pass
+    sys.exit()
+
+for quake in store.recent(5):
+    print(f"🌋 Magnitude {quake.mag} - {quake.place}")
 
-for quake in data["features"][:5]:
-    place = quake["properties"]["place"]
-    mag = quake["properties"]["mag"]
-    print(f"🌋 Magnitude {mag} - {place}")
\ No newline at end of file
+# python "earthquake live.py" <lat> <lon>: the 10 stored quakes nearest to a site
+if len(sys.argv) == 3:
+    lat, lon = float(sys.argv[1]), float(sys.argv[2])
+    index = quakeindex.QuakeIndex(store.window(0))
+    print(f"\nNearest to ({lat}, {lon}):")
+    for km, quake in index.nearest(lon, lat, k=10):
+        print(f"📍 {km:7.1f} km  Magnitude {quake.mag} - {quake.place}")
\ No newline at end of file
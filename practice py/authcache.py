@@ -0,0 +1,189 @@
+# authcache.py
+"""
+In-process cache for user lookups (used by kunal.verify_user).
+
+UserCache = TTL + size-bounded LRU of username -> stored password (or None
+for "no such user"), fronted by a Bloom filter over every known username so
+lookups of unknown names are rejected without touching the database.
+
+The filter only learns of users registered through this cache (added()).
+One inserted by another process is missing from it, so the filter is
+rebuilt from load_all() once it is `bloom_ttl` seconds old (default: the
+entry ttl, so a stale "no such user" lasts no longer than a cached one).
+The rebuild runs outside the cache lock; lookups keep using the old
+filter until the new one is swapped in.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class BloomFilter:
+    """Plain bit-array Bloom filter with double hashing."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def saturated(self):
+        return self.count > self.capacity
+
+
+class UserCache:
+    """Thread-safe username lookup cache with hit/miss counters.
+
+    load_one(username) -> password or None  fetches a single user on a miss
+    load_all() -> iterable of usernames     seeds (and re-seeds) the Bloom filter
+    """
+
+    def __init__(self, load_one, load_all, max_size=1024, ttl=300.0, error_rate=0.01,
+                 bloom_ttl=None):
+        self._load_one = load_one
+        self._load_all = load_all
+        self.max_size = max_size
+        self.ttl = ttl
+        self.bloom_ttl = ttl if bloom_ttl is None else bloom_ttl
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # username -> (value, expires_at)
+        self._bloom = None
+        self._bloom_expires = 0.0
+        self._bloom_epoch = 0  # bumped by invalidate(); a build begun before it is dropped
+        self._building = threading.Lock()  # one load_all() at a time, never under _lock
+        self._added_during_build = None
+        self._generation = 0  # bumped on every write so in-flight loads can't cache stale rows
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "bloom_rejects": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "bloom_rebuilds": 0,
+        }
+
+    def _bloom_stale(self, now):
+        # called with the lock held
+        return self._bloom is None or self._bloom.saturated or now >= self._bloom_expires
+
+    def _current_bloom(self, now):
+        """The filter to check against, rebuilt (outside _lock) when due."""
+        with self._lock:
+            bloom = self._bloom
+            if not self._bloom_stale(now):
+                return bloom
+        # with an old filter to fall back on, leave the rebuild to whoever started it
+        if not self._building.acquire(blocking=bloom is None):
+            return bloom
+        try:
+            with self._lock:
+                if not self._bloom_stale(now):
+                    return self._bloom  # another thread just rebuilt it
+                epoch = self._bloom_epoch
+                self._added_during_build = []
+            try:
+                names = list(self._load_all())
+            except BaseException:
+                with self._lock:
+                    self._added_during_build = None
+                raise
+            bloom = BloomFilter(max(1024, 2 * len(names)), self.error_rate)
+            for name in names:
+                bloom.add(name)
+            with self._lock:
+                for name in self._added_during_build:
+                    bloom.add(name)
+                self._added_during_build = None
+                if epoch == self._bloom_epoch:
+                    self._bloom = bloom
+                    self._bloom_expires = time.monotonic() + self.bloom_ttl
+                self.stats["bloom_rebuilds"] += 1
+            return bloom
+        finally:
+            self._building.release()
+
+    def get(self, username):
+        """Stored password for username, or None if the user does not exist."""
+        now = time.monotonic()
+        bloom = self._current_bloom(now)
+        with self._lock:
+            if username not in bloom:
+                self.stats["bloom_rejects"] += 1
+                return None
+            entry = self._entries.get(username, MISSING)
+            if entry is not MISSING:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(username)
+                    self.stats["hits"] += 1
+                    return value
+                del self._entries[username]
+                self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            generation = self._generation
+        value = self._load_one(username)
+        self._store(username, value, now + self.ttl, generation)
+        return value
+
+    def _store(self, username, value, expires_at, generation):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[username] = (value, expires_at)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def added(self, username):
+        """Record a newly registered user: drop stale entries, extend the filter."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(username, None)
+            if self._bloom is not None:
+                self._bloom.add(username)
+            if self._added_during_build is not None:
+                self._added_during_build.append(username)
+
+    def invalidate(self, username=None):
+        """Forget one user, or everything (filter included) when username is None."""
+        with self._lock:
+            self._generation += 1
+            if username is None:
+                self._entries.clear()
+                self._bloom = None
+                self._bloom_epoch += 1
+            else:
+                self._entries.pop(username, None)
+
+    def snapshot(self):
+        with self._lock:
+            snap = dict(self.stats)
+            snap["size"] = len(self._entries)
+            snap["bloom_count"] = self._bloom.count if self._bloom else 0
+        return snap
@@ -0,0 +1,157 @@
+# bench_calc.py
+"""
+Benchmarks for the calcexpr.py evaluator against eval().
+
+    python bench_calc.py throughput --exprs 2000 --repeat 20
+    python bench_calc.py typing --terms 200
+    python bench_calc.py limits
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import calcexpr
+
+SAFE_GLOBALS = {"__builtins__": None}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def random_expr(rng, terms):
+    parts = [str(rng.randint(1, 999))]
+    for _ in range(terms - 1):
+        parts.append(rng.choice("+-*/"))
+        if rng.random() < 0.2:
+            parts.append(f"({rng.randint(1, 99)}{rng.choice('+*')}{rng.randint(1, 99)})")
+        else:
+            parts.append(str(rng.randint(1, 999)))
+    return " ".join(parts)
+
+
+def _eval_all(exprs):
+    for e in exprs:
+        eval(e, SAFE_GLOBALS, {})
+
+
+def _parse_all(exprs):
+    for e in exprs:
+        calcexpr.evaluate_ast(calcexpr.parse(e))
+
+
+def _evaluate_all(exprs):
+    for e in exprs:
+        calcexpr.evaluate(e)
+
+
+# ---------------------- "=" presses ----------------------
+def bench_throughput(args):
+    rng = random.Random(1)
+    unique = [random_expr(rng, rng.randint(2, 12)) for _ in range(args.exprs)]
+    # calculator traffic repeats itself: the same expressions come back
+    workload = unique * args.repeat
+    rng.shuffle(workload)
+    calcexpr.CACHE_SIZE = max(calcexpr.CACHE_SIZE, len(unique))
+    eval_t = timed(_eval_all, workload)
+    parse_t = timed(_parse_all, workload)
+    cached_t = timed(_evaluate_all, workload)
+    n = len(workload)
+    print(f"{n:,} evaluations of {len(unique):,} distinct expressions")
+    print(f"  eval()            {eval_t:8.3f}s  {n / eval_t:>10,.0f}/s")
+    print(f"  parse every time  {parse_t:8.3f}s  {n / parse_t:>10,.0f}/s")
+    print(f"  LRU compiled      {cached_t:8.3f}s  {n / cached_t:>10,.0f}/s"
+          f"   x{eval_t / cached_t:.1f} vs eval")
+
+
+# ---------------------- live preview ----------------------
+def bench_typing(args):
+    rng = random.Random(2)
+    text = random_expr(rng, args.terms)
+    prefixes = [text[:i] for i in range(1, len(text) + 1)]
+
+    def with_eval():
+        for p in prefixes:
+            try:
+                eval(p, SAFE_GLOBALS, {})
+            except (SyntaxError, ZeroDivisionError):
+                pass
+
+    def with_parse():
+        for p in prefixes:
+            try:
+                calcexpr.parse(p)
+            except calcexpr.CalcError:
+                pass
+
+    def with_live():
+        live = calcexpr.LivePreview()
+        for p in prefixes:
+            try:
+                live.evaluate(p)
+            except calcexpr.CalcError:
+                pass
+
+    eval_t = timed(with_eval)
+    parse_t = timed(with_parse)
+    live_t = timed(with_live)
+    print(f"typing {len(text):,} characters ({args.terms} terms), preview after each key")
+    print(f"  eval()            {eval_t:8.3f}s")
+    print(f"  full re-parse     {parse_t:8.3f}s")
+    print(f"  LivePreview       {live_t:8.3f}s   x{eval_t / live_t:.1f} vs eval")
+
+
+# ---------------------- cost limits ----------------------
+def bench_limits(args):
+    cases = ["9**9**9", "10**1000000", "2**99999 * 2**99999 * 3", "(10**5000)**30",
+             "9**5000", "10**4400", "2**13999 * 2", "-" * 1000 + "1", "(" * 1000 + "1" + ")" * 1000,
+             "2**1" + "0" * 400, "3 * 2**" + "9" * 400]
+    for text in cases:
+        for label, run in (("evaluate", calcexpr.evaluate), ("preview", calcexpr.LivePreview().evaluate)):
+            start = time.perf_counter()
+            try:
+                # what CalculatorFrame does; anything but CalcError would escape into Tk
+                calcexpr.format_result(run(text))
+                outcome = "ok"
+            except calcexpr.CalcError as e:
+                outcome = str(e)
+            elapsed = time.perf_counter() - start
+            shown = text if len(text) <= 26 else text[:11] + "..." + text[-12:]
+            print(f"  {shown:<26} {label:<9} {outcome:<30} {elapsed:.6f}s")
+    # the largest int the caps allow still converts to text
+    assert len(calcexpr.format_result(calcexpr.evaluate("10**4200"))) == 4201
+    assert calcexpr.evaluate("-" * 100 + "1") == 1
+    # and a lower interpreter limit still surfaces as CalcError
+    old = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(1000)
+    try:
+        value = calcexpr.evaluate("10**2000")
+        try:
+            calcexpr.format_result(value)
+            raise AssertionError("format_result should refuse 2001 digits")
+        except calcexpr.CalcError:
+            pass
+    finally:
+        sys.set_int_max_str_digits(old)
+    print("  checks ok")
+
+
+BENCHES = {
+    "throughput": bench_throughput,
+    "typing": bench_typing,
+    "limits": bench_limits,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bench", choices=sorted(BENCHES))
+    parser.add_argument("--exprs", type=int, default=2000, help="distinct expressions")
+    parser.add_argument("--repeat", type=int, default=20, help="times each expression is evaluated")
+    parser.add_argument("--terms", type=int, default=200, help="terms in the typed expression")
+    args = parser.parse_args()
+    BENCHES[args.bench](args)
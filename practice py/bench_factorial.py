@@ -0,0 +1,109 @@
+# bench_factorial.py
+"""
+Benchmarks for the fastfact.py factorial engine.
+
+    python bench_factorial.py engines --max-n 1000000
+    python bench_factorial.py parallel --n 1000000
+    python bench_factorial.py batch --n 100000 --queries 200
+    python bench_factorial.py modular --n 1000000 --ncr-queries 1000000
+"""
+
+import argparse
+import math
+import random
+import time
+
+import fastfact
+import modcomb
+import parfact
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+# ---------------------- engines ----------------------
+def bench_engines(args):
+    engines = [
+        ("naive", fastfact.factorial_naive),
+        ("split", fastfact.factorial_split),
+        ("factorial", fastfact.factorial),
+    ]
+    print(f"{'n':>9} " + " ".join(f"{name:>10}" for name, _ in engines))
+    n = 10
+    while n <= args.max_n:
+        row = []
+        for name, fn in engines:
+            if name == "naive" and n > args.naive_limit:
+                row.append("-")
+            else:
+                row.append(f"{timed(fn, n):.4f}s")
+        print(f"{n:>9} " + " ".join(f"{c:>10}" for c in row))
+        n *= 10
+
+
+# ---------------------- process pool scaling ----------------------
+def bench_parallel(args):
+    n = args.n
+    base = None
+    print(f"n = {n:,}")
+    print(f"{'workers':>8} {'time':>10} {'speed-up':>9}")
+    for workers in (1, 2, 4, 8):
+        elapsed = timed(parfact.parallel_factorial, n, workers)
+        base = base or elapsed
+        print(f"{workers:>8} {elapsed:>9.3f}s {base / elapsed:>8.2f}x")
+
+
+# ---------------------- batches and modular tables ----------------------
+def bench_batch(args):
+    rng = random.Random(1)
+    ns = [rng.randrange(args.n // 2, args.n) for _ in range(args.queries)]
+    fastfact.clear_checkpoints()
+    loop_t = timed(lambda: [math.factorial(n) for n in ns])
+    batch_t = timed(fastfact.factorials, ns)
+    again_t = timed(fastfact.factorials, ns)
+    print(f"{args.queries} queries in [{args.n // 2}, {args.n})")
+    print(f"  math.factorial loop  {loop_t:8.3f}s")
+    print(f"  factorials (cold)    {batch_t:8.3f}s   x{loop_t / batch_t:.1f}")
+    print(f"  factorials (cached)  {again_t:8.3f}s   x{loop_t / again_t:.1f}")
+
+
+def bench_modular(args):
+    rng = random.Random(2)
+    count = args.ncr_queries
+    ns = [rng.randrange(args.n) for _ in range(count)]
+    rs = [rng.randrange(n + 1) for n in ns]
+    p = modcomb.DEFAULT_MOD
+    table = modcomb.FactorialTable(p, size=0)
+    build_t = timed(table.reserve, args.n)
+    sample = min(count, 20)  # math.comb on huge n is slow; time a few
+    comb_t = timed(lambda: [math.comb(n, r) % p for n, r in zip(ns[:sample], rs[:sample])])
+    single_t = timed(lambda: [table.ncr_mod(n, r) for n, r in zip(ns, rs)])
+    many_t = timed(table.ncr_many, ns, rs)
+    print(f"table build to {args.n:,}: {build_t:.3f}s")
+    print(f"  math.comb % p        {comb_t / sample * 1e6:10.2f} us/query")
+    print(f"  ncr_mod              {single_t / count * 1e6:10.2f} us/query")
+    print(f"  ncr_many ({'numpy' if modcomb.np is not None else 'array'})     {many_t / count * 1e6:10.2f} us/query")
+
+
+BENCHES = {
+    "engines": bench_engines,
+    "parallel": bench_parallel,
+    "batch": bench_batch,
+    "modular": bench_modular,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bench", choices=sorted(BENCHES))
+    parser.add_argument("--max-n", type=int, default=1_000_000)
+    parser.add_argument("--n", type=int, default=1_000_000, help="n for the parallel bench")
+    parser.add_argument("--queries", type=int, default=200, help="queries for the batch bench")
+    parser.add_argument("--ncr-queries", type=int, default=1_000_000)
+    parser.add_argument("--naive-limit", type=int, default=200_000,
+                        help="skip the quadratic loop above this n")
+    args = parser.parse_args()
+    BENCHES[args.bench](args)
@@ -0,0 +1,98 @@
+# bench_patterns.py
+"""
+Benchmarks for patterns.py.
+
+    python bench_patterns.py scripts --rows 2000
+    python bench_patterns.py scripts --rows 2000 --shape pyramid --shape number_pyramid
+    python bench_patterns.py backends --rows 20000 --shape hollow_diamond
+
+scripts:  the original que*.py script runs as-is, with input() answered
+          by --rows and stdout sent to a line-buffered file, the way a
+          terminal buffers it. It is compared with patterns.render.
+backends: the pure-Python row-join path against the NumPy memory-mapped
+          one, both writing to a file.
+Outputs are compared byte for byte before the timings are printed.
+"""
+
+import argparse
+import contextlib
+import filecmp
+import os
+import tempfile
+import time
+
+import patterns
+import patterns_np
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run_script(script, rows, path):
+    code = compile(open(script).read(), script, "exec")
+    with open(path, "w", buffering=1) as f, contextlib.redirect_stdout(f):
+        return timed(exec, code, {"input": lambda prompt="": str(rows)})
+
+
+def run_patterns(shape, rows, path):
+    with open(path, "w", buffering=1) as f:
+        return timed(patterns.render, shape, rows, f)
+
+
+def _compare(old_path, new_path):
+    return "" if filecmp.cmp(old_path, new_path, shallow=False) else "  OUTPUT DIFFERS"
+
+
+# ---------------------- original scripts ----------------------
+def bench_scripts(args, old_path, new_path):
+    print(f"rows = {args.rows:,}")
+    print(f"{'shape':<26} {'script':<10} {'print()':>9} {'patterns':>9} {'speed-up':>9}")
+    for shape in args.shape or patterns.SHAPES:
+        script = patterns.SHAPES[shape][1]
+        old_t = run_script(script, args.rows, old_path)
+        new_t = run_patterns(shape, args.rows, new_path)
+        print(f"{shape:<26} {script:<10} {old_t:>8.3f}s {new_t:>8.3f}s "
+              f"{old_t / new_t:>8.1f}x{_compare(old_path, new_path)}")
+
+
+# ---------------------- python vs numpy ----------------------
+def bench_backends(args, old_path, new_path):
+    if not patterns_np.available():
+        print("NumPy is not installed")
+        return
+    print(f"rows = {args.rows:,}")
+    print(f"{'shape':<26} {'size':>10} {'python':>9} {'numpy':>9} {'speed-up':>9}")
+    for shape in args.shape or patterns_np.GRIDS:
+        py_t = timed(patterns.render_to_file, shape, args.rows, old_path, "python")
+        np_t = timed(patterns.render_to_file, shape, args.rows, new_path, "numpy")
+        size = os.path.getsize(new_path) / 2 ** 20
+        print(f"{shape:<26} {size:>8.1f}MB {py_t:>8.3f}s {np_t:>8.3f}s "
+              f"{py_t / np_t:>8.1f}x{_compare(old_path, new_path)}")
+
+
+BENCHES = {
+    "scripts": bench_scripts,
+    "backends": bench_backends,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bench", choices=sorted(BENCHES))
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--shape", action="append", choices=sorted(patterns.SHAPES),
+                        help="repeatable; default is every shape")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    old_path, new_path = os.path.join(tmp, "old.txt"), os.path.join(tmp, "new.txt")
+    try:
+        BENCHES[args.bench](args, old_path, new_path)
+    finally:
+        for path in (old_path, new_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(tmp)
@@ -0,0 +1,201 @@
+# bench_students.py
+"""
+Benchmarks for the connectdb.py students helpers.
+
+Runs against the sqlite stand-in by default; pass --mysql to use DB_CONFIG.
+
+    python bench_students.py bulk --rows 20000
+    python bench_students.py stream --rows 2000000
+    python bench_students.py paging --rows 1000000
+    python bench_students.py async --ops 2000 --latency 2 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+import connectdb
+import connectdb_async
+import dbmetrics
+import mysql_standin
+
+
+def setup(args):
+    if args.mysql:
+        connect = None
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "bench_students.db")
+        connect = mysql_standin.connector(path, latency=args.latency / 1000)
+    connectdb_async.configure(connect=connect, max_concurrency=args.concurrency)
+    connectdb.create_table()
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+# ---------------------- bulk writes ----------------------
+def bench_bulk(args):
+    rows = [(f"student{i}", 18 + i % 10) for i in range(args.rows)]
+
+    def per_row_insert():
+        return [connectdb.insert_student(name, age) for name, age in rows]
+
+    ids, loop_t = timed("insert_student loop", per_row_insert)
+    _, bulk_t = timed("insert_students", connectdb.insert_students, rows)
+    print(f"  speed-up x{loop_t / bulk_t:.1f}")
+
+    pairs = [(sid, 30) for sid in ids]
+    _, loop_t = timed("update_student loop", lambda: [connectdb.update_student(s, a) for s, a in pairs])
+    _, bulk_t = timed("update_students", connectdb.update_students, [(s, 31) for s in ids])
+    print(f"  speed-up x{loop_t / bulk_t:.1f}")
+
+    half = len(ids) // 2
+    _, loop_t = timed("delete_student loop", lambda: [connectdb.delete_student(s) for s in ids[:half]])
+    _, bulk_t = timed("delete_students", connectdb.delete_students, ids[half:])
+    print(f"  speed-up x{loop_t / bulk_t:.1f}")
+
+    # each row is counted once: on fetch for a query, from rowcount for DML
+    connectdb.insert_students(rows)
+    dbmetrics.metrics.reset()
+    selected = connectdb.select_all()
+    connectdb.update_students([(row[0], 40) for row in selected])
+    counted = {key: s["rows"] for key, s in dbmetrics.metrics.snapshot()["statements"].items()}
+    assert counted[dbmetrics.normalize("SELECT id, name, age FROM students")] == len(selected)
+    assert sum(counted.values()) == 2 * len(selected), counted
+
+
+# ---------------------- streaming reads ----------------------
+def bench_stream(args):
+    # e.g. --rows 2000000 for the multi-million-row fixture
+    print(f"loading {args.rows} rows ...")
+    connectdb.insert_students((f"student{i}", 18 + i % 10) for i in range(args.rows))
+
+    def drain(it):
+        count = 0
+        for _ in it:
+            count += 1
+        return count
+
+    cases = [
+        ("select_all", lambda: drain(connectdb.select_all())),
+        ("iter_students tuple", lambda: drain(connectdb.iter_students(args.batch))),
+        ("iter_students namedtuple", lambda: drain(connectdb.iter_students(args.batch, "namedtuple"))),
+        ("iter_students slots", lambda: drain(connectdb.iter_students(args.batch, "slots"))),
+    ]
+    for label, fn in cases:
+        count, elapsed = timed(label, fn)
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {count / elapsed:12,.0f} rows/s   peak {peak / 2**20:8.1f} MiB")
+
+
+# ---------------------- keyset pagination ----------------------
+def _offset_page(offset, limit):
+    # the OFFSET query page_students replaces, for comparison
+    return connectdb._select(
+        "SELECT id, name, age FROM students ORDER BY age, id LIMIT %s OFFSET %s",
+        [limit, offset])
+
+
+def _best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_paging(args):
+    limit = 50
+    loaded = 0
+    print(f"{'rows':>10} {'keyset page 1':>14} {'keyset last':>12} {'OFFSET last':>12}")
+    for target in (args.rows // 100, args.rows // 10, args.rows):
+        connectdb.insert_students((f"student{i}", 18 + i % 60) for i in range(loaded, target))
+        loaded = target
+        # cursor pointing just before the final page, as a UI would hold it
+        tail = connectdb._select(
+            "SELECT age, id FROM students ORDER BY age DESC, id DESC LIMIT %s", [limit + 1])
+        deep_cursor = tuple(tail[-1])
+        first = _best_of(lambda: connectdb.page_students(limit, None, "age"))
+        deep = _best_of(lambda: connectdb.page_students(limit, deep_cursor, "age"))
+        offset = _best_of(lambda: _offset_page(loaded - limit, limit))
+        print(f"{loaded:>10} {first * 1e3:>12.2f}ms {deep * 1e3:>10.2f}ms {offset * 1e3:>10.2f}ms")
+
+
+# ---------------------- sync vs asyncio ----------------------
+def bench_async(args):
+    # run with --latency 2 so the stand-in mimics a network round trip
+    n = args.ops
+    connectdb.insert_students((f"student{i}", 18 + i % 60) for i in range(1000))
+
+    def sync_ops():
+        for i in range(n):
+            if i % 2:
+                connectdb.insert_student(f"new{i}", 20)
+            else:
+                connectdb.select_by_age_range(20 + i % 40, 21 + i % 40, limit=20)
+
+    async def async_ops():
+        async def op(i):
+            if i % 2:
+                return await connectdb_async.insert_student(f"new{i}", 20)
+            return await connectdb_async.select_by_age_range(20 + i % 40, 21 + i % 40, limit=20)
+        await asyncio.gather(*(op(i) for i in range(n)))
+
+    _, sync_t = timed(f"sync, {n} ops", sync_ops)
+    _, async_t = timed(f"async x{args.concurrency}, {n} ops", lambda: asyncio.run(async_ops()))
+    print(f"  {n / sync_t:,.0f} vs {n / async_t:,.0f} ops/s (x{sync_t / async_t:.1f})")
+
+    # more open iterators than pooled connections, with CRUD in between:
+    # nothing may wait on a connection an idle iterator is sitting on
+    total = len(connectdb.select_all())
+
+    async def stream(k):
+        count = 0
+        async for _ in connectdb_async.iter_students(batch_size=100):
+            count += 1
+            if count % 100 == 0:
+                await connectdb_async.select_by_age_range(20, 21, limit=5)
+        return count
+
+    async def streams():
+        return await asyncio.wait_for(
+            asyncio.gather(*(stream(k) for k in range(args.concurrency + 2))), 20)
+
+    counts, _ = timed(f"{args.concurrency + 2} concurrent iterators", lambda: asyncio.run(streams()))
+    assert counts == [total] * len(counts), counts
+    connectdb_async.close()
+
+
+BENCHES = {
+    "bulk": bench_bulk,
+    "stream": bench_stream,
+    "paging": bench_paging,
+    "async": bench_async,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bench", choices=sorted(BENCHES))
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=1000, help="fetchmany batch size")
+    parser.add_argument("--ops", type=int, default=2000, help="operations for the async bench")
+    parser.add_argument("--concurrency", type=int, default=16, help="pool size / in-flight cap")
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in round trip in ms")
+    parser.add_argument("--mysql", action="store_true", help="use the real MySQL server")
+    args = parser.parse_args()
+    setup(args)
+    BENCHES[args.bench](args)
+    print("pool:", connectdb.pool_stats())
@@ -0,0 +1,196 @@
+# bench_tasks.py
+"""
+Benchmarks and checks for the taskpool.py executor and taskbackends.py.
+
+    python bench_tasks.py io --tasks 100000 --workers 64
+    python bench_tasks.py behaviour
+    python bench_tasks.py backends --levels 1,16,256 --tasks 1000 --cpu-tasks 200
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as ResultTimeout
+
+import taskbackends
+import taskpool
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+# ---------------------- simulated I/O ----------------------
+def thread_per_task(jobs):
+    # what multi thrading.py did: one Thread per job, start them all, join by hand
+    threads = [threading.Thread(target=taskbackends.io_worker, args=job) for job in jobs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def stdlib_pool(jobs, workers):
+    with ThreadPoolExecutor(workers) as pool:
+        futures = [pool.submit(taskbackends.io_worker, *job) for job in jobs]
+        queued = pool._work_queue.qsize()
+        for f in futures:
+            f.result()
+    return queued
+
+
+def task_pool(jobs, workers, queue_size):
+    with taskpool.TaskPool(workers, queue_size) as pool:
+        futures = [pool.submit(taskbackends.io_worker, *job) for job in jobs]
+        for f in futures:
+            f.result()
+    return pool.stats()
+
+
+def bench_io(args):
+    jobs = [(f"Task-{i}", args.count) for i in range(args.tasks)]
+    spawn = jobs[:args.spawn_limit]  # a thread each for 10^5 jobs exhausts the box
+    ideal = args.tasks * args.count * 0.001 / args.workers
+    print(f"{args.tasks:,} tasks x {args.count} waits of 1 ms, {args.workers} workers "
+          f"(ideal {ideal:.2f}s)")
+    _, spawn_t = timed(thread_per_task, spawn)
+    queued, stdlib_t = timed(stdlib_pool, jobs, args.workers)
+    stats, pool_t = timed(task_pool, jobs, args.workers, args.queue_size)
+    assert stats["completed"] == args.tasks and stats["max_queue_depth"] <= args.queue_size
+    print(f"  {'approach':<26} {'tasks/s':>9} {'max queued':>11}")
+    print(f"  {f'thread per task ({len(spawn):,})':<26} {len(spawn) / spawn_t:>9,.0f} {'-':>11}")
+    print(f"  {'ThreadPoolExecutor':<26} {args.tasks / stdlib_t:>9,.0f} {queued:>11,}")
+    print(f"  {'TaskPool':<26} {args.tasks / pool_t:>9,.0f} {stats['max_queue_depth']:>11,}")
+    q, r = stats["queued"], stats["run"]
+    print(f"  TaskPool queued p50/p95/p99 {q['p50'] * 1e3:.1f}/{q['p95'] * 1e3:.1f}/{q['p99'] * 1e3:.1f} ms, "
+          f"run p50/p95/p99 {r['p50'] * 1e3:.1f}/{r['p95'] * 1e3:.1f}/{r['p99'] * 1e3:.1f} ms, "
+          f"utilisation {stats['utilisation']:.0%}")
+
+
+# ---------------------- backpressure, timeouts, shutdown ----------------------
+def check(label, ok):
+    print(f"  {label:<52} {'ok' if ok else 'FAILED'}")
+    assert ok, label
+
+
+def bench_behaviour(args):
+    gate = threading.Event()
+    pool = taskpool.TaskPool(workers=2, queue_size=4, block_timeout=0.05)
+    running = [pool.submit(gate.wait) for _ in range(2)]
+    time.sleep(0.05)
+    queued = [pool.submit(taskbackends.io_worker, f"Task-{i}", 1, timeout=0.1) for i in range(4)]
+    check("full queue: submit raises QueueFull after block_timeout",
+          _raises(taskpool.QueueFull, pool.submit, taskbackends.io_worker, "extra", 1))
+    check("block=False raises at once",
+          _raises(taskpool.QueueFull, pool.submit, taskbackends.io_worker, "x", 1, block=False))
+    check("result(timeout) gives up on a running task", _raises(ResultTimeout, running[0].result, 0.01))
+    time.sleep(0.15)
+    gate.set()
+    check("tasks queued past their timeout raise TaskTimeout",
+          all(_raises(taskpool.TaskTimeout, f.result) for f in queued))
+
+    slow = [pool.submit(taskbackends.io_worker, f"Slow-{i}", 5, 0.01) for i in range(4)]
+    pool.shutdown(wait=True)
+    check("shutdown(wait=True) finishes queued work", [f.result() for f in slow] == [f"Slow-{i}" for i in range(4)])
+    check("submit after shutdown raises RuntimeError",
+          _raises(RuntimeError, pool.submit, taskbackends.io_worker, "late", 1))
+
+    pool = taskpool.TaskPool(workers=1, queue_size=10)
+    pool.submit(taskbackends.io_worker, "first", 5, 0.01)
+    time.sleep(0.01)
+    rest = [pool.submit(taskbackends.io_worker, f"Task-{i}", 1) for i in range(5)]
+    pool.shutdown(wait=True, cancel_futures=True)
+    check("cancel_futures=True cancels what was still queued", all(f.cancelled() for f in rest))
+    stats = pool.stats()
+    check("stats count them", stats["cancelled"] == 5 and stats["completed"] == 1)
+
+
+def _raises(exc, fn, *args, **kwargs):
+    try:
+        fn(*args, **kwargs)
+    except exc:
+        return True
+    return False
+
+
+# ---------------------- thread vs async vs process ----------------------
+def _peak_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def bench_backend_child(args):
+    """One backend / workload / concurrency cell in a fresh process."""
+    jobs = [(f"Task-{i}", args.count) for i in range(args.tasks)]
+    base = _peak_rss_mb()
+    timings, elapsed = timed(taskbackends.run, args.backend, args.workload, jobs, args.concurrency)
+    assert len(timings) == len(jobs)
+    ran = sorted(seconds for _, seconds in timings)
+    print(json.dumps({
+        "throughput": len(jobs) / elapsed,
+        "p50": _percentile(ran, 50), "p99": _percentile(ran, 99),
+        "rss_mb": _peak_rss_mb() - base,
+        "child_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }))
+
+
+def bench_backends(args):
+    levels = [int(n) for n in args.levels.split(",")]
+    for workload, tasks in (("io", args.tasks), ("cpu", args.cpu_tasks)):
+        print(f"{workload}: {tasks:,} tasks x {args.count} steps "
+              f"({'1 ms sleep' if workload == 'io' else f'{taskbackends.CPU_STEP:,} loop iterations'} each)")
+        print(f"  {'backend':<8} {'conc':>5} {'tasks/s':>9} {'run p50':>9} {'run p99':>9} "
+              f"{'RSS +MB':>8} {'per child':>10}")
+        for backend in taskbackends.BACKENDS:
+            for level in levels:
+                if backend == "process" and level > args.max_procs:
+                    continue  # a whole interpreter per worker
+                out = subprocess.run(
+                    [sys.executable, __file__, "backend-child", "--backend", backend,
+                     "--workload", workload, "--concurrency", str(level),
+                     "--tasks", str(tasks), "--count", str(args.count)],
+                    check=True, capture_output=True, text=True).stdout
+                r = json.loads(out)
+                child = f"{r['child_mb']:.1f}MB" if backend == "process" else "-"
+                print(f"  {backend:<8} {level:>5} {r['throughput']:>9,.0f} {r['p50'] * 1e3:>7.2f}ms "
+                      f"{r['p99'] * 1e3:>7.2f}ms {r['rss_mb']:>8.1f} {child:>10}")
+
+
+BENCHES = {
+    "io": bench_io,
+    "behaviour": bench_behaviour,
+    "backends": bench_backends,
+    "backend-child": bench_backend_child,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bench", choices=sorted(BENCHES))
+    parser.add_argument("--tasks", type=int, default=100_000, help="simulated I/O tasks")
+    parser.add_argument("--count", type=int, default=2, help="1 ms waits per task")
+    parser.add_argument("--workers", type=int, default=64, help="pool size")
+    parser.add_argument("--queue-size", type=int, default=1000, help="TaskPool queue bound")
+    parser.add_argument("--spawn-limit", type=int, default=10_000, help="tasks given a thread each")
+    parser.add_argument("--levels", default="1,16,256", help="concurrency levels for the backends bench")
+    parser.add_argument("--cpu-tasks", type=int, default=200, help="cpu-bound tasks for the backends bench")
+    parser.add_argument("--max-procs", type=int, default=16, help="largest process pool to start")
+    parser.add_argument("--backend", choices=sorted(taskbackends.BACKENDS), help=argparse.SUPPRESS)
+    parser.add_argument("--workload", choices=sorted(taskbackends.WORKLOADS), help=argparse.SUPPRESS)
+    parser.add_argument("--concurrency", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    BENCHES[args.bench](args)
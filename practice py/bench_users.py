@@ -0,0 +1,123 @@
+# bench_users.py
+"""
+Benchmarks for the kunal.py user store.
+
+    python bench_users.py store --users 5000
+    python bench_users.py cache
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import authcache
+import kunal
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def fresh_db(name):
+    kunal.DB_PATH = os.path.join(tempfile.mkdtemp(), name)
+    kunal.init_db()
+
+
+# ---------------------- persistent connection ----------------------
+def legacy_register(username, password):
+    # the connect-per-call, default-journal version register_user replaced
+    conn = sqlite3.connect(kunal.DB_PATH)
+    conn.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password))
+    conn.commit()
+    conn.close()
+
+
+def legacy_verify(username, password):
+    conn = sqlite3.connect(kunal.DB_PATH)
+    row = conn.execute("SELECT id FROM users WHERE username=? AND password=?",
+                       (username, password)).fetchone()
+    conn.close()
+    return bool(row)
+
+
+def bench_store(args):
+    users = [(f"user{i}", f"pw{i}") for i in range(args.users)]
+    report = []
+
+    fresh_db("legacy.db")
+    _, t = timed("legacy register loop", lambda: [legacy_register(u, p) for u, p in users])
+    report.append(("legacy registrations", len(users) / t))
+    _, t = timed("legacy verify loop", lambda: [legacy_verify(u, p) for u, p in users])
+    report.append(("legacy logins", len(users) / t))
+
+    fresh_db("tuned.db")
+    _, t = timed("register_user loop", lambda: [kunal.register_user(u, p) for u, p in users])
+    report.append(("register_user", len(users) / t))
+    _, t = timed("verify_user loop", lambda: [kunal.verify_user(u, p) for u, p in users])
+    report.append(("verify_user", len(users) / t))
+
+    fresh_db("bulk.db")
+    _, t = timed("register_users", kunal.register_users, users)
+    report.append(("register_users", len(users) / t))
+
+    for label, rate in report:
+        print(f"  {label:<22} {rate:12,.0f} /s")
+
+
+# ---------------------- UserCache behaviour ----------------------
+def check(label, ok):
+    print(f"  {label:<56} {'ok' if ok else 'FAILED'}")
+    assert ok, label
+
+
+def bench_cache(args):
+    db = {f"user{i}": f"pw{i}" for i in range(args.users)}
+    slow = threading.Event()
+
+    def load_all():
+        names = list(db)
+        if slow.is_set():
+            time.sleep(0.5)
+        return names
+
+    cache = authcache.UserCache(db.get, load_all, bloom_ttl=0.2)
+    check("known user found", cache.get("user1") == "pw1")
+    db["elsewhere"] = "pw"  # inserted by another process, not through added()
+    check("unknown to the filter until it is rebuilt", cache.get("elsewhere") is None)
+    time.sleep(0.25)
+    check("accepted once the filter expires", cache.get("elsewhere") == "pw")
+
+    time.sleep(0.25)
+    slow.set()
+    rebuild = threading.Thread(target=cache.get, args=("user2",))
+    rebuild.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    hit = cache.get("user1")
+    waited = time.perf_counter() - start
+    cache.added("during")
+    db["during"] = "pw"
+    rebuild.join()
+    check(f"lookups don't wait for a rebuild ({waited * 1e3:.1f} ms)", hit == "pw1" and waited < 0.1)
+    check("a user added during the rebuild is in the new filter", cache.get("during") == "pw")
+
+
+BENCHES = {
+    "store": bench_store,
+    "cache": bench_cache,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bench", choices=sorted(BENCHES))
+    parser.add_argument("--users", type=int, default=5000)
+    args = parser.parse_args()
+    BENCHES[args.bench](args)
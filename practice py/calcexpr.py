@@ -0,0 +1,355 @@
+# calcexpr.py
+"""
+Arithmetic evaluator for CalculatorFrame (replaces eval()).
+
+    evaluate("2 * (3 + 4) / 7")        -> 2.0
+    preview = LivePreview()
+    preview.evaluate("12 + 30")        -> 42
+    preview.evaluate("12 + 30 * 2")    -> 72   (only "* 2" is new work)
+
+A tokenizer feeds a Pratt parser that builds a small AST and folds it as
+it goes. The calculator has no variables, so every subtree folds to a
+constant. compile_expression() memoises the folded result per string in
+an LRU. Unlike eval(), every power and product is checked against size
+limits before it is computed, so "9**9**9" is rejected at once instead
+of freezing the app. Integer results are capped below CPython's
+int-to-str limit (4,300 digits), so every result can be displayed, and
+brackets or unary signs nest at most MAX_DEPTH deep, so the recursive
+parser never hits RecursionError. format_result() turns a value into
+the text to show, raising CalcError if that still fails.
+
+Grammar: numbers (12, 3.5, .5, 1e3), + - * / // % **, unary + -, ( ).
+"""
+
+import math
+import re
+import sys
+from collections import OrderedDict
+
+MAX_LITERAL_DIGITS = 1000     # longest number literal accepted
+MAX_RESULT_BITS = 14_000      # ~4,200 decimal digits, under str()'s 4,300
+MAX_DEPTH = 200               # nested brackets / unary signs / ** chains
+CACHE_SIZE = 512
+
+
+class CalcError(ValueError):
+    """Bad syntax, bad operands or a result over the size limits."""
+
+
+# ---------------------- tokenizer ----------------------
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<op>\*\*|//|[-+*/%()])
+    )""", re.VERBOSE)
+
+
+class Token:
+    __slots__ = ("kind", "text", "start", "end")
+
+    def __init__(self, kind, text, start, end):
+        self.kind = kind
+        self.text = text
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.text!r})"
+
+
+def tokenize(text, pos=0):
+    tokens = []
+    length = len(text)
+    while pos < length:
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            if text[pos:].strip() == "":
+                break
+            raise CalcError(f"unexpected character {text[pos]!r} at {pos}")
+        if m.group("num") is not None:
+            tokens.append(Token("num", m.group("num"), m.start("num"), m.end()))
+        else:
+            tokens.append(Token("op", m.group("op"), m.start("op"), m.end()))
+        pos = m.end()
+    return tokens
+
+
+def _number(text):
+    if len(text) > MAX_LITERAL_DIGITS:
+        raise CalcError("number too long")
+    if any(c in text for c in ".eE"):
+        return float(text)
+    return int(text)
+
+
+# ---------------------- AST ----------------------
+class Num:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return f"Num({self.value!r})"
+
+
+class Unary:
+    __slots__ = ("op", "operand")
+
+    def __init__(self, op, operand):
+        self.op = op
+        self.operand = operand
+
+
+class Binary:
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+def _bits(x):
+    return x.bit_length() if isinstance(x, int) else 0
+
+
+def _check_pow(base, exp):
+    if isinstance(base, int) and isinstance(exp, int) and exp > 0 and abs(base) > 1:
+        # integer bound first: a huge exp would overflow the float below
+        if (exp * (abs(base).bit_length() - 1) > MAX_RESULT_BITS
+                or exp * math.log2(abs(base)) > MAX_RESULT_BITS):
+            raise CalcError("result too large")
+
+
+def apply(op, a, b):
+    """One checked arithmetic step."""
+    if op == "**":
+        _check_pow(a, b)
+        try:
+            result = a ** b
+        except ZeroDivisionError:
+            raise CalcError("division by zero") from None
+        except OverflowError:
+            raise CalcError("result too large") from None
+        if isinstance(result, complex):
+            raise CalcError("complex result")
+        return result
+    if op == "*" and _bits(a) + _bits(b) > MAX_RESULT_BITS:
+        raise CalcError("result too large")
+    try:
+        if op == "+":
+            return a + b
+        if op == "-":
+            return a - b
+        if op == "*":
+            return a * b
+        if op == "/":
+            return a / b
+        if op == "//":
+            return a // b
+        if op == "%":
+            return a % b
+    except ZeroDivisionError:
+        raise CalcError("division by zero") from None
+    except OverflowError:
+        raise CalcError("result too large") from None
+    raise CalcError(f"unknown operator {op!r}")
+
+
+def fold(node):
+    """Reduce constant subtrees to Num (all of them, for this grammar)."""
+    if isinstance(node, Num):
+        return node
+    if isinstance(node, Unary):
+        inner = fold(node.operand)
+        if isinstance(inner, Num):
+            return Num(-inner.value if node.op == "-" else +inner.value)
+        return Unary(node.op, inner)
+    left, right = fold(node.left), fold(node.right)
+    if isinstance(left, Num) and isinstance(right, Num):
+        return Num(apply(node.op, left.value, right.value))
+    return Binary(node.op, left, right)
+
+
+def evaluate_ast(node):
+    if isinstance(node, Num):
+        return node.value
+    if isinstance(node, Unary):
+        value = evaluate_ast(node.operand)
+        return -value if node.op == "-" else +value
+    return apply(node.op, evaluate_ast(node.left), evaluate_ast(node.right))
+
+
+# ---------------------- Pratt parser ----------------------
+# binding powers; ** is right-associative and binds tighter than unary minus
+# on its left (-2**2 == -4) but accepts a unary operand on its right (2**-1)
+_INFIX = {"+": 10, "-": 10, "*": 20, "/": 20, "//": 20, "%": 20, "**": 40}
+_PREFIX_BP = 30
+
+
+class Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.depth = 0
+        # (index of a top-level operator, folded value of everything before it)
+        self.checkpoints = []
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self):
+        tok = self.peek()
+        if tok is None:
+            raise CalcError("unexpected end of expression")
+        self.pos += 1
+        return tok
+
+    def parse(self, left=None):
+        """Parse the whole token list; `left` resumes from a checkpoint."""
+        node = self.expression(0, left, top=True)
+        if self.peek() is not None:
+            raise CalcError(f"unexpected {self.peek().text!r}")
+        return node
+
+    def expression(self, rbp, left=None, top=False):
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise CalcError("expression nested too deeply")
+        try:
+            return self._expression(rbp, left, top)
+        finally:
+            self.depth -= 1
+
+    def _expression(self, rbp, left, top):
+        if left is None:
+            left = self.prefix(self.next())
+        while True:
+            tok = self.peek()
+            if tok is None or tok.kind != "op" or tok.text not in _INFIX:
+                return left
+            lbp = _INFIX[tok.text]
+            if lbp <= rbp:
+                return left
+            if top:
+                self.checkpoints.append((self.pos, left))
+            self.pos += 1
+            # ** is right-associative: parse its right side at a lower power
+            right = self.expression(lbp - 1 if tok.text == "**" else lbp)
+            left = fold(Binary(tok.text, left, right))
+
+    def prefix(self, tok):
+        if tok.kind == "num":
+            return Num(_number(tok.text))
+        if tok.text in ("-", "+"):
+            return fold(Unary(tok.text, self.expression(_PREFIX_BP)))
+        if tok.text == "(":
+            inner = self.expression(0)
+            close = self.next()
+            if close.text != ")":
+                raise CalcError("expected ')'")
+            return inner
+        raise CalcError(f"unexpected {tok.text!r}")
+
+
+def parse(text):
+    return Parser(tokenize(text)).parse()
+
+
+# ---------------------- compiled-expression cache ----------------------
+_cache = OrderedDict()
+cache_stats = {"hits": 0, "misses": 0}
+
+
+def compile_expression(text):
+    """Folded AST for text, memoised in an LRU (errors are cached too)."""
+    key = text.strip()
+    entry = _cache.get(key)
+    if entry is not None:
+        _cache.move_to_end(key)
+        cache_stats["hits"] += 1
+    else:
+        cache_stats["misses"] += 1
+        try:
+            entry = (parse(key), None)
+        except CalcError as e:
+            entry = (None, e)
+        _cache[key] = entry
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    node, error = entry
+    if error is not None:
+        raise error
+    return node
+
+
+def evaluate(text):
+    return evaluate_ast(compile_expression(text))
+
+
+def format_result(value):
+    """Display text for a result."""
+    try:
+        return str(value)
+    except ValueError:  # int longer than sys.get_int_max_str_digits()
+        limit = sys.get_int_max_str_digits()
+        raise CalcError(f"result has more than {limit} digits") from None
+
+
+class LivePreview:
+    """Evaluates successive edits of one expression, reusing earlier work.
+
+    Tokens before the first changed character are kept. Parsing resumes
+    from the last top-level checkpoint, the folded value of everything
+    left of a +/- (or * ...) operator, that lies entirely in the
+    unchanged prefix. Typing at the end of a long sum therefore only
+    re-parses the last term.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._tokens = []
+        self._checkpoints = []
+        self.resumed = 0  # tokens skipped on the last call (for tests/benchmarks)
+
+    def evaluate(self, text):
+        common = 0
+        limit = min(len(text), len(self._text))
+        while common < limit and text[common] == self._text[common]:
+            common += 1
+        # a token ending right at the edit point might continue ("12" -> "123")
+        kept = 0
+        while kept < len(self._tokens) and self._tokens[kept].end < common:
+            kept += 1
+        resume_from = self._tokens[kept - 1].end if kept else 0
+        try:
+            tokens = self._tokens[:kept] + tokenize(text, resume_from)
+        except CalcError:
+            self._reset()
+            raise
+        checkpoint = None
+        for pos, value in self._checkpoints:
+            if pos < kept:
+                checkpoint = (pos, value)
+        parser = Parser(tokens)
+        try:
+            if checkpoint is None:
+                node = parser.parse()
+                self.resumed = 0
+            else:
+                pos, value = checkpoint
+                parser.pos = pos
+                parser.checkpoints = [c for c in self._checkpoints if c[0] <= pos][:-1]
+                node = parser.parse(left=value)
+                self.resumed = pos
+        except CalcError:
+            # keep the tokens (the user is mid-typing) but nothing parsed
+            self._text, self._tokens = text, tokens
+            self._checkpoints = [c for c in self._checkpoints if c[0] < kept]
+            raise
+        self._text, self._tokens, self._checkpoints = text, tokens, parser.checkpoints
+        return evaluate_ast(node)
+
+    def _reset(self):
+        self._text, self._tokens, self._checkpoints = "", [], []
@@ -1,14 +1,74 @@
 # mysql_crud.py
-import mysql.connector
-from mysql.connector import Error
+import threading
+from collections import namedtuple
+from itertools import islice
+
+import dbmetrics
+from dbpool import ConnectionPool
+
+try:
+    import mysql.connector
+    from mysql.connector import Error
+except ImportError:  # no driver installed; configure_pool() with a stand-in instead
+    mysql = None
+    Error = Exception
+
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "your_user",
+    "password": "your_password",
+    "database": "testdb",
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _mysql_connect():
+    if mysql is None:
+        raise RuntimeError("mysql-connector-python is not installed")
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+def _timed_connect(connect):
+    def timed():
+        with dbmetrics.metrics.timed("connect"):
+            return connect()
+    return timed
+
+
+def configure_pool(connect=None, **pool_options):
+    """(Re)create the shared pool. `connect` defaults to MySQL with DB_CONFIG."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = ConnectionPool(_timed_connect(connect or _mysql_connect), **pool_options)
+    return _pool
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(_timed_connect(_mysql_connect))
+    return _pool
+
+
+def pool_stats():
+    return get_pool().stats()
+
 
 def get_connection():
-    return mysqldb.connector.connect(
-        host="localhost",
-        user="your_user",
-        password="your_password",
-        database="testdb"
-    )
+    """Check a connection out of the pool; conn.close() returns it.
+
+    The connection is wrapped by dbmetrics, so statement, commit and
+    acquire timings show up in dbmetrics.metrics.snapshot().
+    """
+    with dbmetrics.metrics.timed("acquire"):
+        conn = get_pool().acquire()
+    return dbmetrics.metrics.wrap(conn)
 
 def create_table():
     conn = get_connection()
@@ -20,10 +80,28 @@ def create_table():
         age INT
     )
     """)
+    for index_name, columns in STUDENT_INDEXES:
+        _ensure_index(cur, index_name, columns)
     conn.commit()
     cur.close()
     conn.close()
 
+# secondary indexes backing the range / prefix / keyset reads below
+# (InnoDB appends the primary key, so they already order by (col, id))
+STUDENT_INDEXES = [
+    ("idx_students_age", "age"),
+    ("idx_students_name", "name"),
+]
+ER_DUP_KEYNAME = 1061
+
+def _ensure_index(cur, index_name, columns):
+    # MySQL has no CREATE INDEX IF NOT EXISTS; treat "duplicate key name" as done
+    try:
+        cur.execute(f"CREATE INDEX {index_name} ON students ({columns})")
+    except Error as e:
+        if getattr(e, "errno", None) != ER_DUP_KEYNAME:
+            raise
+
 def insert_student(name, age):
     conn = get_connection()
     cur = conn.cursor()
@@ -54,6 +132,86 @@ def delete_student(student_id):
     conn.close()
     return affected
 
+# ---------------------- bulk writes ----------------------
+BULK_CHUNK_SIZE = 1000
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def insert_students(rows, chunk_size=BULK_CHUNK_SIZE):
+    """Insert (name, age) rows with multi-row VALUES in one transaction.
+
+    Returns the list of new ids. Relies on MySQL handing out consecutive
+    AUTO_INCREMENT values within a single multi-row INSERT and reporting
+    the first of them as lastrowid.
+    """
+    ids = []
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            values = ", ".join(["(%s, %s)"] * len(chunk))
+            params = [v for row in chunk for v in row]
+            cur.execute(f"INSERT INTO students (name, age) VALUES {values}", params)
+            first = cur.lastrowid
+            ids.extend(range(first, first + len(chunk)))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+    return ids
+
+
+def update_students(pairs, chunk_size=BULK_CHUNK_SIZE):
+    """Apply (student_id, new_age) pairs in one transaction; returns rows affected."""
+    affected = 0
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        for chunk in _chunks(pairs, chunk_size):
+            cur.executemany("UPDATE students SET age = %s WHERE id = %s",
+                            [(age, sid) for sid, age in chunk])
+            affected += cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+    return affected
+
+
+def delete_students(ids, chunk_size=BULK_CHUNK_SIZE):
+    """Delete students by id with chunked IN (...) lists; returns rows affected."""
+    affected = 0
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        for chunk in _chunks(ids, chunk_size):
+            marks = ", ".join(["%s"] * len(chunk))
+            cur.execute(f"DELETE FROM students WHERE id IN ({marks})", chunk)
+            affected += cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+    return affected
+
+
 def select_all():
     conn = get_connection()
     cur = conn.cursor()
@@ -63,6 +221,137 @@ def select_all():
     conn.close()
     return rows
 
+# ---------------------- streaming reads ----------------------
+Student = namedtuple("Student", "id name age")
+
+
+class StudentRecord:
+    """Smallest per-row object: no __dict__, three slots."""
+    __slots__ = ("id", "name", "age")
+
+    def __init__(self, id, name, age):
+        self.id = id
+        self.name = name
+        self.age = age
+
+    def __repr__(self):
+        return f"StudentRecord(id={self.id!r}, name={self.name!r}, age={self.age!r})"
+
+
+ROW_TYPES = {
+    "tuple": None,
+    "namedtuple": Student._make,
+    "slots": lambda row: StudentRecord(*row),
+}
+
+
+def iter_students(batch_size=1000, row_type="tuple"):
+    """Yield every student without materialising the table.
+
+    Uses an unbuffered (server-side) cursor and fetchmany(batch_size), so
+    memory stays at one batch regardless of table size. row_type is one of
+    "tuple", "namedtuple" (Student) or "slots" (StudentRecord).
+    """
+    make = ROW_TYPES[row_type]
+    conn = get_connection()
+    cur = conn.cursor(buffered=False)
+    exhausted = False
+    try:
+        cur.execute("SELECT id, name, age FROM students ORDER BY id")
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                exhausted = True
+                break
+            if make is None:
+                yield from rows
+            else:
+                for row in rows:
+                    yield make(row)
+    finally:
+        if not exhausted:
+            # caller stopped early: drain the unread result set so the
+            # connection can go back to the pool
+            consume = getattr(conn, "consume_results", None)
+            if consume is not None:
+                try:
+                    consume()
+                except Exception:
+                    pass
+        cur.close()
+        conn.close()
+
+
+# ---------------------- indexed reads ----------------------
+PAGE_ORDERS = ("id", "age", "name")
+STUDENT_COLUMNS = ("id", "name", "age")
+
+
+def _escape_like(prefix):
+    return prefix.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def _select(sql, params):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    cur.close()
+    conn.close()
+    return rows
+
+
+def select_by_age_range(min_age, max_age, limit=None):
+    """Students with min_age <= age <= max_age, ordered by (age, id)."""
+    sql = "SELECT id, name, age FROM students WHERE age BETWEEN %s AND %s ORDER BY age, id"
+    params = [min_age, max_age]
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return _select(sql, params)
+
+
+def select_by_name_prefix(prefix, limit=None):
+    """Students whose name starts with prefix (served by idx_students_name)."""
+    sql = "SELECT id, name, age FROM students WHERE name LIKE %s ESCAPE '!' ORDER BY name, id"
+    params = [_escape_like(prefix) + "%"]
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return _select(sql, params)
+
+
+def page_students(limit=50, after=None, order_by="id"):
+    """Keyset pagination: return (rows, next_cursor).
+
+    Pass the returned cursor back as `after` to get the next page; it is
+    None once the last page has been served. Each page seeks straight to
+    its first row through the index instead of skipping OFFSET rows, so
+    page N costs the same as page 1.
+    """
+    if order_by not in PAGE_ORDERS:
+        raise ValueError(f"order_by must be one of {PAGE_ORDERS}")
+    if order_by == "id":
+        where, params, order = "", [], "id"
+        if after is not None:
+            where, params = "WHERE id > %s", [after]
+    else:
+        where, params, order = "", [], f"{order_by}, id"
+        if after is not None:
+            value, last_id = after
+            # row-value comparison lets MySQL 5.7+ (and sqlite) range-scan (col, id)
+            where = f"WHERE ({order_by}, id) > (%s, %s)"
+            params = [value, last_id]
+    sql = f"SELECT id, name, age FROM students {where} ORDER BY {order} LIMIT %s"
+    rows = _select(sql, params + [limit])
+    if len(rows) < limit:
+        return rows, None
+    last = rows[-1]
+    if order_by == "id":
+        return rows, last[0]
+    return rows, (last[STUDENT_COLUMNS.index(order_by)], last[0])
+
+
 if __name__ == "__main__":
     # IMPORTANT: create database 'testdb' beforehand or change settings to an existing DB.
     create_table()
@@ -0,0 +1,152 @@
+# connectdb_async.py
+"""
+Asyncio front end for the connectdb.py students helpers.
+
+    import asyncio, connectdb_async as db
+
+    async def main():
+        await db.create_table()
+        sid = await db.insert_student("Aman", 20)
+        async for row in db.iter_students():
+            print(row)
+
+    asyncio.run(main())
+
+mysql.connector has no native asyncio support, so each call runs the
+blocking helper on a bounded worker pool sized to the connection pool.
+The event loop never blocks, and up to `max_concurrency` round trips
+are in flight at once. Calls beyond that wait on an asyncio.Semaphore
+instead of piling up in the executor queue.
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import connectdb
+
+_executor = None
+_max_concurrency = None
+_semaphores = weakref.WeakKeyDictionary()  # one per event loop
+_lock = threading.Lock()
+
+
+def configure(connect=None, max_concurrency=10, **pool_options):
+    """Set up the shared connection pool and the worker pool in one go.
+
+    Both are sized to max_concurrency so a worker never waits on the pool.
+    """
+    global _executor, _max_concurrency
+    pool_options.setdefault("max_size", max_concurrency)
+    connectdb.configure_pool(connect=connect, **pool_options)
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ThreadPoolExecutor(max_concurrency, thread_name_prefix="connectdb")
+        _max_concurrency = max_concurrency
+        _semaphores.clear()
+
+
+def _get_executor():
+    global _executor, _max_concurrency
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _max_concurrency = connectdb.get_pool().max_size
+                _executor = ThreadPoolExecutor(_max_concurrency, thread_name_prefix="connectdb")
+    return _executor
+
+
+def _get_semaphore(loop):
+    sem = _semaphores.get(loop)
+    if sem is None:
+        # a semaphore that ever made a task wait refers to its loop, which
+        # keeps the weak key alive, so also drop those of closed loops
+        for old in [old for old in _semaphores if old.is_closed()]:
+            del _semaphores[old]
+        sem = _semaphores[loop] = asyncio.Semaphore(_max_concurrency)
+    return sem
+
+
+async def run(fn, *args, **kwargs):
+    """Run a blocking DB callable off the loop under the concurrency cap."""
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    async with _get_semaphore(loop):
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+def close():
+    """Shut down the worker pool (the connection pool stays in connectdb)."""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+        _semaphores.clear()
+
+
+# ---------------------- CRUD ----------------------
+async def create_table():
+    return await run(connectdb.create_table)
+
+
+async def insert_student(name, age):
+    return await run(connectdb.insert_student, name, age)
+
+
+async def update_student(student_id, new_age):
+    return await run(connectdb.update_student, student_id, new_age)
+
+
+async def delete_student(student_id):
+    return await run(connectdb.delete_student, student_id)
+
+
+async def select_all():
+    return await run(connectdb.select_all)
+
+
+async def insert_students(rows, chunk_size=connectdb.BULK_CHUNK_SIZE):
+    return await run(connectdb.insert_students, rows, chunk_size)
+
+
+async def update_students(pairs, chunk_size=connectdb.BULK_CHUNK_SIZE):
+    return await run(connectdb.update_students, pairs, chunk_size)
+
+
+async def delete_students(ids, chunk_size=connectdb.BULK_CHUNK_SIZE):
+    return await run(connectdb.delete_students, ids, chunk_size)
+
+
+async def select_by_age_range(min_age, max_age, limit=None):
+    return await run(connectdb.select_by_age_range, min_age, max_age, limit)
+
+
+async def select_by_name_prefix(prefix, limit=None):
+    return await run(connectdb.select_by_name_prefix, prefix, limit)
+
+
+async def page_students(limit=50, after=None, order_by="id"):
+    return await run(connectdb.page_students, limit, after, order_by)
+
+
+async def iter_students(batch_size=1000, row_type="tuple"):
+    """Async generator over all students, one keyset page per hop.
+
+    Every hop is a page_students() call that returns its connection, so
+    an open iterator holds no connection between hops and any number of
+    them can share the pool with other calls. Unlike the sync
+    connectdb.iter_students() it reads no single snapshot: rows changed
+    behind the cursor while it runs may or may not show up.
+    """
+    make = connectdb.ROW_TYPES[row_type]
+    after = None
+    while True:
+        rows, after = await page_students(batch_size, after)
+        for row in rows:
+            yield row if make is None else make(row)
+        if after is None:
+            return
@@ -0,0 +1,227 @@
+# dbmetrics.py
+"""
+Query timing for the DB helpers (connectdb.py, kunal.py).
+
+Connections handed out by the helpers are wrapped in InstrumentedConnection,
+whose cursors time every execute/executemany, count rows and feed one shared
+QueryMetrics object. Statements slower than `slow_threshold` seconds go to
+the "dbmetrics.slow" logger.
+
+    import dbmetrics
+    dbmetrics.metrics.slow_threshold = 0.05
+    ...
+    print(dbmetrics.metrics.snapshot())
+"""
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from histogram import DEFAULT_BUCKETS, Histogram
+
+slow_log = logging.getLogger("dbmetrics.slow")
+
+_WS = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+_VALUES_LIST = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+
+
+def normalize(sql):
+    """Collapse whitespace and placeholder lists so one statement = one key."""
+    sql = _WS.sub(" ", sql).strip()
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return _VALUES_LIST.sub(r"\1", sql)
+
+
+class StatementStats:
+    def __init__(self, buckets):
+        self.latency = Histogram(buckets)
+        self.rows = 0
+        self.errors = 0
+
+
+class QueryMetrics:
+    """Thread-safe collector for statement, commit and acquire timings."""
+
+    def __init__(self, slow_threshold=0.5, buckets=DEFAULT_BUCKETS, enabled=True):
+        self.slow_threshold = slow_threshold
+        self.buckets = buckets
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._statements = {}
+            self._phases = {}  # "connect", "acquire", "commit", "rollback"
+
+    def add_listener(self, callback):
+        """callback(kind, statement, seconds, rows) is called for every event."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    # ---------------------- recording ----------------------
+    def record_statement(self, sql, seconds, rows=None, error=False):
+        key = normalize(sql)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = StatementStats(self.buckets)
+            stats.latency.add(seconds)
+            if rows is not None and rows > 0:
+                stats.rows += rows
+            if error:
+                stats.errors += 1
+        if self.slow_threshold is not None and seconds >= self.slow_threshold:
+            slow_log.warning("slow query %.1f ms (rows=%s): %s", seconds * 1e3, rows, key)
+        for callback in self._listeners:
+            callback("statement", key, seconds, rows)
+
+    def add_rows(self, sql, rows):
+        key = normalize(sql)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is not None:
+                stats.rows += rows
+
+    def record_phase(self, phase, seconds):
+        with self._lock:
+            hist = self._phases.get(phase)
+            if hist is None:
+                hist = self._phases[phase] = Histogram(self.buckets)
+            hist.add(seconds)
+        for callback in self._listeners:
+            callback(phase, None, seconds, None)
+
+    @contextmanager
+    def timed(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(phase, time.perf_counter() - start)
+
+    # ---------------------- reporting ----------------------
+    def snapshot(self):
+        """Plain-dict copy of everything recorded so far."""
+        with self._lock:
+            statements = {
+                key: dict(s.latency.as_dict(), rows=s.rows, errors=s.errors)
+                for key, s in self._statements.items()
+            }
+            phases = {name: h.as_dict() for name, h in self._phases.items()}
+        return {"statements": statements, "phases": phases}
+
+    def top(self, n=10, by="total"):
+        """The n hottest statements as (statement, stats) pairs."""
+        statements = self.snapshot()["statements"]
+        return sorted(statements.items(), key=lambda kv: kv[1][by], reverse=True)[:n]
+
+    def wrap(self, conn):
+        """Return conn wrapped for timing (or conn itself when disabled)."""
+        if not self.enabled:
+            return conn
+        return InstrumentedConnection(conn, self)
+
+
+class InstrumentedCursor:
+    def __init__(self, raw, metrics):
+        self._raw = raw
+        self._metrics = metrics
+        self._sql = None
+
+    def _run(self, method, sql, params):
+        start = time.perf_counter()
+        try:
+            result = method(sql, params)
+        except Exception:
+            self._metrics.record_statement(sql, time.perf_counter() - start, error=True)
+            raise
+        # rows a query returns are counted as they are fetched, so only
+        # statements without a result set (DML) take rowcount here; a
+        # buffered MySQL cursor reports the selected rows in both places
+        if getattr(self._raw, "description", None) is None:
+            rows = getattr(self._raw, "rowcount", -1)
+        else:
+            rows = None
+        self._metrics.record_statement(sql, time.perf_counter() - start, rows=rows)
+        self._sql = sql
+        return self if result is self._raw else result
+
+    def execute(self, sql, params=()):
+        return self._run(self._raw.execute, sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._run(self._raw.executemany, sql, seq_of_params)
+
+    def _fetched(self, rows):
+        if self._sql is not None and rows:
+            self._metrics.add_rows(self._sql, rows)
+
+    def fetchone(self):
+        row = self._raw.fetchone()
+        self._fetched(row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._raw.fetchmany(size) if size is not None else self._raw.fetchmany()
+        self._fetched(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._raw.fetchall()
+        self._fetched(len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class InstrumentedConnection:
+    def __init__(self, raw, metrics):
+        self._raw = raw
+        self._metrics = metrics
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._raw.cursor(*args, **kwargs), self._metrics)
+
+    def execute(self, sql, params=()):
+        # sqlite3 shortcut used by kunal.py
+        return self.cursor().execute(sql, params)
+
+    def commit(self):
+        with self._metrics.timed("commit"):
+            self._raw.commit()
+
+    def rollback(self):
+        with self._metrics.timed("rollback"):
+            self._raw.rollback()
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._raw.__exit__(*exc)
+
+
+# process-wide default used by connectdb.py and kunal.py
+metrics = QueryMetrics()
+
+
+def set_metrics(new_metrics):
+    """Swap the shared collector (e.g. one with a different threshold)."""
+    global metrics
+    metrics = new_metrics
+    return metrics
@@ -0,0 +1,221 @@
+# dbpool.py
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the acquire timeout."""
+
+
+def default_health_check(conn):
+    """Return True if a DB-API connection still looks usable."""
+    is_connected = getattr(conn, "is_connected", None)
+    if is_connected is not None:
+        return is_connected()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.fetchall()
+        cur.close()
+        return True
+    except Exception:
+        return False
+
+
+class PooledConnection:
+    """Thin proxy around a raw connection; close() hands it back to the pool."""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw)
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise AttributeError(f"connection already returned to pool ({name})")
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self._raw is not None:
+            try:
+                self._raw.rollback()
+            except Exception:
+                pass
+        self.close()
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+
+    connect     -- zero-argument callable returning a new raw connection
+    max_size    -- hard cap on connections alive at the same time
+    max_idle    -- seconds an idle connection may sit before it is evicted
+    health_check -- callable(conn) -> bool, run on connections idle longer
+                    than check_after seconds before handing them out
+    """
+
+    def __init__(self, connect, max_size=5, max_idle=300.0, timeout=30.0,
+                 health_check=default_health_check, check_after=1.0):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self._connect = connect
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.health_check = health_check
+        self.check_after = check_after
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = []      # stack of (raw, released_at); newest last
+        self._size = 0       # connections alive (idle + checked out)
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "creations": 0,
+            "evictions": 0,
+            "failed_checks": 0,
+            "timeouts": 0,
+        }
+
+    # ---------------------- checkout / checkin ----------------------
+    def acquire(self, timeout=None):
+        """Return a PooledConnection, creating one if the pool is not full."""
+        if timeout is None:
+            timeout = self.timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        wait_start = None
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("pool is closed")
+                self._evict_idle_locked()
+                if self._idle:
+                    raw, released_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    raw, released_at = None, None
+                    break
+                if not waited:
+                    waited = True
+                    wait_start = time.monotonic()
+                    self._stats["waits"] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    self._stats["wait_time"] += time.monotonic() - wait_start
+                    raise PoolTimeout(f"no connection available after {timeout}s")
+                self._available.wait(remaining)
+            if waited:
+                self._stats["wait_time"] += time.monotonic() - wait_start
+
+        # connect and health checks happen outside the lock
+        if raw is not None and not self._is_healthy(raw, released_at):
+            self._discard(raw)
+            with self._lock:
+                self._stats["failed_checks"] += 1
+            raw = None  # its slot in _size is reused by the replacement
+        if raw is None:
+            try:
+                raw = self._connect()
+            except Exception:
+                with self._available:
+                    self._size -= 1
+                    self._available.notify()
+                raise
+            with self._lock:
+                self._stats["creations"] += 1
+        with self._lock:
+            self._stats["checkouts"] += 1
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        """Return a raw connection to the idle stack."""
+        try:
+            # never hand out a connection with a half-finished transaction
+            raw.rollback()
+        except Exception:
+            self._discard(raw)
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            return
+        with self._available:
+            if self._closed:
+                self._size -= 1
+                self._discard(raw)
+                return
+            self._idle.append((raw, time.monotonic()))
+            self._available.notify()
+
+    def connection(self, timeout=None):
+        """Alias of acquire() for use in `with pool.connection() as conn:`."""
+        return self.acquire(timeout)
+
+    # ---------------------- maintenance ----------------------
+    def _is_healthy(self, raw, released_at):
+        if self.health_check is None:
+            return True
+        if time.monotonic() - released_at < self.check_after:
+            return True
+        try:
+            return bool(self.health_check(raw))
+        except Exception:
+            return False
+
+    def _evict_idle_locked(self):
+        if self.max_idle is None or not self._idle:
+            return
+        cutoff = time.monotonic() - self.max_idle
+        # oldest entries sit at the bottom of the stack
+        stale = 0
+        while stale < len(self._idle) and self._idle[stale][1] < cutoff:
+            stale += 1
+        if stale:
+            for raw, _ in self._idle[:stale]:
+                self._discard(raw)
+            del self._idle[:stale]
+            self._size -= stale
+            self._stats["evictions"] += stale
+
+    @staticmethod
+    def _discard(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Close idle connections; checked-out ones are closed on release."""
+        with self._available:
+            self._closed = True
+            for raw, _ in self._idle:
+                self._discard(raw)
+            self._size -= len(self._idle)
+            self._idle.clear()
+            self._available.notify_all()
+
+    def stats(self):
+        """Return a snapshot of counters plus current idle / in-use sizes."""
+        with self._lock:
+            snap = dict(self._stats)
+            snap["idle"] = len(self._idle)
+            snap["in_use"] = self._size - len(self._idle)
+            snap["size"] = self._size
+            snap["max_size"] = self.max_size
+        return snap
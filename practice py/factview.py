@@ -0,0 +1,232 @@
+# factview.py
+"""
+Cheap presentation of huge factorial results.
+
+str(n!) is quadratic in CPython and refuses results over 4300 digits by
+default, and a Tk Label holding a million digits takes ages to lay out.
+FactorialResult summarises a result instead: digit count, leading digits
+and trailing digits. Each one is computed with logarithms or modular
+arithmetic. The full decimal expansion is only built when asked for, by a
+subquadratic conversion through the decimal module (libmpdec multiplies
+big numbers with a number-theoretic transform). iter_decimal_chunks()
+cuts it into pieces for a file without building one huge string.
+Either conversion takes seconds for a million digits, so a GUI runs it
+on a worker (see factorial_digits) and only streams the text into the
+widget.
+"""
+
+import decimal
+import math
+from decimal import Decimal, localcontext
+
+LN10 = math.log(10)
+_CHUNK = 64 * 1024
+_DIRECT_BITS = 4096  # below this Decimal(int) is quick enough on its own
+
+
+def factorial_digit_count(n):
+    """Number of decimal digits of n!, from lgamma, without computing n!."""
+    if n < 2:
+        return 1
+    return math.floor(math.lgamma(n + 1) / LN10) + 1
+
+
+def factorial_trailing_zeros(n):
+    """Trailing zeros of n! (Legendre: the number of factors of 5)."""
+    zeros = 0
+    while n:
+        n //= 5
+        zeros += n
+    return zeros
+
+
+def factorial_trailing_digits(n, k=10):
+    """Last k digits of n! before its trailing zeros, computed mod 10**k.
+
+    Every factor of 5 is dropped, along with the same number of factors
+    of 2, so the zeros never form. It takes O(n) small-int steps.
+    """
+    mod = 10 ** k
+    twos = factorial_trailing_zeros(n)  # factors of 2 still to drop
+    result = 1
+    for i in range(2, n + 1):
+        while i % 5 == 0:
+            i //= 5
+        while twos and i % 2 == 0:
+            i //= 2
+            twos -= 1
+        result = result * i % mod
+    return str(result)
+
+
+def _exact_context(ctx):
+    ctx.prec = decimal.MAX_PREC
+    ctx.Emax = decimal.MAX_EMAX
+    ctx.traps[decimal.Inexact] = True
+
+
+def to_decimal(x):
+    """Exact Decimal of a non-negative int in subquadratic time.
+
+    Splits x in binary halves, x = hi * 2**k + lo, converts each half
+    recursively and recombines with Decimal arithmetic.
+    """
+    with localcontext() as ctx:
+        _exact_context(ctx)
+        two = Decimal(2)
+        powers = {}
+
+        def pow2(k):
+            p = powers.get(k)
+            if p is None:
+                p = powers[k] = two ** k
+            return p
+
+        def convert(value, bits):
+            if bits <= _DIRECT_BITS:
+                return Decimal(value)
+            low_bits = bits >> 1
+            hi = value >> low_bits
+            lo = value - (hi << low_bits)
+            return convert(hi, bits - low_bits) * pow2(low_bits) + convert(lo, low_bits)
+
+        return convert(x, x.bit_length())
+
+
+def decimal_str(x):
+    """str(x) for arbitrarily large ints, ignoring the int->str digit limit."""
+    if x < 0:
+        return "-" + decimal_str(-x)
+    return str(to_decimal(x))
+
+
+def iter_decimal_chunks(x, chunk=_CHUNK):
+    """Yield the decimal expansion of x in pieces of at most `chunk` digits.
+
+    Only the Decimal conversion happens up front. The pieces are then cut
+    from it by halving at a digit boundary (shifting a Decimal's exponent
+    is cheap), so the whole string never exists at once.
+    """
+    if x < 0:
+        yield "-"
+        x = -x
+    value = to_decimal(x)
+    with localcontext() as ctx:
+        _exact_context(ctx)
+        yield from _decimal_pieces(value, value.adjusted() + 1, chunk, False)
+
+
+def _decimal_pieces(value, digits, chunk, pad):
+    # value is a non-negative integral Decimal of at most `digits` digits;
+    # pad keeps the leading zeros of a low half
+    if digits <= chunk:
+        text = str(value)
+        yield text.zfill(digits) if pad else text
+        return
+    low = (-(-digits // chunk) // 2) * chunk  # whole chunks in the low half
+    hi = value.scaleb(-low).to_integral_value(rounding=decimal.ROUND_DOWN)
+    lo = value - hi.scaleb(low)
+    yield from _decimal_pieces(hi, digits - low, chunk, pad)
+    yield from _decimal_pieces(lo, low, chunk, True)
+
+
+class FactorialResult:
+    """A computed n! plus cheap views of it."""
+
+    def __init__(self, n, value):
+        self.n = n
+        self.value = value
+        self._digits = None
+
+    @property
+    def digits(self):
+        if self._digits is None:
+            if self.value < 10 ** 15:
+                self._digits = len(str(self.value))
+            else:
+                self._digits = factorial_digit_count(self.n)
+        return self._digits
+
+    @property
+    def trailing_zeros(self):
+        return factorial_trailing_zeros(self.n)
+
+    def leading(self, k=10):
+        """First k digits, from the top bits of the value (k <= 30)."""
+        if self.digits <= k:
+            return str(self.value)
+        shift = max(0, self.value.bit_length() - 192)
+        with localcontext() as ctx:
+            ctx.prec = k + 20
+            ctx.Emax = decimal.MAX_EMAX
+            approx = (Decimal(self.value >> shift) * Decimal(2) ** shift)
+        # ~k+20 significant digits survive the shift and rounding, so the
+        # first k are exact unless followed by a very long run of 9s
+        return "".join(map(str, approx.as_tuple().digits[:k]))
+
+    def trailing(self, k=10):
+        """Last k digits before the trailing zeros."""
+        if self.digits <= k + self.trailing_zeros:
+            return str(self.value).rstrip("0")[-k:] or "0"
+        return factorial_trailing_digits(self.n, k).zfill(k)
+
+    def summary(self, k=10):
+        if self.digits <= 60:
+            return f"{self.n}! = {self.value}"
+        return (f"{self.n}! = {self.leading(k)}...{self.trailing(k)}"
+                f" x 10^{self.trailing_zeros}\n"
+                f"({self.digits:,} digits)")
+
+    def full_text(self):
+        return decimal_str(self.value)
+
+    def save(self, path, chunk=_CHUNK):
+        """Write the full decimal expansion to path."""
+        with open(path, "w") as f:
+            for piece in iter_decimal_chunks(self.value, chunk):
+                f.write(piece)
+            f.write("\n")
+        return path
+
+
+def stream_into_text(widget, text, chunk=_CHUNK, delay_ms=1):
+    """Insert text into a Tk Text widget a chunk per event-loop turn."""
+    widget.delete("1.0", "end")
+
+    def step(start=0):
+        if start >= len(text) or not widget.winfo_exists():
+            return
+        widget.insert("end", text[start:start + chunk])
+        widget.after(delay_ms, step, start + chunk)
+
+    step()
+
+
+def show_digits_window(parent, title, text):
+    """Open a scrollable window and stream text into it."""
+    import tkinter as tk
+
+    win = tk.Toplevel(parent)
+    win.title(title)
+    body = tk.Text(win, wrap="char", width=80, height=24)
+    scroll = tk.Scrollbar(win, command=body.yview)
+    body.config(yscrollcommand=scroll.set)
+    scroll.pack(side="right", fill="y")
+    body.pack(side="left", fill="both", expand=True)
+    stream_into_text(body, text)
+    return win
+
+
+def factorial_summary(n, factorial):
+    """Worker-side helper: compute n! with `factorial` and summarise it."""
+    return FactorialResult(n, factorial(n)).summary()
+
+
+def factorial_digits(n, factorial):
+    """Worker-side helper: full decimal expansion of n!."""
+    return decimal_str(factorial(n))
+
+
+def save_factorial(n, factorial, path):
+    """Worker-side helper: write n! to path."""
+    return FactorialResult(n, factorial(n)).save(path)
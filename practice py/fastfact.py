@@ -0,0 +1,152 @@
+# fastfact.py
+"""
+Shared factorial engine for kunal.py, gui.py and recursion.py.
+
+The naive `for i in range(2, n + 1): res *= i` multiplies a huge running
+product by a small int n times, which is roughly quadratic in the size of
+the result. Splitting the range in halves and multiplying the two halves
+(a product tree) keeps both operands of similar size, so the big
+multiplications can use CPython's Karatsuba path.
+
+factorial(n)        -- math.factorial: CPython's C implementation of the
+                       same divide-and-conquer idea (odd-part binary
+                       splitting plus a final shift for the powers of 2)
+factorial_split(n)  -- the product tree in pure Python, for reference
+range_product(a, b) -- product of a..b-1; the building block used to
+                       split work across processes
+factorials(ns)      -- many queries at once, extending one running product
+                       and reusing an LRU of earlier results as checkpoints
+"""
+
+import math
+import threading
+from collections import OrderedDict
+
+# below this span a straight loop beats further splitting
+_LEAF = 32
+
+
+def _check(n):
+    if not isinstance(n, int):
+        raise TypeError("n must be an int")
+    if n < 0:
+        raise ValueError("n must be >= 0")
+
+
+def range_product(lo, hi):
+    """Product of the integers lo, lo+1, ..., hi-1 (1 for an empty range).
+
+    Recursion only goes log2((hi - lo) / _LEAF) levels deep, so there is no
+    practical recursion limit.
+    """
+    if hi - lo <= _LEAF:
+        result = 1
+        for i in range(lo, hi):
+            result *= i
+        return result
+    mid = (lo + hi) // 2
+    return range_product(lo, mid) * range_product(mid, hi)
+
+
+def factorial(n):
+    """n! for n >= 0."""
+    _check(n)
+    return math.factorial(n)
+
+
+def factorial_split(n):
+    """n! via the pure-Python product tree (same result as factorial)."""
+    _check(n)
+    return range_product(2, n + 1)
+
+
+# ---------------------- batches / checkpoints ----------------------
+# LRU of n -> n!, bounded by the total size of the cached values
+CHECKPOINT_BUDGET_BITS = 1 << 28  # 32 MiB of digits
+_checkpoints = OrderedDict()
+_checkpoint_bits = 0
+_checkpoint_lock = threading.Lock()
+
+
+def _nearest_checkpoint(n):
+    """Largest cached k <= n as (k, k!), or (1, 1)."""
+    best_k, best = 1, 1
+    with _checkpoint_lock:
+        for k, value in _checkpoints.items():
+            if best_k < k <= n:
+                best_k, best = k, value
+        if best_k in _checkpoints:
+            _checkpoints.move_to_end(best_k)
+    return best_k, best
+
+
+def _remember(n, value):
+    global _checkpoint_bits
+    bits = value.bit_length()
+    if n < 2 or bits > CHECKPOINT_BUDGET_BITS:
+        return
+    with _checkpoint_lock:
+        if n in _checkpoints:
+            _checkpoints.move_to_end(n)
+            return
+        _checkpoints[n] = value
+        _checkpoint_bits += bits
+        while _checkpoint_bits > CHECKPOINT_BUDGET_BITS:
+            _, old = _checkpoints.popitem(last=False)
+            _checkpoint_bits -= old.bit_length()
+
+
+def clear_checkpoints():
+    global _checkpoint_bits
+    with _checkpoint_lock:
+        _checkpoints.clear()
+        _checkpoint_bits = 0
+
+
+def factorials(ns):
+    """[n! for n in ns], sharing work between the queries.
+
+    Queries are answered in ascending order. Each one multiplies the
+    previous answer by the product tree of the gap, starting from the
+    nearest cached checkpoint. Answers are cached as checkpoints for later
+    calls.
+    """
+    ns = list(ns)
+    for n in ns:
+        _check(n)
+    answers = {}
+    k, value = None, None
+    for n in sorted(set(ns)):
+        if n <= 1:
+            answers[n] = 1
+            continue
+        near_k, near = _nearest_checkpoint(n)
+        if k is None or near_k > k:
+            k, value = near_k, near
+        if k == n:
+            answers[n] = value
+            continue
+        if 2 * k < n:
+            # far from anything known: the C implementation wins
+            value = math.factorial(n)
+        else:
+            value *= range_product(k + 1, n + 1)
+        k = n
+        answers[n] = value
+        _remember(n, value)
+    return [answers[n] for n in ns]
+
+
+def factorial_cached(n):
+    """n!, extended from the nearest checkpoint when one is close."""
+    return factorials([n])[0]
+
+
+def factorial_naive(n):
+    """The old linear loop, kept for benchmarks."""
+    _check(n)
+    result = 1
+    for i in range(2, n + 1):
+        result *= i
+    return result
+
@@ -1,8 +1,25 @@
 # tkinter_factorial.py
+import os
 import tkinter as tk
 from tkinter import messagebox
 
+import factview
+import parfact
+from tktasks import TkTaskRunner
+
+WORKERS = os.cpu_count() or 2
+last_result = None
+task = None
+
+def factorial_job(n, progress=None, cancel_event=None):
+    # runs on a worker thread; the multiplications happen in parfact's process pool
+    value = parfact.parallel_factorial(n, workers=WORKERS, progress=progress, cancel_event=cancel_event)
+    result = factview.FactorialResult(n, value)
+    # the summary's trailing digits take O(n) steps, so build the text here too
+    return result, result.summary()
+
 def compute_factorial():
+    global task, last_result
     try:
         n = int(entry.get())
         if n < 0:
@@ -11,23 +28,69 @@ def compute_factorial():
         messagebox.showerror("Error", "Please enter a non-negative integer.")
         return
 
-    # compute factorial iteratively to avoid recursion limit
-    result = 1
-    for i in range(2, n+1):
-        result *= i
-    result_label.config(text=f"{n}! = {result}")
+    last_result = None
+    task = runner.submit(factorial_job, n, control=True, on_done=show_result,
+                         on_progress=show_progress, on_error=show_error, busy=set_busy)
+
+def show_result(done):
+    global last_result
+    # a summary, not the full number: str() of a huge int is slow and capped
+    last_result, summary = done
+    result_label.config(text=summary)
+    digits_btn.config(state="normal")
+
+def show_progress(done, total):
+    result_label.config(text=f"Computing... {100 * done // total}%")
+
+def show_error(e):
+    messagebox.showerror("Error", f"Calculation failed: {e}")
+
+def set_busy(busy):
+    compute_btn.config(state="disabled" if busy else "normal")
+    cancel_btn.config(state="normal" if busy else "disabled")
+    digits_btn.config(state="normal" if last_result is not None and not busy else "disabled")
+
+def cancel():
+    if task is not None:
+        task.cancel()
+        if last_result is None:  # not while converting a shown result
+            result_label.config(text="Cancelled")
+
+def show_all_digits():
+    global task
+    if last_result is None:
+        return
+    # the decimal conversion takes seconds for a big n!, so it runs in the
+    # process pool and only the finished text comes back to the Tk thread
+    n = last_result.n
+    task = runner.submit(factview.decimal_str, last_result.value, kind="cpu",
+                         on_done=lambda text: factview.show_digits_window(root, f"{n}!", text),
+                         on_error=show_error, busy=set_busy)
+
+def on_close():
+    runner.shutdown()
+    root.destroy()
+
+# guarded so process-pool workers started with "spawn" don't open windows
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Factorial Calculator")
+    runner = TkTaskRunner(root)
+    root.protocol("WM_DELETE_WINDOW", on_close)
 
-root = tk.Tk()
-root.title("Factorial Calculator")
+    tk.Label(root, text="Enter n:").grid(row=0, column=0, padx=8, pady=8)
+    entry = tk.Entry(root)
+    entry.grid(row=0, column=1, padx=8, pady=8)
 
-tk.Label(root, text="Enter n:").grid(row=0, column=0, padx=8, pady=8)
-entry = tk.Entry(root)
-entry.grid(row=0, column=1, padx=8, pady=8)
+    compute_btn = tk.Button(root, text="Compute", command=compute_factorial)
+    compute_btn.grid(row=1, column=0, pady=8)
+    cancel_btn = tk.Button(root, text="Cancel", command=cancel, state="disabled")
+    cancel_btn.grid(row=1, column=1, pady=8)
 
-compute_btn = tk.Button(root, text="Compute", command=compute_factorial)
-compute_btn.grid(row=1, column=0, columnspan=2, pady=8)
+    result_label = tk.Label(root, text="Result will appear here")
+    result_label.grid(row=2, column=0, columnspan=2, pady=8)
 
-result_label = tk.Label(root, text="Result will appear here")
-result_label.grid(row=2, column=0, columnspan=2, pady=8)
+    digits_btn = tk.Button(root, text="Show all digits", command=show_all_digits, state="disabled")
+    digits_btn.grid(row=3, column=0, columnspan=2, pady=8)
 
-root.mainloop()
\ No newline at end of file
+    root.mainloop()
\ No newline at end of file
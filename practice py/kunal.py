@@ -6,25 +6,106 @@ Features:
 - Calculator (basic)
 - Guess Number (simple)
 - Advanced Guess Number (difficulty, score, restart)
-- Factorial (iterative + recursive)
+- Factorial (iterative + recursive), computed off the UI thread
 - Quiz Game (MCQ)
 Author: Generated for Kunal
 """
 
 import tkinter as tk
-from tkinter import messagebox, simpledialog
+from tkinter import messagebox, simpledialog, filedialog
+import os
 import sqlite3
+import threading
 import random
 import math
 from functools import partial
 
+import calcexpr
+import dbmetrics
+import factview
+import fastfact
+import parfact
+from authcache import UserCache
+from tktasks import TkTaskRunner, TooManyTasks
+
 DB_PATH = "app_users.db"
 
 
 # ---------------------- Database helpers ----------------------
+class UserDB:
+    """Long-lived, tuned sqlite3 connections for the user store.
+
+    sqlite3 connections may not be shared across threads, so each thread
+    gets its own connection, opened on first use and reused afterwards.
+    Keeping it open also keeps sqlite's prepared-statement cache warm for
+    the fixed SQL strings below.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",      # readers don't block the writer, fewer fsyncs
+        "PRAGMA synchronous=NORMAL",    # fsync at checkpoints, not every commit (safe with WAL)
+        "PRAGMA cache_size=-8000",      # ~8 MB page cache
+        "PRAGMA mmap_size=67108864",    # 64 MB memory-mapped reads
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=5000",
+    )
+    CACHED_STATEMENTS = 256
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self.users = UserCache(self._load_password, self._load_usernames)
+
+    def _load_password(self, username):
+        row = self.connection().execute(PASSWORD_SQL, (username,)).fetchone()
+        return row[0] if row else None
+
+    def _load_usernames(self):
+        return [row[0] for row in self.connection().execute("SELECT username FROM users")]
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with dbmetrics.metrics.timed("connect"):
+                raw = sqlite3.connect(self.path, cached_statements=self.CACHED_STATEMENTS)
+                for pragma in self.PRAGMAS:
+                    raw.execute(pragma)
+            conn = self._local.conn = dbmetrics.metrics.wrap(raw)
+        return conn
+
+    def close(self):
+        """Close this thread's connection (others close with their thread)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
+
+_user_dbs = {}
+_user_dbs_lock = threading.Lock()
+
+
+def get_user_db():
+    """The UserDB for the current DB_PATH."""
+    db = _user_dbs.get(DB_PATH)
+    if db is None:
+        with _user_dbs_lock:
+            db = _user_dbs.setdefault(DB_PATH, UserDB(DB_PATH))
+    return db
+
+
+def _connect():
+    """This thread's user-store connection; do not close it."""
+    return get_user_db().connection()
+
+
+INSERT_USER_SQL = "INSERT INTO users (username, password) VALUES (?, ?)"
+PASSWORD_SQL = "SELECT password FROM users WHERE username=?"
+
+
 def init_db():
     """Create users table if not exists."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect()
     cur = conn.cursor()
     cur.execute(
         """
@@ -36,35 +117,62 @@ def init_db():
         """
     )
     conn.commit()
-    conn.close()
 
 
 def register_user(username, password):
+    conn = None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = _connect()
         cur = conn.cursor()
-        cur.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password))
+        cur.execute(INSERT_USER_SQL, (username, password))
         conn.commit()
-        conn.close()
+        get_user_db().users.added(username)
         return True, "Registered Successfully"
     except sqlite3.IntegrityError:
+        conn.rollback()
         return False, "Username already exists"
     except Exception as e:
+        if conn is not None:
+            conn.rollback()
         return False, f"DB Error: {e}"
 
 
+def register_users(users):
+    """Bulk import (username, password) pairs in one transaction.
+
+    Existing usernames are skipped. Returns (registered, skipped).
+    """
+    users = list(users)
+    conn = _connect()
+    cur = conn.cursor()
+    try:
+        cur.executemany("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)", users)
+        registered = cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    cache = get_user_db().users
+    for username, _ in users:
+        cache.added(username)
+    return registered, len(users) - registered
+
+
 def verify_user(username, password):
+    # served from UserCache: repeat logins skip the DB, unknown names are
+    # usually rejected by its Bloom filter without a query at all
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        cur.execute("SELECT id FROM users WHERE username=? AND password=?", (username, password))
-        row = cur.fetchone()
-        conn.close()
-        return bool(row)
+        stored = get_user_db().users.get(username)
+        return stored is not None and stored == password
     except Exception:
         return False
 
 
+def auth_cache_stats():
+    """Hit/miss counters of the verify_user cache."""
+    return get_user_db().users.snapshot()
+
+
 # ---------------------- App & Frames (OOP) ----------------------
 class App(tk.Tk):
     def __init__(self):
@@ -74,6 +182,9 @@ class App(tk.Tk):
         self.geometry("480x560")
         self.resizable(False, False)
         self.current_user = None
+        # DB calls and heavy maths run here so the mainloop never blocks
+        self.tasks = TkTaskRunner(self)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # container for frames
         self.container = tk.Frame(self)
@@ -98,6 +209,18 @@ class App(tk.Tk):
         self.current_user = None
         self.show_frame("LoginFrame")
 
+    def run_task(self, fn, *args, **kwargs):
+        """Submit background work; warns and returns None if too much is in flight."""
+        try:
+            return self.tasks.submit(fn, *args, **kwargs)
+        except TooManyTasks:
+            messagebox.showwarning("Busy", "Please wait for running tasks to finish")
+            return None
+
+    def on_close(self):
+        self.tasks.shutdown()
+        self.destroy()
+
 
 # ---------------------- Authentication Frames ----------------------
 class LoginFrame(tk.Frame):
@@ -113,9 +236,12 @@ class LoginFrame(tk.Frame):
         self.password = tk.Entry(self, show="*")
         self.password.pack()
 
-        tk.Button(self, text="Login", command=self.try_login).pack(pady=10)
+        self.login_btn = tk.Button(self, text="Login", command=self.try_login)
+        self.login_btn.pack(pady=10)
         tk.Button(self, text="Register", command=lambda: controller.show_frame("RegisterFrame")).pack()
         tk.Button(self, text="Continue as Guest", command=self.guest_continue).pack(pady=6)
+        self.status_label = tk.Label(self, text="")
+        self.status_label.pack()
 
     def try_login(self):
         user = self.username.get().strip()
@@ -123,7 +249,16 @@ class LoginFrame(tk.Frame):
         if not user or not pwd:
             messagebox.showwarning("Input required", "Enter username and password")
             return
-        if verify_user(user, pwd):
+        self.controller.run_task(verify_user, user, pwd,
+                                 on_done=lambda ok: self._login_done(user, ok),
+                                 busy=self._set_busy)
+
+    def _set_busy(self, busy):
+        self.login_btn.config(state="disabled" if busy else "normal")
+        self.status_label.config(text="Checking..." if busy else "")
+
+    def _login_done(self, user, ok):
+        if ok:
             self.controller.current_user = user
             messagebox.showinfo("Welcome", f"Hello, {user}!")
             self.controller.show_frame("MainMenuFrame")
@@ -147,8 +282,11 @@ class RegisterFrame(tk.Frame):
         self.password = tk.Entry(self, show="*")
         self.password.pack()
 
-        tk.Button(self, text="Register", command=self.do_register).pack(pady=10)
+        self.register_btn = tk.Button(self, text="Register", command=self.do_register)
+        self.register_btn.pack(pady=10)
         tk.Button(self, text="Back to Login", command=lambda: controller.show_frame("LoginFrame")).pack()
+        self.status_label = tk.Label(self, text="")
+        self.status_label.pack()
 
     def do_register(self):
         user = self.username.get().strip()
@@ -156,7 +294,15 @@ class RegisterFrame(tk.Frame):
         if not user or not pwd:
             messagebox.showwarning("Input required", "Enter username and password")
             return
-        ok, msg = register_user(user, pwd)
+        self.controller.run_task(register_user, user, pwd,
+                                 on_done=self._register_done, busy=self._set_busy)
+
+    def _set_busy(self, busy):
+        self.register_btn.config(state="disabled" if busy else "normal")
+        self.status_label.config(text="Saving..." if busy else "")
+
+    def _register_done(self, result):
+        ok, msg = result
         if ok:
             messagebox.showinfo("Success", msg)
             self.controller.show_frame("LoginFrame")
@@ -204,6 +350,11 @@ class CalculatorFrame(tk.Frame):
         self.expr = tk.StringVar()
         entry = tk.Entry(self, textvariable=self.expr, font=("Arial", 20), justify="right")
         entry.pack(fill="x", padx=10)
+        # live result while typing; LivePreview re-parses only the edited tail
+        self.preview = tk.Label(self, text="", fg="gray", anchor="e")
+        self.preview.pack(fill="x", padx=10)
+        self.live = calcexpr.LivePreview()
+        self.expr.trace_add("write", lambda *_: self.update_preview())
 
         btn_frame = tk.Frame(self)
         btn_frame.pack(pady=8)
@@ -228,14 +379,21 @@ class CalculatorFrame(tk.Frame):
         current = self.expr.get()
         self.expr.set(current + val)
 
+    def update_preview(self):
+        try:
+            text = calcexpr.format_result(self.live.evaluate(self.expr.get()))
+        except (calcexpr.CalcError, ArithmeticError):
+            text = ""
+        self.preview.config(text=text)
+
     def calculate(self):
         expression = self.expr.get()
         try:
-            # safe eval: only allow math operators & numbers
-            # __builtins__ removed; math functions are not allowed here
-            result = eval(expression, {"__builtins__": None}, {})
-            self.expr.set(str(result))
-        except Exception as e:
+            # own parser instead of eval: numbers and + - * / // % ** ( ) only,
+            # with size limits so e.g. 9**9**9 fails fast instead of hanging
+            result = calcexpr.evaluate(expression)
+            self.expr.set(calcexpr.format_result(result))
+        except (calcexpr.CalcError, ArithmeticError) as e:
             messagebox.showerror("Error", f"Invalid expression: {e}")
 
 
@@ -364,43 +522,144 @@ class AdvancedGuessFrame(tk.Frame):
 
 
 # ---------------------- Factorial Frame ----------------------
+# module-level so they can be pickled to the task runner's process pool
+def factorial_iterative(n):
+    # repeat / nearby queries extend a cached checkpoint instead of restarting
+    return fastfact.factorial_cached(n)
+
+
+def _fact_rec(n):
+    # divide-and-conquer product tree: recursion depth is log2(n), not n
+    return fastfact.factorial_split(n)
+
+
+def _factorial_text(fn, label, n):
+    # only a summary comes back: str() of a huge int is slow and capped at
+    # 4300 digits, and a Label can't lay out a million of them anyway
+    return f"Factorial ({label}):\n{factview.factorial_summary(n, fn)}"
+
+
+PARALLEL_WORKERS = os.cpu_count() or 2
+
+
+def _parallel_factorial_text(n, progress=None, cancel_event=None):
+    # runs on a runner thread that only waits on parfact's process pool
+    value = parfact.parallel_factorial(n, workers=PARALLEL_WORKERS, progress=progress,
+                                       cancel_event=cancel_event)
+    return f"Factorial (parallel):\n{factview.FactorialResult(n, value).summary()}"
+
+
 class FactorialFrame(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        self.task = None
+        self.last = None  # (fn, n) of the result on screen
         tk.Label(self, text="Factorial Calculator", font=("Helvetica", 18)).pack(pady=8)
         tk.Label(self, text="Enter non-negative integer:").pack()
         self.n_entry = tk.Entry(self)
         self.n_entry.pack()
-        tk.Button(self, text="Calculate Iterative", command=self.calc_iter).pack(pady=6)
-        tk.Button(self, text="Calculate Recursive", command=self.calc_rec).pack(pady=6)
-        self.out_label = tk.Label(self, text="")
+        self.iter_btn = tk.Button(self, text="Calculate Iterative", command=self.calc_iter)
+        self.iter_btn.pack(pady=6)
+        self.rec_btn = tk.Button(self, text="Calculate Recursive", command=self.calc_rec)
+        self.rec_btn.pack(pady=6)
+        self.par_btn = tk.Button(self, text=f"Calculate Parallel ({PARALLEL_WORKERS} workers)",
+                                 command=self.calc_parallel)
+        self.par_btn.pack(pady=6)
+        self.cancel_btn = tk.Button(self, text="Cancel", command=self.cancel, state="disabled")
+        self.cancel_btn.pack()
+        self.out_label = tk.Label(self, text="", wraplength=440)
         self.out_label.pack(pady=8)
+        digits_row = tk.Frame(self)
+        digits_row.pack()
+        self.show_btn = tk.Button(digits_row, text="Show all digits", command=self.show_digits, state="disabled")
+        self.show_btn.pack(side="left", padx=4)
+        self.save_btn = tk.Button(digits_row, text="Save digits...", command=self.save_digits, state="disabled")
+        self.save_btn.pack(side="left", padx=4)
         tk.Button(self, text="Back to Menu", command=lambda: controller.show_frame("MainMenuFrame")).pack(side="bottom", pady=8)
 
     def calc_iter(self):
         n = self._get_n()
         if n is None:
             return
-        try:
-            res = 1
-            for i in range(1, n + 1):
-                res *= i
-            self.out_label.config(text=f"Factorial (iterative): {res}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Calculation failed: {e}")
+        self._start(factorial_iterative, "iterative", n)
 
     def calc_rec(self):
         n = self._get_n()
         if n is None:
             return
-        try:
-            res = self._fact_rec(n)
-            self.out_label.config(text=f"Factorial (recursive): {res}")
-        except RecursionError:
-            messagebox.showerror("Error", "Recursion limit reached for this input")
-        except Exception as e:
-            messagebox.showerror("Error", f"Calculation failed: {e}")
+        self._start(_fact_rec, "recursive", n)
+
+    def calc_parallel(self):
+        n = self._get_n()
+        if n is None:
+            return
+        self.last = None
+        self.task = self.controller.run_task(
+            _parallel_factorial_text, n, control=True,
+            on_done=lambda text: self._show(text, factorial_iterative, n),
+            on_progress=self._progress, on_error=self._failed, busy=self._set_busy)
+
+    def _progress(self, done, total):
+        self.out_label.config(text=f"Calculating... {100 * done // total}% ({done}/{total} jobs)")
+
+    def _start(self, fn, label, n):
+        self.last = None
+        self.task = self.controller.run_task(_factorial_text, fn, label, n, kind="cpu",
+                                             on_done=lambda text: self._show(text, fn, n),
+                                             on_error=self._failed, busy=self._set_busy)
+
+    def show_digits(self):
+        if self.last is None:
+            return
+        fn, n = self.last
+        self.task = self.controller.run_task(
+            factview.factorial_digits, n, fn, kind="cpu",
+            on_done=lambda text: factview.show_digits_window(self, f"{n}!", text),
+            on_error=self._failed, busy=self._set_busy)
+
+    def save_digits(self):
+        if self.last is None:
+            return
+        fn, n = self.last
+        path = filedialog.asksaveasfilename(defaultextension=".txt", initialfile=f"factorial_{n}.txt")
+        if not path:
+            return
+        self.task = self.controller.run_task(
+            factview.save_factorial, n, fn, path, kind="cpu",
+            on_done=lambda p: messagebox.showinfo("Saved", f"{n}! written to {p}"),
+            on_error=self._failed, busy=self._set_busy)
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+            if self.last is None:
+                self.out_label.config(text="Cancelled")
+
+    def _set_busy(self, busy):
+        state = "disabled" if busy else "normal"
+        self.iter_btn.config(state=state)
+        self.rec_btn.config(state=state)
+        self.par_btn.config(state=state)
+        self.cancel_btn.config(state="normal" if busy else "disabled")
+        digits_state = "normal" if self.last is not None and not busy else "disabled"
+        self.show_btn.config(state=digits_state)
+        self.save_btn.config(state=digits_state)
+        if busy:
+            if self.last is None:
+                self.out_label.config(text="Calculating...")
+        else:
+            self.task = None
+
+    def _show(self, text, fn, n):
+        self.last = (fn, n)
+        self.out_label.config(text=text)
+        self.show_btn.config(state="normal")
+        self.save_btn.config(state="normal")
+
+    def _failed(self, e):
+        self.out_label.config(text="")
+        messagebox.showerror("Error", f"Calculation failed: {e}")
 
     def _get_n(self):
         try:
@@ -413,11 +672,6 @@ class FactorialFrame(tk.Frame):
             messagebox.showwarning("Invalid", "Enter a valid integer")
             return None
 
-    def _fact_rec(self, n):
-        if n == 0 or n == 1:
-            return 1
-        return n * self._fact_rec(n - 1)
-
 
 # ---------------------- Quiz Game ----------------------
 class QuizFrame(tk.Frame):
@@ -0,0 +1,146 @@
+# modcomb.py
+"""
+Factorials and binomial coefficients modulo a prime.
+
+    fact_mod(10**6, 10**9 + 7)
+    ncr_mod(10**6, 1234, 10**9 + 7)
+
+A FactorialTable holds fact[i] = i! mod p and inv_fact[i] = (i!)^-1 mod p
+in flat int64 arrays (array module, or NumPy when available). After the
+one-off O(size) build, every nCr query is three lookups and two
+multiplications. Tables grow by doubling when a larger n comes in.
+Queries with n >= p fall back to Lucas' theorem.
+"""
+
+import threading
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # plain arrays still give O(1) queries
+    np = None
+
+DEFAULT_MOD = 10 ** 9 + 7
+
+
+class FactorialTable:
+    def __init__(self, p=DEFAULT_MOD, size=1024):
+        if p < 2:
+            raise ValueError("p must be a prime >= 2")
+        self.p = p
+        self.fact = array("q", [1])
+        self.inv_fact = array("q", [1])
+        self._np = None  # NumPy views of the arrays, built lazily
+        self._lock = threading.Lock()
+        self.reserve(size)
+
+    def __len__(self):
+        return len(self.fact)
+
+    def reserve(self, n):
+        """Make sure indices 0..n-1 (capped at p) are present."""
+        n = min(n, self.p)
+        if n <= len(self.fact):
+            return
+        with self._lock:
+            size = len(self.fact)
+            if n <= size:
+                return
+            new_size = min(max(n, 2 * size), self.p)
+            p = self.p
+            # build fresh arrays: NumPy views may pin the old buffers
+            fact = self.fact.tolist()
+            value = fact[-1]
+            for i in range(size, new_size):
+                value = value * i % p
+                fact.append(value)
+            inv = [0] * new_size
+            inv[-1] = pow(fact[-1], p - 2, p)  # Fermat: p is prime
+            for i in range(new_size - 1, 0, -1):
+                inv[i - 1] = inv[i] * i % p
+            self._np = None
+            self.fact = array("q", fact)
+            self.inv_fact = array("q", inv)
+
+    def fact_mod(self, n):
+        if n < 0:
+            raise ValueError("n must be >= 0")
+        if n >= self.p:
+            return 0
+        self.reserve(n + 1)
+        return self.fact[n]
+
+    def _ncr_small(self, n, r):
+        # n < p here
+        if r < 0 or r > n:
+            return 0
+        self.reserve(n + 1)
+        p = self.p
+        return self.fact[n] * self.inv_fact[r] % p * self.inv_fact[n - r] % p
+
+    def ncr_mod(self, n, r):
+        """C(n, r) mod p; Lucas' theorem handles n >= p."""
+        if n < 0:
+            raise ValueError("n must be >= 0")
+        if r < 0 or r > n:
+            return 0
+        if n < self.p:
+            return self._ncr_small(n, r)
+        p = self.p
+        result = 1
+        while n or r:
+            result = result * self._ncr_small(n % p, r % p) % p
+            if not result:
+                return 0
+            n //= p
+            r //= p
+        return result
+
+    def ncr_many(self, ns, rs):
+        """C(n, r) mod p for paired sequences (all n < p)."""
+        ns = list(ns)
+        rs = list(rs)
+        if ns:
+            self.reserve(max(ns) + 1)
+        if np is not None and self.p < 3 * 10 ** 9:
+            # products of two residues fit in int64 below ~3.03e9
+            return self._ncr_many_np(ns, rs).tolist()
+        fact, inv_fact, p = self.fact, self.inv_fact, self.p
+        return [fact[n] * inv_fact[r] % p * inv_fact[n - r] % p if 0 <= r <= n else 0
+                for n, r in zip(ns, rs)]
+
+    def _ncr_many_np(self, ns, rs):
+        if self._np is None:
+            self._np = (np.frombuffer(self.fact, dtype=np.int64),
+                        np.frombuffer(self.inv_fact, dtype=np.int64))
+        fact, inv_fact = self._np
+        n = np.asarray(ns, dtype=np.int64)
+        r = np.asarray(rs, dtype=np.int64)
+        valid = (r >= 0) & (r <= n)
+        r_safe = np.where(valid, r, 0)
+        k_safe = np.where(valid, n - r, 0)
+        out = fact[n] * inv_fact[r_safe] % self.p * inv_fact[k_safe] % self.p
+        return np.where(valid, out, 0)
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def table(p=DEFAULT_MOD):
+    """Shared FactorialTable for modulus p."""
+    t = _tables.get(p)
+    if t is None:
+        with _tables_lock:
+            t = _tables.setdefault(p, FactorialTable(p))
+    return t
+
+
+def fact_mod(n, p=DEFAULT_MOD):
+    """n! mod p for prime p."""
+    return table(p).fact_mod(n)
+
+
+def ncr_mod(n, r, p=DEFAULT_MOD):
+    """C(n, r) mod p for prime p."""
+    return table(p).ncr_mod(n, r)
@@ -1,22 +1,21 @@
 # threading_example.py
-import threading
 import time
 
+import taskpool
+
 def worker(name, count):
     for i in range(count):
         print(f"[{name}] working {i+1}/{count}")
         time.sleep(0.5)  # simulate I/O or work
 
 if __name__ == "__main__":
-    t1 = threading.Thread(target=worker, args=("Thread-A", 4))
-    t2 = threading.Thread(target=worker, args=("Thread-B", 3))
-
-    # Start threads
-    t1.start()
-    t2.start()
+    # a fixed pool instead of one Thread per job; see taskpool.py
+    with taskpool.TaskPool(workers=2, queue_size=10, name="Thread") as pool:
+        jobs = [pool.submit(worker, "Thread-A", 4), pool.submit(worker, "Thread-B", 3)]
 
-    # Wait for threads to finish
-    t1.join()
-    t2.join()
+        # Wait for the jobs to finish (re-raises if a worker failed)
+        for job in jobs:
+            job.result()
 
-    print("Both threads finished.")
\ No newline at end of file
+    print("Both threads finished.")
+    print(f"worker utilisation: {pool.stats()['utilisation']:.0%}")
\ No newline at end of file
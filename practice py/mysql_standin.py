@@ -0,0 +1,124 @@
+# mysql_standin.py
+"""
+Local sqlite3-backed stand-in for mysql.connector.
+
+Lets connectdb.py (and its pool) run without a MySQL server:
+
+    import connectdb, mysql_standin
+    connectdb.configure_pool(connect=mysql_standin.connector("students.db"))
+
+Only the slice of MySQL SQL used by this project is translated
+(%s placeholders, AUTO_INCREMENT, inline INDEX clauses, CREATE INDEX
+being idempotent).
+"""
+
+import re
+import sqlite3
+import time
+
+Error = sqlite3.Error
+IntegrityError = sqlite3.IntegrityError
+
+_INLINE_INDEX = re.compile(r",\s*(?:INDEX|KEY)\s+(\w+)\s*\(([^)]*)\)", re.IGNORECASE)
+_CREATE_TABLE = re.compile(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+
+
+def translate(sql):
+    """Rewrite a MySQL statement into one or more sqlite statements."""
+    sql = sql.replace("%s", "?")
+    sql = re.sub(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b",
+                 "INTEGER PRIMARY KEY AUTOINCREMENT", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"^\s*CREATE\s+INDEX\s+(?!IF\b)", "CREATE INDEX IF NOT EXISTS ", sql, flags=re.IGNORECASE)
+    table = _CREATE_TABLE.search(sql)
+    if not table:
+        return [sql]
+    extra = []
+    for name, cols in _INLINE_INDEX.findall(sql):
+        extra.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table.group(1)} ({cols})")
+    return [_INLINE_INDEX.sub("", sql)] + extra
+
+
+class Cursor:
+    """DB-API cursor that accepts MySQL-flavoured SQL."""
+
+    def __init__(self, raw, latency=0.0):
+        self._raw = raw
+        self._latency = latency
+        self.lastrowid = None
+
+    def execute(self, sql, params=()):
+        if self._latency:
+            time.sleep(self._latency)
+        stmts = translate(sql)
+        self._raw.execute(stmts[0], params)
+        for stmt in stmts[1:]:
+            self._raw.connection.execute(stmt)
+        self.lastrowid = self._raw.lastrowid
+        if self._raw.rowcount > 1 and stmts[0].lstrip()[:6].upper() == "INSERT":
+            # MySQL reports the id of the *first* row of a multi-row INSERT
+            self.lastrowid -= self._raw.rowcount - 1
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        if self._latency:
+            time.sleep(self._latency)
+        self._raw.executemany(translate(sql)[0], seq_of_params)
+        return self
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+
+class Connection:
+    """Wraps sqlite3.Connection with the mysql.connector methods we call."""
+
+    def __init__(self, database, latency=0.0):
+        self._raw = sqlite3.connect(database, check_same_thread=False, uri=database.startswith("file:"))
+        self._latency = latency
+        self._open = True
+
+    def cursor(self, *args, **kwargs):
+        # buffered=/dictionary= etc. have no sqlite equivalent; ignore them
+        return Cursor(self._raw.cursor(), self._latency)
+
+    def commit(self):
+        self._raw.commit()
+        if self._latency:
+            # wait for the "ack" after releasing sqlite's write lock
+            time.sleep(self._latency)
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def is_connected(self):
+        if not self._open:
+            return False
+        try:
+            self._raw.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if not self.is_connected():
+            raise Error("connection lost")
+
+    def close(self):
+        self._open = False
+        self._raw.close()
+
+
+def connect(database=":memory:", latency=0.0, **kwargs):
+    """mysql.connector.connect() look-alike; host/user/password are ignored.
+
+    latency adds a sleep per execute/commit to mimic a network round trip.
+    """
+    return Connection(database, latency)
+
+
+def connector(database, latency=0.0):
+    """Return a zero-argument connect callable for ConnectionPool."""
+    return lambda: connect(database=database, latency=latency)
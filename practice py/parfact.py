@@ -0,0 +1,122 @@
+# parfact.py
+"""
+n! split across a process pool.
+
+The range 2..n is cut into chunks, and each worker multiplies one chunk
+with fastfact.range_product. The partial products are then merged
+pairwise, level by level, as a balanced tree. Every level runs in the
+pool, the final multiplication included: CPython holds the GIL while it
+multiplies big ints, so doing that in the caller would freeze a Tk app
+for seconds. progress(done, total) is called after every finished job.
+Setting cancel_event abandons the computation within a poll interval;
+with a private pool the worker processes are terminated as well, so a
+multiplication already running does not carry on.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from operator import mul
+
+import fastfact
+
+# below this n the pool start-up costs more than it saves
+MIN_PARALLEL_N = 20_000
+
+
+class FactorialCancelled(Exception):
+    """Raised when cancel_event is set while parallel_factorial runs."""
+
+
+def split_range(lo, hi, parts):
+    """Cut [lo, hi) into `parts` contiguous, nearly equal ranges."""
+    parts = max(1, min(parts, hi - lo))
+    step, extra = divmod(hi - lo, parts)
+    bounds = []
+    start = lo
+    for i in range(parts):
+        end = start + step + (1 if i < extra else 0)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def terminate_pool(executor):
+    """Kill a ProcessPoolExecutor's workers, abandoning the running jobs."""
+    terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    # before 3.14: kill the processes and let the pool notice they are gone;
+    # its still-pending futures fail with BrokenProcessPool. Older pools raise on
+    # futures that were already cancelled, so forget those first.
+    pending = executor._pending_work_items
+    for work_id, item in list(pending.items()):
+        if item.future.cancelled():
+            pending.pop(work_id, None)
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False)
+
+
+def _run(executor, jobs, progress, cancel_event, done_before, total, cancel_pending=True):
+    """Submit (fn, a, b) jobs, wait for all, return results in order."""
+    futures = {executor.submit(fn, a, b): i for i, (fn, a, b) in enumerate(jobs)}
+    results = [None] * len(jobs)
+    pending = set(futures)
+    done_count = done_before
+    while pending:
+        finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+        if cancel_event is not None and cancel_event.is_set():
+            if cancel_pending:  # (a pool about to be terminated fails them itself)
+                for f in pending:
+                    f.cancel()
+            raise FactorialCancelled()
+        for f in finished:
+            results[futures[f]] = f.result()
+            done_count += 1
+            if progress is not None:
+                progress(done_count, total)
+    return results
+
+
+def parallel_factorial(n, workers=4, chunks_per_worker=4, progress=None,
+                       cancel_event=None, executor=None):
+    """n! using `workers` processes.
+
+    progress     -- optional callable(done_jobs, total_jobs)
+    cancel_event -- optional threading.Event; once set, pending jobs are
+                    dropped and FactorialCancelled is raised
+    executor     -- reuse an existing ProcessPoolExecutor instead of
+                    starting (and shutting down) a private one
+    """
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    if workers <= 1 or n < MIN_PARALLEL_N:
+        result = fastfact.factorial(n)
+        if progress is not None:
+            progress(1, 1)
+        return result
+
+    ranges = split_range(2, n + 1, workers * chunks_per_worker)
+    # leaf jobs + one job per pairwise merge at every tree level
+    total = 2 * len(ranges) - 1
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(workers)
+    try:
+        parts = _run(executor, [(fastfact.range_product, a, b) for a, b in ranges],
+                     progress, cancel_event, 0, total, not own_executor)
+        done = len(parts)
+        while len(parts) > 1:
+            pairs = [(mul, parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+            carry = [parts[-1]] if len(parts) % 2 else []
+            parts = _run(executor, pairs, progress, cancel_event, done, total, not own_executor) + carry
+            done += len(pairs)
+        return parts[0]
+    except FactorialCancelled:
+        if own_executor:
+            own_executor = False
+            terminate_pool(executor)
+        raise
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
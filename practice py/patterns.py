@@ -0,0 +1,221 @@
+# patterns.py
+"""
+All the que*.py star and number patterns in one place.
+
+    python patterns.py pyramid 5
+    python patterns.py number_pyramid 5000 > out.txt
+    python patterns.py hollow_diamond 20000 --out d.txt --backend numpy
+    python patterns.py              (asks for the shape and row size)
+
+Each shape is a generator that yields one finished row at a time. Rows
+are built with string multiplication and slicing, not one print() per
+cell. write_rows() collects rows into a single buffer and writes it out
+every BUFFER_SIZE characters, so memory stays at one row plus the
+buffer however many rows are asked for. The output is byte-for-byte
+what the original scripts print: every cell followed by a space.
+
+render_to_file() can also use the NumPy backend in patterns_np.py (star
+shapes only). It is opt-in: string multiplication already runs at memset
+speed, and in bench_patterns.py the broadcast masks come out slower at
+every size tried.
+"""
+
+import argparse
+import sys
+
+import patterns_np
+
+BUFFER_SIZE = 1 << 16
+BACKENDS = ("python", "numpy")
+
+STAR = "* "
+GAP = "  "
+
+
+def _stars(n):
+    return STAR * n
+
+
+def _hollow(n, full=False):
+    """n cells with stars only at both ends (or all stars if full)."""
+    if full or n <= 2:
+        return STAR * n
+    return STAR + GAP * (n - 2) + STAR
+
+
+# ---------------------- star shapes ----------------------
+def triangle(rows):  # que1
+    for i in range(1, rows + 1):
+        yield _stars(i)
+
+
+def inverted_triangle(rows):  # que2
+    for i in range(rows, 0, -1):
+        yield _stars(i)
+
+
+def pyramid(rows):  # que3
+    for i in range(1, rows + 1):
+        yield GAP * (rows - i) + _stars(2 * i - 1)
+
+
+def inverted_pyramid(rows):  # que4
+    for i in range(rows, 0, -1):
+        yield GAP * (rows - i) + _stars(2 * i - 1)
+
+
+def diamond(rows):  # que5
+    yield from pyramid(rows)
+    for i in range(rows - 1, 0, -1):
+        yield GAP * (rows - i) + _stars(2 * i - 1)
+
+
+def hollow_square(rows):  # que6
+    for i in range(1, rows + 1):
+        yield _hollow(rows, full=i == 1 or i == rows)
+
+
+def hollow_triangle(rows):  # que7
+    for i in range(1, rows + 1):
+        yield _hollow(i, full=i == rows)
+
+
+def hollow_inverted_triangle(rows):  # que8
+    for i in range(rows, 0, -1):
+        yield _hollow(i, full=i == rows)
+
+
+def hollow_pyramid(rows):  # que9
+    for i in range(1, rows + 1):
+        yield GAP * (rows - i) + _hollow(2 * i - 1, full=i == rows)
+
+
+def hollow_inverted_pyramid(rows):  # que10
+    for i in range(rows, 0, -1):
+        yield GAP * (rows - i) + _hollow(2 * i - 1, full=i == rows)
+
+
+def hollow_diamond(rows):  # que11
+    for i in range(1, rows + 1):
+        yield GAP * (rows - i) + _hollow(2 * i - 1)
+    for i in range(rows - 1, 0, -1):
+        yield GAP * (rows - i) + _hollow(2 * i - 1)
+
+
+# ---------------------- number shapes ----------------------
+def _count_len(n):
+    """len("1 2 ... n ") without building it."""
+    total, digits, start = 0, 1, 1
+    while start <= n:
+        end = min(n, start * 10 - 1)
+        total += (end - start + 1) * (digits + 1)
+        start *= 10
+        digits += 1
+    return total
+
+
+def _number_rows(rows, order, mirror, indent):
+    # the widest row is built once; every other row is a slice of it
+    up = " ".join(map(str, range(1, rows + 1))) + " " if rows else ""
+    down = " ".join(map(str, range(rows - 1, 0, -1))) + " " if rows > 1 else ""
+    for i in order:
+        row = up[:_count_len(i)]
+        if mirror:
+            row += down[len(down) - _count_len(i - 1):]
+        yield GAP * (rows - i) + row if indent else row
+
+
+def number_triangle(rows):  # que12
+    return _number_rows(rows, range(1, rows + 1), mirror=False, indent=False)
+
+
+def number_inverted_triangle(rows):  # que13
+    return _number_rows(rows, range(rows, 0, -1), mirror=False, indent=False)
+
+
+def number_pyramid(rows):  # qe14
+    return _number_rows(rows, range(1, rows + 1), mirror=True, indent=True)
+
+
+def number_inverted_pyramid(rows):  # que15
+    return _number_rows(rows, range(rows, 0, -1), mirror=True, indent=True)
+
+
+# name -> (generator, script it replaces)
+SHAPES = {
+    "triangle": (triangle, "que1.py"),
+    "inverted_triangle": (inverted_triangle, "que2.py"),
+    "pyramid": (pyramid, "que3.py"),
+    "inverted_pyramid": (inverted_pyramid, "que4.py"),
+    "diamond": (diamond, "que5.py"),
+    "hollow_square": (hollow_square, "que6.py"),
+    "hollow_triangle": (hollow_triangle, "que7.py"),
+    "hollow_inverted_triangle": (hollow_inverted_triangle, "que8.py"),
+    "hollow_pyramid": (hollow_pyramid, "que9.py"),
+    "hollow_inverted_pyramid": (hollow_inverted_pyramid, "que10.py"),
+    "hollow_diamond": (hollow_diamond, "que11.py"),
+    "number_triangle": (number_triangle, "que12.py"),
+    "number_inverted_triangle": (number_inverted_triangle, "que13.py"),
+    "number_pyramid": (number_pyramid, "qe14.py"),
+    "number_inverted_pyramid": (number_inverted_pyramid, "que15.py"),
+}
+
+
+# ---------------------- output ----------------------
+def write_rows(rows, out=None, buffer_size=BUFFER_SIZE):
+    """Write each row plus a newline to out, in buffer_size-sized writes."""
+    out = sys.stdout if out is None else out
+    pending = []
+    size = 0
+    for row in rows:
+        pending.append(row)
+        size += len(row) + 1
+        if size >= buffer_size:
+            pending.append("")
+            out.write("\n".join(pending))
+            pending = []
+            size = 0
+    if pending:
+        pending.append("")
+        out.write("\n".join(pending))
+    out.flush()
+
+
+def render(shape, rows, out=None, buffer_size=BUFFER_SIZE):
+    """Print the named shape with the given row count."""
+    make, _ = SHAPES[shape]
+    write_rows(make(rows), out, buffer_size)
+
+
+def render_to_file(shape, rows, path, backend="python"):
+    """Write the named shape to path with the chosen backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}")
+    if backend == "numpy":
+        if shape not in patterns_np.GRIDS:
+            raise ValueError(f"the numpy backend has no {shape!r} shape")
+        return patterns_np.render_to_file(shape, rows, path)
+    with open(path, "w", newline="\n") as f:
+        render(shape, rows, f)
+    return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+        parser.add_argument("shape", choices=SHAPES)
+        parser.add_argument("rows", type=int)
+        parser.add_argument("--out", help="write to this file instead of stdout")
+        parser.add_argument("--backend", choices=BACKENDS, default="python",
+                            help="only used with --out")
+        args = parser.parse_args()
+        if args.out:
+            render_to_file(args.shape, args.rows, args.out, args.backend)
+        else:
+            render(args.shape, args.rows)
+    else:
+        print("Shapes:", ", ".join(SHAPES))
+        shape = input("Enter the shape: ").strip()
+        if shape not in SHAPES:
+            sys.exit(f"unknown shape {shape!r}")
+        render(shape, int(input("Enter the row size for the pattern: ")))
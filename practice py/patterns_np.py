@@ -0,0 +1,161 @@
+# patterns_np.py
+"""
+NumPy backend for the star shapes in patterns.py, for very large renders.
+
+    import patterns
+    patterns.render_to_file("hollow_diamond", 20000, "diamond.txt", backend="numpy")
+
+Every output line is `lead` blank cells followed by `width` cells, and
+each cell is "* " or "  ". For a block of lines, the star mask comes
+from broadcasting the line numbers i (a column) against the cell
+numbers k (a row). The border test in que9.py, for example, becomes
+(k == 1) | (k == 2*i - 1) | (i == rows). The mask is turned into a
+byte grid. The ragged tails past each line's newline are dropped with
+one boolean index, and the bytes go straight into a memory-mapped
+output file. Number shapes have variable-width cells and stay on the
+pure-Python path.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # patterns.py falls back to the pure-Python rows
+    np = None
+
+BLOCK_BYTES = 1 << 21  # grid bytes per block; index temporaries are ~10x this
+
+_STAR, _SPACE, _NEWLINE = ord("*"), ord(" "), ord("\n")
+
+
+def _ups(rows):
+    return np.arange(1, rows + 1, dtype=np.int64)
+
+
+def _downs(rows):
+    return np.arange(rows, 0, -1, dtype=np.int64)
+
+
+def _diamond_lines(rows):
+    return np.concatenate([_ups(rows), _downs(rows - 1)])
+
+
+def _no_lead(i, rows):
+    return np.zeros_like(i)
+
+
+def _centred(i, rows):
+    return rows - i
+
+
+def _row_width(i, rows):
+    return i
+
+
+def _odd_width(i, rows):
+    return 2 * i - 1
+
+
+def _square_width(i, rows):
+    return np.full_like(i, rows)
+
+
+def _square_border(i, k, rows):  # que6
+    return (i == 1) | (i == rows) | (k == 1) | (k == rows)
+
+
+def _triangle_border(i, k, rows):  # que7, que8
+    return (k == 1) | (i == rows) | (k == i)
+
+
+def _pyramid_border(i, k, rows):  # que9, que10
+    return (k == 1) | (k == 2 * i - 1) | (i == rows)
+
+
+def _diamond_border(i, k, rows):  # que11
+    return (k == 1) | (k == 2 * i - 1)
+
+
+# name -> (line numbers i, lead(i), width(i), star(i, k) or None for all stars)
+GRIDS = {
+    "triangle": (_ups, _no_lead, _row_width, None),
+    "inverted_triangle": (_downs, _no_lead, _row_width, None),
+    "pyramid": (_ups, _centred, _odd_width, None),
+    "inverted_pyramid": (_downs, _centred, _odd_width, None),
+    "diamond": (_diamond_lines, _centred, _odd_width, None),
+    "hollow_square": (_ups, _no_lead, _square_width, _square_border),
+    "hollow_triangle": (_ups, _no_lead, _row_width, _triangle_border),
+    "hollow_inverted_triangle": (_downs, _no_lead, _row_width, _triangle_border),
+    "hollow_pyramid": (_ups, _centred, _odd_width, _pyramid_border),
+    "hollow_inverted_pyramid": (_downs, _centred, _odd_width, _pyramid_border),
+    "hollow_diamond": (_diamond_lines, _centred, _odd_width, _diamond_border),
+}
+
+
+def available():
+    return np is not None
+
+
+def _require():
+    if np is None:
+        raise RuntimeError("the numpy backend needs NumPy installed")
+
+
+def _block_bytes(i, lead, width, star, rows):
+    """Concatenated output bytes for the lines i (a 1-D block)."""
+    # int32 keeps the (lines x cells) index temporaries at half the size
+    i, lead, width = i.astype(np.int32), lead.astype(np.int32), width.astype(np.int32)
+    cells = lead + width
+    ncols = int(cells.max())
+    c = np.arange(ncols, dtype=np.int32)[None, :]
+    k = c - lead[:, None] + 1
+    mask = (k >= 1) & (c < cells[:, None])
+    if star is not None:
+        mask &= star(i[:, None], k, rows)
+    grid = np.full((len(i), 2 * ncols + 1), _SPACE, dtype=np.uint8)
+    grid[:, 0:2 * ncols:2][mask] = _STAR
+    ends = 2 * cells
+    grid[np.arange(len(i)), ends] = _NEWLINE
+    # row-major boolean indexing keeps each line up to its newline, in order
+    keep = np.arange(2 * ncols + 1, dtype=np.int32)[None, :] <= ends[:, None]
+    return grid[keep]
+
+
+def iter_blocks(shape, rows, block_bytes=BLOCK_BYTES):
+    """Yield (offset, uint8 array) blocks that together make the output."""
+    _require()
+    lines_of, lead_of, width_of, star = GRIDS[shape]
+    i = lines_of(rows)
+    lead = lead_of(i, rows)
+    width = width_of(i, rows)
+    line_bytes = 2 * (lead + width) + 1
+    offsets = np.concatenate([[0], np.cumsum(line_bytes)])
+    # lines per block so the full-width grid fits in block_bytes (at least one)
+    per_block = max(1, block_bytes // int(line_bytes.max())) if len(i) else 1
+    start = 0
+    while start < len(i):
+        stop = min(len(i), start + per_block)
+        sl = slice(start, stop)
+        yield int(offsets[start]), _block_bytes(i[sl], lead[sl], width[sl], star, rows)
+        start = stop
+
+
+def total_bytes(shape, rows):
+    _require()
+    lines_of, lead_of, width_of, _ = GRIDS[shape]
+    i = lines_of(rows)
+    return int((2 * (lead_of(i, rows) + width_of(i, rows)) + 1).sum())
+
+
+def render_to_file(shape, rows, path, block_bytes=BLOCK_BYTES):
+    """Write the shape to path through a memory map, one block at a time."""
+    size = total_bytes(shape, rows)
+    if size == 0:
+        open(path, "wb").close()
+        return path
+    out = np.memmap(path, dtype=np.uint8, mode="w+", shape=(size,))
+    try:
+        for offset, block in iter_blocks(shape, rows, block_bytes):
+            out[offset:offset + len(block)] = block
+        out.flush()
+    finally:
+        del out
+    return path
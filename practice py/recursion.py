@@ -1,12 +1,19 @@
 # factorial_recursion.py
+import fastfact
+
 def factorial(n):
-    """Return n! for n >= 0 using recursion. Raises ValueError for negative n."""
-    if n < 0:
-        raise ValueError("n must be >= 0")
-    if n == 0 or n == 1:
-        return 1
-    return n * factorial(n - 1)
+    """Return n! for n >= 0 by recursive binary splitting. Raises ValueError for negative n.
+
+    Splitting 1..n in halves recurses only log2(n) deep, so large n no
+    longer hits the recursion limit.
+    """
+    return fastfact.factorial_split(n)
+
+def factorials(ns):
+    """Return [n! for n in ns], sharing one running product across the batch."""
+    return fastfact.factorials(ns)
 
 if __name__ == "__main__":
-    for x in [0, 1, 5, 7]:
-        print(f"{x}! = {factorial(x)}")
\ No newline at end of file
+    xs = [0, 1, 5, 7]
+    for x, fx in zip(xs, factorials(xs)):
+        print(f"{x}! = {fx}")
\ No newline at end of file
@@ -0,0 +1,139 @@
+# taskbackends.py
+"""
+One interface over three ways of running many worker(name, count) jobs.
+
+    import taskbackends
+    backend = taskbackends.make_backend("async", concurrency=100)
+    timings = backend.map(taskbackends.io_worker, [("Task-1", 4), ("Task-2", 3)])
+    # [(result, seconds the job ran), ...] in job order
+
+    taskbackends.run("process", "cpu", jobs, concurrency=4)
+
+thread   taskpool.TaskPool. Blocking calls such as time.sleep overlap,
+         but the GIL serialises pure-Python CPU work.
+async    asyncio.gather over all jobs, with an asyncio.Semaphore letting
+         `concurrency` run at once. A thread costs megabytes of stack;
+         a coroutine costs a few KB, so thousands of waits are cheap. A
+         job that computes without awaiting blocks the whole loop.
+process  ProcessPoolExecutor.map in chunks. CPU work runs in parallel
+         across cores. Every worker is a whole interpreter, and the jobs
+         and results are pickled.
+
+A workload is a named pair of worker functions: a plain one, and a
+coroutine one for the async backend. "io" sleeps like the worker in
+multi thrading.py. "cpu" spends the same number of steps on arithmetic.
+It has no coroutine form, because awaiting does not make arithmetic any
+faster.
+"""
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import taskpool
+
+IO_DELAY = 0.001   # seconds per step of the io worker
+CPU_STEP = 20_000  # loop iterations per step of the cpu worker
+
+
+# ---------------------- workers ----------------------
+def io_worker(name, count, delay=IO_DELAY):
+    for _ in range(count):
+        time.sleep(delay)  # simulate I/O
+    return name
+
+
+async def async_io_worker(name, count, delay=IO_DELAY):
+    for _ in range(count):
+        await asyncio.sleep(delay)
+    return name
+
+
+def cpu_worker(name, count, step=CPU_STEP):
+    total = 0
+    for _ in range(count):
+        for i in range(step):
+            total += i * i % 7
+    return name, total
+
+
+WORKLOADS = {
+    "io": (io_worker, async_io_worker),
+    "cpu": (cpu_worker, None),
+}
+
+
+def _timed_call(fn, args):
+    # module level so the process backend can pickle it
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+# ---------------------- backends ----------------------
+class ThreadBackend:
+    name = "thread"
+
+    def __init__(self, concurrency, queue_size=1000):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+
+    def map(self, fn, jobs):
+        with taskpool.TaskPool(self.concurrency, self.queue_size) as pool:
+            futures = [pool.submit(_timed_call, fn, job) for job in jobs]
+            return [f.result() for f in futures]
+
+
+class AsyncBackend:
+    name = "async"
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+
+    def map(self, fn, jobs):
+        return asyncio.run(self._gather(fn, jobs))
+
+    async def _gather(self, fn, jobs):
+        limit = asyncio.Semaphore(self.concurrency)
+        is_coroutine = inspect.iscoroutinefunction(fn)
+
+        async def one(job):
+            async with limit:
+                start = time.perf_counter()
+                result = await fn(*job) if is_coroutine else fn(*job)
+                return result, time.perf_counter() - start
+
+        return await asyncio.gather(*(one(job) for job in jobs))
+
+
+class ProcessBackend:
+    name = "process"
+
+    def __init__(self, concurrency, chunks_per_worker=4):
+        self.concurrency = concurrency
+        self.chunks_per_worker = chunks_per_worker
+
+    def map(self, fn, jobs):
+        jobs = list(jobs)
+        chunksize = max(1, len(jobs) // (self.concurrency * self.chunks_per_worker))
+        with ProcessPoolExecutor(self.concurrency) as pool:
+            return list(pool.map(_timed_call, repeat(fn), jobs, chunksize=chunksize))
+
+
+BACKENDS = {b.name: b for b in (ThreadBackend, AsyncBackend, ProcessBackend)}
+
+
+def make_backend(name, concurrency, **options):
+    try:
+        return BACKENDS[name](concurrency, **options)
+    except KeyError:
+        raise ValueError(f"unknown backend {name!r}; pick one of {sorted(BACKENDS)}") from None
+
+
+def run(backend, workload, jobs, concurrency, **options):
+    """Run jobs of a named workload on a named backend; [(result, seconds), ...]."""
+    plain, coroutine = WORKLOADS[workload]
+    fn = coroutine if backend == "async" and coroutine is not None else plain
+    return make_backend(backend, concurrency, **options).map(fn, jobs)
@@ -0,0 +1,187 @@
+# taskpool.py
+"""
+Fixed thread pool with a bounded queue, per-task timeouts and metrics.
+
+    import taskpool
+    with taskpool.TaskPool(workers=8, queue_size=100) as pool:
+        future = pool.submit(worker, "Thread-A", 4, timeout=10)
+        future.result()
+        print(pool.stats())
+
+All `workers` threads start up front and take tasks from one queue. At
+most `queue_size` tasks may wait in it. When it is full, submit()
+blocks until a worker takes a task, so a fast producer is slowed to the
+workers' pace (backpressure) instead of piling up futures. It gives up
+after `block_timeout` seconds (None waits forever) with QueueFull;
+block=False raises at once.
+
+Each task gets a concurrent.futures.Future. timeout= is a deadline for
+the task to start. A task that is still queued when it passes is not
+run, and its future raises TaskTimeout. A running thread cannot be
+interrupted, so use future.result(timeout) to stop waiting for a slow
+one.
+
+shutdown(wait=True) refuses new tasks, lets the workers finish what is
+already queued, then joins them. cancel_futures=True cancels the queued
+tasks instead. The with-block calls shutdown(wait=True).
+
+stats() reports:
+- queue depth, now and at its highest;
+- time spent queued and running, as histogram.Histogram percentiles;
+- utilisation, each worker's busy share of the pool's lifetime.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future
+
+from histogram import DEFAULT_BUCKETS, Histogram
+
+_STOP = object()
+
+
+class QueueFull(Exception):
+    """Raised by submit() when the queue stayed full for block_timeout."""
+
+
+class TaskTimeout(Exception):
+    """Set on a future whose task was still queued when its timeout passed."""
+
+
+class TaskPool(Executor):
+    def __init__(self, workers=8, queue_size=1000, block_timeout=None,
+                 buckets=DEFAULT_BUCKETS, name="task"):
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be >= 1")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.block_timeout = block_timeout
+        # the queue itself is unbounded so shutdown's stop markers never
+        # wait; the semaphore holds one slot per queued task
+        self._queue = queue.SimpleQueue()
+        self._slots = threading.Semaphore(queue_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._started = time.perf_counter()
+        self._busy = [0.0] * workers
+        self._waited = Histogram(buckets)
+        self._ran = Histogram(buckets)
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0,
+                       "cancelled": 0, "expired": 0, "rejected": 0}
+        self._max_depth = 0
+        self._threads = [threading.Thread(target=self._work, args=(i,), name=f"{name}-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    # ---------------------- submitting ----------------------
+    def submit(self, fn, /, *args, timeout=None, block=True, **kwargs):
+        """Queue fn(*args, **kwargs) and return its Future.
+
+        timeout -- seconds the task may wait in the queue before it expires
+        block   -- wait for a free slot (up to block_timeout) when full
+        """
+        if self._closed:
+            raise RuntimeError("cannot submit to a pool that is shut down")
+        if not self._slots.acquire(block, self.block_timeout if block else None):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise QueueFull(f"{self.queue_size} tasks already queued")
+        future = Future()
+        now = time.perf_counter()
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise RuntimeError("cannot submit to a pool that is shut down")
+            # under the lock, so every task is queued before shutdown's markers
+            self._queue.put((future, fn, args, kwargs, now, None if timeout is None else now + timeout))
+            self._stats["submitted"] += 1
+            depth = self._queue.qsize()
+            if depth > self._max_depth:
+                self._max_depth = depth
+        return future
+
+    # ---------------------- workers ----------------------
+    def _work(self, index):
+        get, release = self._queue.get, self._slots.release
+        while True:
+            item = get()
+            if item is _STOP:
+                return
+            release()
+            future, fn, args, kwargs, queued_at, deadline = item
+            start = time.perf_counter()
+            if not future.set_running_or_notify_cancel():
+                outcome = "cancelled"
+            elif deadline is not None and start > deadline:
+                future.set_exception(TaskTimeout(f"queued for {start - queued_at:.3f}s"))
+                outcome = "expired"
+            else:
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                    outcome = "failed"
+                else:
+                    future.set_result(result)
+                    outcome = "completed"
+            end = time.perf_counter()
+            with self._lock:
+                self._stats[outcome] += 1
+                self._waited.add(start - queued_at)
+                if outcome in ("completed", "failed"):
+                    self._ran.add(end - start)
+                    self._busy[index] += end - start
+            del item, future, fn, args, kwargs  # don't keep the last task alive
+
+    # ---------------------- shutdown ----------------------
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            first = not self._closed
+            self._closed = True
+            if first:
+                if cancel_futures:
+                    self._cancel_queued_locked()
+                for _ in self._threads:
+                    self._queue.put(_STOP)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _cancel_queued_locked(self):
+        kept = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP or not item[0].cancel():
+                kept.append(item)
+                continue
+            self._slots.release()
+            self._stats["cancelled"] += 1
+        for item in kept:
+            self._queue.put(item)
+
+    # ---------------------- metrics ----------------------
+    @property
+    def queue_depth(self):
+        """Tasks submitted but not yet picked up by a worker."""
+        return self._queue.qsize()
+
+    def stats(self):
+        """Plain-dict snapshot of the counters, histograms and utilisation."""
+        elapsed = max(time.perf_counter() - self._started, 1e-9)
+        with self._lock:
+            busy = [b / elapsed for b in self._busy]
+            return dict(
+                self._stats,
+                workers=self.workers,
+                queue_depth=self._queue.qsize(),
+                max_queue_depth=self._max_depth,
+                queued=self._waited.as_dict(),
+                run=self._ran.as_dict(),
+                utilisation=sum(busy) / len(busy),
+                worker_utilisation=busy,
+            )
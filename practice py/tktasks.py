@@ -0,0 +1,192 @@
+# tktasks.py
+"""
+Run blocking work off the Tk main thread.
+
+    runner = TkTaskRunner(root)
+    runner.submit(verify_user, user, pwd, on_done=show_result)
+
+Jobs run on a thread pool ("io") or a process pool ("cpu"). Workers never
+touch Tk: finished futures are pushed onto a queue which the Tk thread
+drains every `poll_ms` via after(), and the on_done / on_error /
+on_progress callbacks run there. A cap on in-flight tasks keeps a user
+hammering a button from queueing unbounded work.
+"""
+
+import queue
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+
+from parfact import terminate_pool
+
+
+class TooManyTasks(Exception):
+    """Raised by submit() when max_in_flight tasks are already running."""
+
+
+class TaskHandle:
+    def __init__(self, runner, kind, on_done, on_error, on_progress, busy):
+        self._runner = runner
+        self.kind = kind
+        self.executor = None
+        self.future = None
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.busy = busy
+        self._busy_shown = False
+        self.cancelled = False
+        # seen by tasks submitted with control=True
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Cancel the task; if it already started, its result is discarded."""
+        self._runner.cancel(self)
+
+    def report(self, *progress):
+        """Called from the worker thread; delivered to on_progress on the Tk thread."""
+        self._runner._finished.put((self, "progress", progress))
+
+    @property
+    def done(self):
+        return self.future.done()
+
+
+class TkTaskRunner:
+    def __init__(self, root, io_workers=4, cpu_workers=None, max_in_flight=8, poll_ms=50):
+        self.root = root
+        self.max_in_flight = max_in_flight
+        self.poll_ms = poll_ms
+        self._io = ThreadPoolExecutor(io_workers, thread_name_prefix="tk-io")
+        self._cpu_workers = cpu_workers
+        self._cpu = None  # process pool is started on first cpu task
+        self._finished = queue.Queue()
+        self._in_flight = set()
+        self._polling = False
+        self._closed = False
+
+    @property
+    def in_flight(self):
+        return len(self._in_flight)
+
+    def submit(self, fn, *args, kind="io", on_done=None, on_error=None,
+               on_progress=None, busy=None, control=False):
+        """Schedule fn(*args) and return a TaskHandle.
+
+        kind    -- "io" for blocking I/O (threads), "cpu" for heavy computation
+                   (processes; fn and args must be picklable)
+        busy    -- optional callable(bool) toggled around the task, e.g. to
+                   disable buttons and show a spinner
+        control -- ("io" only) call fn(*args, progress=..., cancel_event=...)
+                   so it can report to on_progress and stop when cancelled
+        """
+        if self._closed:
+            raise RuntimeError("task runner is shut down")
+        if len(self._in_flight) >= self.max_in_flight:
+            raise TooManyTasks(f"{self.max_in_flight} tasks already running")
+        if control and kind != "io":
+            raise ValueError("control=True needs a thread ('io') task")
+        handle = TaskHandle(self, kind, on_done, on_error, on_progress, busy)
+        executor = handle.executor = self._io if kind == "io" else self._get_cpu()
+        if control:
+            handle.future = executor.submit(fn, *args, progress=handle.report,
+                                            cancel_event=handle.cancel_event)
+        else:
+            handle.future = executor.submit(fn, *args)
+        self._in_flight.add(handle)
+        if busy is not None:
+            handle._busy_shown = True
+            busy(True)
+        # runs on the worker side; only hands the handle to the Tk thread
+        handle.future.add_done_callback(lambda _f: self._finished.put((handle, "done", None)))
+        self._schedule_poll()
+        return handle
+
+    def cancel(self, handle):
+        """Drop the task's result and turn its busy indicator off.
+
+        A queued task never starts. A running one keeps counting towards
+        max_in_flight until its future really finishes. For a running cpu
+        task, the process pool is terminated (and replaced on the next
+        submit) once no other live task is using it, so the worker stops
+        instead of holding a core and delaying exit.
+        """
+        if handle.cancelled:
+            return
+        handle.cancelled = True
+        handle.cancel_event.set()
+        self._hide_busy(handle)
+        if handle.future.cancel():
+            self._finish(handle)
+        elif handle.kind == "cpu" and not handle.future.done():
+            self._recycle_cpu(handle.executor)
+
+    def _get_cpu(self):
+        if self._cpu is None:
+            self._cpu = ProcessPoolExecutor(self._cpu_workers)
+        return self._cpu
+
+    def _recycle_cpu(self, pool):
+        if any(h.executor is pool and not h.cancelled for h in self._in_flight):
+            return  # live work still needs it; the cancelled job runs out
+        if self._cpu is pool:
+            self._cpu = None
+        # its futures now fail with BrokenProcessPool and are delivered
+        # (and ignored, being cancelled) by _poll
+        terminate_pool(pool)
+
+    # ---------------------- Tk side ----------------------
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        while True:
+            try:
+                handle, event, payload = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            if handle not in self._in_flight:
+                continue
+            if event == "progress":
+                if handle.on_progress is not None:
+                    handle.on_progress(*payload)
+            else:
+                self._deliver(handle)
+        if self._in_flight:
+            self._schedule_poll()
+
+    def _hide_busy(self, handle):
+        if handle._busy_shown:
+            handle._busy_shown = False
+            handle.busy(False)
+
+    def _finish(self, handle):
+        self._in_flight.discard(handle)
+        self._hide_busy(handle)
+
+    def _deliver(self, handle):
+        self._finish(handle)
+        if handle.cancelled:
+            return
+        try:
+            result = handle.future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            if handle.on_error is not None:
+                handle.on_error(e)
+            return
+        if handle.on_done is not None:
+            handle.on_done(result)
+
+    def shutdown(self):
+        """Cancel all work, terminate the cpu workers, stop the thread pool."""
+        self._closed = True
+        for handle in list(self._in_flight):
+            self.cancel(handle)
+        self._io.shutdown(wait=False, cancel_futures=True)
+        if self._cpu is not None:
+            terminate_pool(self._cpu)
+            self._cpu = None
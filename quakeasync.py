@@ -0,0 +1,155 @@
+# quakeasync.py
+"""
+Fetch many USGS summary feeds at once with asyncio.
+
+    import quakeasync
+    urls = quakeasync.feed_urls()                 # 5 levels x 4 periods = 20 feeds
+    quakes = quakeasync.merged_events(urls)       # newest copy of each feature id
+
+    async with quakeasync.FeedFetcher() as fetcher:
+        async for quake in fetcher.events(urls):
+            ...
+
+All requests share one aiohttp connection pool. The pool is capped at
+`limit` connections overall and `limit_per_host` per host, so polling
+twenty feeds on one host does not open twenty sockets. Each request has
+connect and total timeouts. Timeouts, connection errors, 429 and 5xx
+replies are retried with exponential backoff and full jitter (a random
+sleep in [0, backoff * 2**attempt]). The retries of different feeds
+therefore spread out instead of arriving together. events() yields
+compact quakestream.Quake records as each feed finishes. It skips a copy
+of an event that is no newer ("updated") than one already yielded, so a
+revision in a later feed comes through again; merged_events() keeps the
+newest copy of each, as quakestore and quakepoll do.
+"""
+
+import asyncio
+import random
+
+try:
+    import aiohttp
+except ImportError:  # only needed once a FeedFetcher is opened
+    aiohttp = None
+
+import quakestream
+
+FEED_BASE = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/"
+LEVELS = ("all", "1.0", "2.5", "4.5", "significant")
+PERIODS = ("hour", "day", "week", "month")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """A feed still failed after all retries."""
+
+    def __init__(self, url, cause):
+        super().__init__(f"{url}: {cause}")
+        self.url = url
+        self.cause = cause
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+def feed_urls(base=FEED_BASE, levels=LEVELS, periods=PERIODS):
+    return [f"{base}{level}_{period}.geojson" for level in levels for period in periods]
+
+
+class FeedFetcher:
+    """Async context manager holding the shared session and retry policy."""
+
+    def __init__(self, limit=20, limit_per_host=8, timeout=30.0, connect_timeout=10.0,
+                 retries=3, backoff=0.25, max_backoff=8.0):
+        if aiohttp is None:
+            raise RuntimeError("FeedFetcher needs aiohttp installed")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+        self._session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+        self._session = None
+
+    def _delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def fetch(self, url):
+        """Body bytes of url (gzip already decoded), retrying transient errors."""
+        for attempt in range(self.retries + 1):
+            self.stats["requests"] += 1
+            try:
+                async with self._session.get(url) as resp:
+                    if resp.status in RETRY_STATUSES:
+                        raise _RetryableStatus(resp.status)
+                    resp.raise_for_status()
+                    return await resp.read()
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                    asyncio.TimeoutError, _RetryableStatus) as e:
+                if attempt == self.retries:
+                    self.stats["failures"] += 1
+                    raise FetchError(url, e) from e
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._delay(attempt))
+            except aiohttp.ClientResponseError as e:  # 4xx: retrying won't help
+                self.stats["failures"] += 1
+                raise FetchError(url, e) from e
+
+    async def fetch_all(self, urls):
+        """{url: bytes or FetchError}, fetched concurrently."""
+        results = await asyncio.gather(*(self.fetch(u) for u in urls), return_exceptions=True)
+        return dict(zip(urls, results))
+
+    async def events(self, urls, errors=None):
+        """Merged Quake stream over all feeds.
+
+        An id is yielded when first seen and again whenever a later copy
+        has a larger "updated" (a missing one counts as oldest). Feeds are
+        parsed in the order they finish. A feed that fails is skipped and
+        its FetchError appended to `errors` (if given).
+        """
+        seen = {}  # id -> updated of the copy yielded
+        pending = [asyncio.ensure_future(self.fetch(u)) for u in urls]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                try:
+                    body = await next_done
+                except FetchError as e:
+                    if errors is not None:
+                        errors.append(e)
+                    continue
+                for quake in quakestream.iter_quakes([body]):
+                    updated = -1 if quake.updated is None else quake.updated
+                    if updated > seen.get(quake.id, -2):
+                        seen[quake.id] = updated
+                        yield quake
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _collect(urls, errors, **options):
+    async with FeedFetcher(**options) as fetcher:
+        newest = {}
+        async for quake in fetcher.events(urls, errors):
+            newest[quake.id] = quake  # a repeat is always a newer copy
+        return list(newest.values())
+
+
+def merged_events(urls=None, errors=None, **options):
+    """Blocking helper: the newest copy of every distinct event across urls."""
+    return asyncio.run(_collect(feed_urls() if urls is None else urls, errors, **options))
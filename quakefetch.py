@@ -0,0 +1,295 @@
+# quakefetch.py
+"""
+Cached, conditional fetching for the USGS GeoJSON feeds.
+
+    import quakefetch
+    data = quakefetch.fetch(url).json()
+
+Responses are stored on disk under CACHE_DIR, keyed by URL. While the
+stored copy is younger than the server's Cache-Control max-age it is
+returned without any request at all. After that the next fetch sends
+If-None-Match / If-Modified-Since, and a 304 reply only refreshes the
+stored headers. Requests go through one shared requests.Session, so
+TCP connections are pooled and kept alive. The Session asks for gzip
+and decodes it transparently.
+
+fetch(url, stream=True) hands a full download over as it arrives:
+iter_content() yields the network chunks, so quakestream can parse
+features before the body is complete, and finish() reads the rest and
+caches it.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CACHE_DIR = ".quake_cache"
+POOL_SIZE = 10
+TIMEOUT = 30
+
+
+# ---------------------- shared session ----------------------
+_session = None
+_session_lock = threading.Lock()
+
+
+def make_session(pool_size=POOL_SIZE):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = "gzip"
+    return session
+
+
+def get_session():
+    """Process-wide pooled Session, created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+# ---------------------- on-disk cache ----------------------
+def parse_cache_control(value):
+    """'max-age=60, public' -> {'max-age': '60', 'public': True}"""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+
+def _max_age(headers):
+    """Seconds the response may be reused without asking, or 0."""
+    cc = parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in cc or "no-store" in cc:
+        return 0
+    try:
+        return max(0, int(cc.get("max-age", 0)))
+    except ValueError:
+        return 0
+
+
+class FeedCache:
+    """URL -> (body, validators) store: one .body and one .json file per URL."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".body", base + ".json"
+
+    def load(self, url):
+        """(meta dict, body bytes) or None."""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path, meta):
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def store(self, url, body, headers):
+        if "no-store" in parse_cache_control(headers.get("Cache-Control")):
+            return
+        body_path, meta_path = self._paths(url)
+        tmp = body_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, body_path)
+        self._write_meta(meta_path, {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "max_age": _max_age(headers),
+        })
+
+    def refresh(self, url, meta, headers):
+        """After a 304: restart the freshness clock, keep the body."""
+        _, meta_path = self._paths(url)
+        meta = dict(meta, stored_at=time.time(), max_age=_max_age(headers))
+        meta["etag"] = headers.get("ETag") or meta.get("etag")
+        meta["last_modified"] = headers.get("Last-Modified") or meta.get("last_modified")
+        self._write_meta(meta_path, meta)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith((".body", ".json", ".tmp")):
+                os.remove(os.path.join(self.directory, name))
+
+
+class MemoryCache:
+    """FeedCache stand-in that keeps the last response per URL in memory.
+
+    For a process that polls and already holds the body: revalidation
+    still works, but no body is written to disk.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def load(self, url):
+        return self._entries.get(url)
+
+    def store(self, url, body, headers):
+        if "no-store" in parse_cache_control(headers.get("Cache-Control")):
+            return
+        self._entries[url] = ({
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "max_age": _max_age(headers),
+        }, body)
+
+    def refresh(self, url, meta, headers):
+        meta = dict(meta, stored_at=time.time(), max_age=_max_age(headers))
+        meta["etag"] = headers.get("ETag") or meta.get("etag")
+        meta["last_modified"] = headers.get("Last-Modified") or meta.get("last_modified")
+        self._entries[url] = (meta, self._entries[url][1])
+
+    def clear(self):
+        self._entries.clear()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(directory=CACHE_DIR):
+    cache = _caches.get(directory)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(directory, FeedCache(directory))
+    return cache
+
+
+# ---------------------- fetching ----------------------
+class FeedResponse:
+    """Body of a fetch plus where it came from.
+
+    source is "cache" (fresh copy, no request), "revalidated" (304) or
+    "network" (full 200 download).
+    """
+
+    def __init__(self, url, content, source):
+        self.url = url
+        self.content = content
+        self.source = source
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=64 * 1024):
+        """The body in pieces, like requests.Response.iter_content."""
+        view = memoryview(self.content)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+
+    def finish(self):
+        """The whole body (see StreamedFeedResponse)."""
+        return self.content
+
+    def __repr__(self):
+        return f"FeedResponse({self.url!r}, {len(self.content)} bytes, {self.source})"
+
+
+class StreamedFeedResponse(FeedResponse):
+    """A 200 read off the network as it is consumed.
+
+    The body is stored in the cache once it has been read to the end:
+    by iter_content(), or by finish() / .content, which read whatever is
+    left. A parser that stops at the closing brace leaves a few bytes
+    unread, so call finish() after it.
+    """
+
+    def __init__(self, url, resp, cache):
+        self.url = url
+        self.source = "network"
+        self._resp = resp
+        self._cache = cache
+        self._chunks = None
+        self._pieces = []
+        self._content = None
+
+    @property
+    def content(self):
+        return self.finish()
+
+    def finish(self):
+        if self._content is None:
+            for _ in self._read(64 * 1024):
+                pass
+        return self._content
+
+    def iter_content(self, chunk_size=64 * 1024):
+        if self._content is not None:
+            yield from super().iter_content(chunk_size)
+        else:
+            yield from self._read(chunk_size)
+
+    def _read(self, chunk_size):
+        if self._chunks is None:
+            self._chunks = self._resp.iter_content(chunk_size)
+        for piece in self._chunks:
+            self._pieces.append(piece)
+            yield piece
+        if self._content is None:
+            self._content = b"".join(self._pieces)
+            self._pieces = None
+            self._resp.close()
+            self._cache.store(self.url, self._content, self._resp.headers)
+
+
+def fetch(url, session=None, cache=None, timeout=TIMEOUT, force=False, stream=False):
+    """GET url through the disk cache.
+
+    force=True skips the freshness check (but still revalidates, so an
+    unchanged feed costs a 304, not a download). stream=True returns a
+    full download as a StreamedFeedResponse.
+    """
+    session = get_session() if session is None else session
+    cache = get_cache() if cache is None else cache
+    cached = cache.load(url)
+    headers = {}
+    if cached is not None:
+        meta, body = cached
+        if not force and time.time() - meta["stored_at"] < meta["max_age"]:
+            return FeedResponse(url, body, "cache")
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    resp = session.get(url, headers=headers, timeout=timeout, stream=stream)
+    if resp.status_code == 304 and cached is not None:
+        resp.close()
+        cache.refresh(url, meta, resp.headers)
+        return FeedResponse(url, body, "revalidated")
+    if stream:
+        if not resp.ok:
+            resp.close()
+        resp.raise_for_status()
+        return StreamedFeedResponse(url, resp, cache)
+    resp.raise_for_status()
+    cache.store(url, resp.content, resp.headers)
+    return FeedResponse(url, resp.content, "network")
@@ -0,0 +1,197 @@
+# quakeindex.py
+"""
+In-memory spatial index for nearest / within-radius earthquake queries.
+
+    import quakeindex
+    index = quakeindex.QuakeIndex(quakes)          # Quake tuples (lon, lat)
+    index.nearest(-122.42, 37.77, k=10)            # [(km, quake), ...]
+    index.within(-122.42, 37.77, 200)              # everything within 200 km
+    index.insert(new_quake)
+
+Points are stored as unit vectors (x, y, z) in a KD-tree. The straight
+chord between two points on the sphere grows with the great-circle
+distance, so the nearest points by chord are also the nearest on the
+globe, and a radius in km is simply a chord length. There is no
+wrap-around at the dateline and no distortion near the poles. Distances
+are converted back to km only for the results.
+
+The tree is bulk-built by median splits. New events go into a small
+unsorted buffer that every query also scans. Once the buffer outgrows
+REBUILD_FRACTION of the tree, everything is rebuilt, so an insert costs
+O(log n) amortised. Re-inserting an id replaces the earlier copy.
+"""
+
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+LEAF_SIZE = 16
+REBUILD_FRACTION = 0.125
+MIN_BUFFER = 256
+
+
+def to_xyz(lon, lat):
+    lon, lat = math.radians(lon), math.radians(lat)
+    c = math.cos(lat)
+    return (c * math.cos(lon), c * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def km_to_chord(km):
+    if km >= math.pi * EARTH_RADIUS_KM:
+        return 2.0
+    return 2 * math.sin(km / (2 * EARTH_RADIUS_KM))
+
+
+def haversine_km(lon1, lat1, lon2, lat2):
+    """Great-circle distance; what a brute-force scan computes per event."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class QuakeIndex:
+    def __init__(self, quakes=(), leaf_size=LEAF_SIZE):
+        self.leaf_size = leaf_size
+        self._items = []    # slot -> quake (None once replaced)
+        self._points = []   # slot -> (x, y, z)
+        self._slots = {}    # quake id -> live slot
+        self._root = None
+        self._buffer = []   # slots inserted since the last build
+        self._live = 0
+        self.rebuilds = 0
+        self.extend(quakes, rebuild=True)
+
+    def __len__(self):
+        return self._live
+
+    # ---------------------- building ----------------------
+    def _add(self, quake):
+        if quake.lon is None or quake.lat is None:
+            return None
+        old = self._slots.get(quake.id)
+        if old is not None:
+            self._items[old] = None
+            self._live -= 1
+        slot = len(self._items)
+        self._items.append(quake)
+        self._points.append(to_xyz(quake.lon, quake.lat))
+        if quake.id is not None:
+            self._slots[quake.id] = slot
+        self._live += 1
+        return slot
+
+    def extend(self, quakes, rebuild=False):
+        for quake in quakes:
+            slot = self._add(quake)
+            if slot is not None and not rebuild:
+                self._buffer.append(slot)
+        if rebuild or len(self._buffer) > max(MIN_BUFFER, REBUILD_FRACTION * self._live):
+            self.rebuild()
+
+    def insert(self, quake):
+        self.extend((quake,))
+
+    def rebuild(self):
+        """Drop replaced entries and rebuild the tree over everything."""
+        live = [(q, p) for q, p in zip(self._items, self._points) if q is not None]
+        self._items = [q for q, _ in live]
+        self._points = [p for _, p in live]
+        self._slots = {q.id: i for i, q in enumerate(self._items) if q.id is not None}
+        self._buffer = []
+        self._live = len(self._items)
+        self.rebuilds += 1
+        self._root = self._build(list(range(len(self._items)))) if self._items else None
+
+    def _build(self, slots):
+        if len(slots) <= self.leaf_size:
+            return (-1, slots)
+        points = self._points
+        # split on the axis with the widest spread, at the median
+        spreads = []
+        for axis in range(3):
+            values = [points[s][axis] for s in slots]
+            spreads.append(max(values) - min(values))
+        axis = spreads.index(max(spreads))
+        slots.sort(key=lambda s: points[s][axis])
+        mid = len(slots) // 2
+        return (axis, points[slots[mid]][axis], self._build(slots[:mid]), self._build(slots[mid:]))
+
+    # ---------------------- queries ----------------------
+    def nearest(self, lon, lat, k=10):
+        """The k closest events as (km, quake), closest first."""
+        if k <= 0 or not self._live:
+            return []
+        q = to_xyz(lon, lat)
+        heap = []  # (-chord^2, slot): the worst of the best k on top
+        items, points = self._items, self._points
+
+        def consider(slot):
+            if items[slot] is None:
+                return
+            p = points[slot]
+            d2 = (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2
+            if len(heap) < k:
+                heapq.heappush(heap, (-d2, slot))
+            elif d2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-d2, slot))
+
+        def search(node):
+            axis = node[0]
+            if axis < 0:
+                for slot in node[1]:
+                    consider(slot)
+                return
+            diff = q[axis] - node[1]
+            near, far = (node[2], node[3]) if diff < 0 else (node[3], node[2])
+            search(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                search(far)
+
+        if self._root is not None:
+            search(self._root)
+        for slot in self._buffer:
+            consider(slot)
+        found = sorted((-neg, slot) for neg, slot in heap)
+        return [(chord_to_km(math.sqrt(d2)), items[slot]) for d2, slot in found]
+
+    def within(self, lon, lat, radius_km):
+        """Every event within radius_km as (km, quake), closest first."""
+        if not self._live:
+            return []
+        q = to_xyz(lon, lat)
+        r = km_to_chord(radius_km)
+        r2 = r * r
+        items, points = self._items, self._points
+        found = []
+
+        def consider(slot):
+            if items[slot] is None:
+                return
+            p = points[slot]
+            d2 = (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2
+            if d2 <= r2:
+                found.append((d2, slot))
+
+        def search(node):
+            axis = node[0]
+            if axis < 0:
+                for slot in node[1]:
+                    consider(slot)
+                return
+            diff = q[axis] - node[1]
+            if diff - r <= 0:   # ball reaches the left side (< split)
+                search(node[2])
+            if diff + r >= 0:   # ball reaches the right side (>= split)
+                search(node[3])
+
+        if self._root is not None:
+            search(self._root)
+        for slot in self._buffer:
+            consider(slot)
+        found.sort()
+        return [(chord_to_km(math.sqrt(d2)), items[slot]) for d2, slot in found]
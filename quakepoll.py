@@ -0,0 +1,213 @@
+# quakepoll.py
+"""
+Poll a USGS feed and report only the events that are new or revised.
+
+    import quakepoll
+    poller = quakepoll.FeedPoller(url, sink=quakepoll.print_changes)
+    poller.run()                  # forever; poller.poll() runs a single cycle
+
+The poller remembers one thing per event: its "updated" timestamp, keyed
+by feature id. Each cycle compares the feed with that map and hands the
+sink a list of Change("insert" | "update", feature). Nothing else is
+printed or stored. The sink is any callable taking that list; see
+print_changes() and store_sink().
+
+A cycle costs little unless something changed. Fetches go through
+quakefetch with a MemoryCache, so an unchanged feed is a 304 and is
+not looked at again. A changed feed is not decoded as a whole. Regexes
+pull out every id and "updated" value, and the comparison with the
+previous map is a set difference of dict items. Both run in C. Only
+the features that differ are handed to the JSON decoder. If the feed
+does not have the expected layout, the cycle falls back to a full
+parse.
+
+The map is saved to STATE_PATH as an append-only log of "id<TAB>updated"
+lines, so a cycle writes one line per change. Once the log holds more
+than twice as many lines as the map has entries, it is rewritten from
+the map. The sink runs before anything is saved: after a crash, a
+change may be delivered twice, but never lost.
+
+The wait between polls halves after a cycle that found changes, down to
+min_interval. After a quiet cycle or an error it grows by half, up to
+max_interval.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+import requests
+
+import quakefetch
+
+STATE_PATH = ".quake_poll_state"
+MIN_INTERVAL = 15.0
+MAX_INTERVAL = 300.0
+BACKOFF = 1.5
+COMPACT_MIN = 1000  # never rewrite a log shorter than this
+
+Change = namedtuple("Change", "kind feature")  # kind is "insert" or "update"
+
+# the USGS layout: '{"type":"Feature",' opens each feature, the feature's
+# "id" is a plain string and "updated" (in its properties) a plain integer
+_FEATURE = re.compile(rb'\{\s*"type"\s*:\s*"Feature"\s*,')
+_ID = re.compile(rb'"id"\s*:\s*"([^"\\]*)"')
+_UPDATED = re.compile(rb'"updated"\s*:\s*(-?\d+)')
+
+
+# ---------------------- diffing ----------------------
+def _scan(body):
+    """(id -> updated, id -> feature text) by regex; None if the layout is unexpected."""
+    pieces = _FEATURE.split(body)[1:]
+    ids = _ID.findall(body)
+    updated = _UPDATED.findall(body)
+    if not len(pieces) == len(ids) == len(updated):
+        return None
+    ids = list(map(bytes.decode, ids))
+    current = dict(zip(ids, map(int, updated)))
+    if len(current) != len(ids):
+        return None  # a repeated id; let the full parse sort it out
+    return current, dict(zip(ids, pieces))
+
+
+def _decode(piece):
+    return json.JSONDecoder().raw_decode('{"type": "Feature",' + piece.decode())[0]
+
+
+def diff_feed(body, seen, parse=False):
+    """(changes, current) for feed bytes against the map id -> updated.
+
+    current is the feed's own map, except that an event whose copy is
+    older than what was seen keeps the newer timestamp.
+    """
+    scanned = None if parse else _scan(body)
+    if scanned is None:
+        features = {f.get("id"): f for f in json.loads(body)["features"]}
+        current = {i: f["properties"].get("updated") or 0 for i, f in features.items()}
+    else:
+        current, pieces = scanned
+    changed = []
+    for event_id, updated in current.items() - seen.items():
+        old = seen.get(event_id)
+        if old is None or updated > old:
+            changed.append(event_id)
+        else:
+            current[event_id] = old  # an older copy than the one already seen
+    if scanned is not None:
+        if len(changed) > len(current) // 4:
+            return diff_feed(body, seen, parse=True)  # decoding it all is quicker
+        features = {i: _decode(pieces[i]) for i in changed}
+        if any(f.get("id") != i or f["properties"].get("updated") != current[i]
+               for i, f in features.items()):
+            return diff_feed(body, seen, parse=True)
+    changes = [Change("update" if i in seen else "insert", features[i]) for i in changed]
+    changes.sort(key=lambda c: c.feature["properties"]["time"], reverse=True)
+    return changes, current
+
+
+# ---------------------- persisted state ----------------------
+class PollState:
+    """id -> updated map kept in an append-only log file."""
+
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        self.seen = {}
+        self._lines = 0
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    event_id, _, updated = line.rstrip("\n").partition("\t")
+                    try:
+                        self.seen[event_id] = int(updated)
+                    except ValueError:  # a line torn by a crash
+                        continue
+                    self._lines += 1
+        except FileNotFoundError:
+            pass
+
+    def save(self, current, changes):
+        """Make current the map, writing only the changed entries."""
+        self.seen = current
+        if self._lines > max(COMPACT_MIN, 2 * len(current)):
+            self.compact()
+        elif changes:
+            with open(self.path, "a") as f:
+                f.writelines(f"{c.feature['id']}\t{current[c.feature['id']]}\n" for c in changes)
+            self._lines += len(changes)
+
+    def compact(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            f.writelines(f"{i}\t{u}\n" for i, u in self.seen.items())
+        os.replace(tmp, self.path)
+        self._lines = len(self.seen)
+
+
+# ---------------------- sinks ----------------------
+def print_changes(changes):
+    for change in changes:
+        props = change.feature["properties"]
+        mark = "🌋" if change.kind == "insert" else "✏️ "
+        print(f"{mark} Magnitude {props.get('mag')} - {props.get('place')}")
+
+
+def store_sink(store):
+    """Sink that upserts the changed events into a quakestore.EventStore."""
+    def sink(changes):
+        store.ingest_features(change.feature for change in changes)
+    return sink
+
+
+# ---------------------- polling ----------------------
+class FeedPoller:
+    def __init__(self, url, sink=print_changes, state=None, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL, session=None, cache=None):
+        self.url = url
+        self.sink = sink
+        self.state = PollState() if state is None else state
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.session = session
+        self.cache = quakefetch.MemoryCache() if cache is None else cache
+        self.stats = {"cycles": 0, "unchanged": 0, "changes": 0, "errors": 0}
+        self._synced = False  # state matches the cached body
+
+    def poll(self):
+        """One cycle: fetch, diff, hand changes to the sink. Returns the changes."""
+        self.stats["cycles"] += 1
+        feed = quakefetch.fetch(self.url, session=self.session, cache=self.cache)
+        if feed.source != "network" and self._synced:
+            self.stats["unchanged"] += 1
+            return []
+        changes, current = diff_feed(feed.content, self.state.seen)
+        if changes:
+            self.sink(changes)
+        self.state.save(current, changes)
+        self._synced = True
+        self.stats["changes"] += len(changes)
+        return changes
+
+    def _next_interval(self, changed):
+        if changed:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * BACKOFF)
+        return self.interval
+
+    def run(self, cycles=None, sleep=time.sleep):
+        """Poll until interrupted (or for `cycles` cycles)."""
+        done = 0
+        while cycles is None or done < cycles:
+            try:
+                changed = bool(self.poll())
+            except (requests.RequestException, ValueError) as e:
+                self.stats["errors"] += 1
+                print(f"poll failed: {e}", file=sys.stderr)
+                changed = False
+            done += 1
+            if cycles is None or done < cycles:
+                sleep(self._next_interval(changed))
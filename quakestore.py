@@ -0,0 +1,186 @@
+# quakestore.py
+"""
+Persistent SQLite store for earthquake events.
+
+    import quakestore
+    store = quakestore.EventStore("quakes.db")
+    store.ingest_features(features)                 # upsert, one transaction
+    store.window(since_ms, until_ms, min_mag=2.5)
+    store.in_bbox(-125, 32, -114, 42)               # California-ish
+
+Events are keyed by the USGS feature id. Ingesting a feed again updates
+an event in place, for example a revised magnitude, but only when the
+incoming copy is at least as new ("updated" field; a copy without one
+counts as the oldest). Plain indexes on
+time and mag serve the window and threshold queries. An R-tree on
+(lon, lat), kept in step by triggers, serves the bounding-box query.
+Each ingest call is a single executemany in one transaction.
+"""
+
+import sqlite3
+import threading
+import time
+
+from quakestream import Quake
+
+DB_PATH = "quakes.db"
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS events (
+        id TEXT PRIMARY KEY,
+        time INTEGER NOT NULL,
+        updated INTEGER,
+        mag REAL,
+        place TEXT,
+        lon REAL,
+        lat REAL,
+        depth REAL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_events_time ON events (time)",
+    "CREATE INDEX IF NOT EXISTS idx_events_mag ON events (mag)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_geo USING rtree(rid, min_lon, max_lon, min_lat, max_lat)",
+    """CREATE TRIGGER IF NOT EXISTS events_geo_insert AFTER INSERT ON events
+       WHEN new.lon IS NOT NULL AND new.lat IS NOT NULL BEGIN
+           INSERT INTO events_geo VALUES (new.rowid, new.lon, new.lon, new.lat, new.lat);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS events_geo_update AFTER UPDATE OF lon, lat ON events
+       WHEN old.lon IS NOT new.lon OR old.lat IS NOT new.lat BEGIN
+           DELETE FROM events_geo WHERE rid = old.rowid;
+           INSERT INTO events_geo SELECT new.rowid, new.lon, new.lon, new.lat, new.lat
+               WHERE new.lon IS NOT NULL AND new.lat IS NOT NULL;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS events_geo_delete AFTER DELETE ON events BEGIN
+           DELETE FROM events_geo WHERE rid = old.rowid;
+       END""",
+)
+
+# an older copy of an event never overwrites a newer one; NULL is oldest
+UPSERT_SQL = """
+    INSERT INTO events (id, time, updated, mag, place, lon, lat, depth)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        time = excluded.time, updated = excluded.updated, mag = excluded.mag,
+        place = excluded.place, lon = excluded.lon, lat = excluded.lat, depth = excluded.depth
+    WHERE COALESCE(excluded.updated, -1) >= COALESCE(events.updated, -1)
+"""
+
+COLUMNS = "e.id, e.time, e.mag, e.place, e.lon, e.lat, e.depth"
+
+
+def feature_row(feature):
+    """UPSERT_SQL parameters from a GeoJSON feature dict."""
+    props = feature["properties"]
+    coords = list((feature.get("geometry") or {}).get("coordinates") or ()) + [None, None, None]
+    return (feature["id"], props["time"], props.get("updated"), props.get("mag"),
+            props.get("place"), coords[0], coords[1], coords[2])
+
+
+def quake_row(quake):
+    """UPSERT_SQL parameters from a quakestream.Quake."""
+    return (quake.id, quake.time, quake.updated, quake.mag, quake.place, quake.lon, quake.lat, quake.depth)
+
+
+class EventStore:
+    """Thread-local sqlite connections on one database file (cf. kunal.UserDB)."""
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-16000",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self.connection() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, cached_statements=64)
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---------------------- ingestion ----------------------
+    def upsert_rows(self, rows):
+        """Upsert an iterable of UPSERT_SQL tuples in one transaction."""
+        conn = self.connection()
+        with conn:
+            return conn.executemany(UPSERT_SQL, rows).rowcount
+
+    def ingest_features(self, features):
+        """Upsert GeoJSON feature dicts; returns the number of rows written."""
+        return self.upsert_rows(map(feature_row, features))
+
+    def ingest_quakes(self, quakes):
+        return self.upsert_rows(map(quake_row, quakes))
+
+    # ---------------------- queries ----------------------
+    def _query(self, where, params, limit, order="e.time DESC", table="events e"):
+        sql = f"SELECT {COLUMNS} FROM {table} WHERE {where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+        return [Quake(*row) for row in self.connection().execute(sql, params)]
+
+    def count(self):
+        return self.connection().execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def get(self, event_id):
+        rows = self._query("e.id = ?", (event_id,), None)
+        return rows[0] if rows else None
+
+    def recent(self, limit=5):
+        """Newest events first."""
+        return self._query("1", (), limit)
+
+    def window(self, since_ms, until_ms=None, min_mag=None, limit=None):
+        """Events with since_ms <= time < until_ms, newest first."""
+        until_ms = int(time.time() * 1000) + 1 if until_ms is None else until_ms
+        where, params = "e.time >= ? AND e.time < ?", (since_ms, until_ms)
+        if min_mag is not None:
+            where += " AND e.mag >= ?"
+            params += (min_mag,)
+        return self._query(where, params, limit)
+
+    def above(self, min_mag, since_ms=None, limit=None):
+        """Events with mag >= min_mag, strongest first."""
+        where, params = "e.mag >= ?", (min_mag,)
+        if since_ms is not None:
+            where += " AND e.time >= ?"
+            params += (since_ms,)
+        return self._query(where, params, limit, order="e.mag DESC, e.time DESC")
+
+    def in_bbox(self, min_lon, min_lat, max_lon, max_lat, since_ms=None, min_mag=None, limit=None):
+        """Events inside the box, newest first. min_lon > max_lon wraps the dateline."""
+        if min_lon > max_lon:
+            # two R-tree searches; an OR would leave the lon columns unindexed
+            halves = (self.in_bbox(min_lon, min_lat, 180.0, max_lat, since_ms, min_mag, limit)
+                      + self.in_bbox(-180.0, min_lat, max_lon, max_lat, since_ms, min_mag, limit))
+            halves.sort(key=lambda q: q.time, reverse=True)
+            return halves if limit is None else halves[:limit]
+        # the R-tree rounds its float32 boxes outwards, so ask it for overlap
+        # (no misses) and re-check the exact coordinates on the events row
+        where = ("g.max_lon >= ? AND g.min_lon <= ? AND g.max_lat >= ? AND g.min_lat <= ?"
+                 " AND e.lon BETWEEN ? AND ? AND e.lat BETWEEN ? AND ?")
+        params = (min_lon, max_lon, min_lat, max_lat, min_lon, max_lon, min_lat, max_lat)
+        if since_ms is not None:
+            where += " AND e.time >= ?"
+            params += (since_ms,)
+        if min_mag is not None:
+            where += " AND e.mag >= ?"
+            params += (min_mag,)
+        return self._query(where, params, limit,
+                           table="events_geo g JOIN events e ON e.rowid = g.rid")
@@ -0,0 +1,155 @@
+# quakestream.py
+"""
+Incremental parsing of USGS GeoJSON feeds.
+
+    import quakestream
+    for q in quakestream.stream_url(url, limit=5):
+        print(q.mag, q.place)
+
+iter_features() takes the body as an iterable of byte chunks (for
+example response.iter_content()). It yields each element of the top
+level "features" array as soon as that element's closing brace has
+arrived. Only the unparsed tail of the input is kept, so memory stays
+at about one chunk plus one feature, however big the feed is. Each
+feature is decoded with json's raw_decode, the same C scanner that
+.json() uses. Nothing past the last requested feature is read:
+breaking out of the loop, or passing limit=, closes the response.
+"""
+
+import codecs
+import json
+import re
+from collections import namedtuple
+
+import quakefetch
+
+CHUNK_SIZE = 64 * 1024
+
+Quake = namedtuple("Quake", "id time mag place lon lat depth updated", defaults=(None,))
+
+_WS = re.compile(r"[ \t\n\r]*")
+
+# parser states
+_START, _KEY, _COLON, _VALUE, _ITEMS, _DONE = range(6)
+
+
+class _Incomplete(Exception):
+    """The buffer ends before the next token does."""
+
+
+def iter_features(chunks, on_metadata=None):
+    """Yield feature dicts from a FeatureCollection arriving in chunks.
+
+    on_metadata(dict) is called for the top-level "metadata" object if it
+    comes before the features (it does in the USGS feeds).
+    """
+    text_of = codecs.getincrementaldecoder("utf-8")().decode
+    raw_decode = json.JSONDecoder().raw_decode
+    skip_ws = _WS.match
+    chunks = iter(chunks)
+    buf, pos, eof = "", 0, False
+    state, key = _START, None
+
+    def value_at(pos):
+        # a value that ends exactly at the end of the buffer may be cut
+        # short (a number, or "tru"), so wait for more unless at EOF
+        try:
+            value, end = raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            raise _Incomplete() from None
+        if end == len(buf) and not eof:
+            raise _Incomplete()
+        return value, end
+
+    while state != _DONE:
+        try:
+            while state != _DONE:
+                pos = skip_ws(buf, pos).end()
+                if pos >= len(buf):
+                    raise _Incomplete()
+                c = buf[pos]
+                if state == _START:
+                    if c != "{":
+                        raise ValueError("expected a JSON object")
+                    pos += 1
+                    state = _KEY
+                elif state == _KEY:
+                    if c == "}":
+                        state = _DONE
+                    elif c == ",":
+                        pos += 1
+                    else:
+                        key, pos = value_at(pos)
+                        state = _COLON
+                elif state == _COLON:
+                    if c != ":":
+                        raise ValueError(f"expected ':' at {pos}")
+                    pos += 1
+                    state = _VALUE
+                elif state == _VALUE:
+                    if key == "features":
+                        if c != "[":
+                            raise ValueError("'features' is not an array")
+                        pos += 1
+                        state = _ITEMS
+                    else:
+                        value, pos = value_at(pos)
+                        if key == "metadata" and on_metadata is not None:
+                            on_metadata(value)
+                        state = _KEY
+                elif state == _ITEMS:
+                    if c == "]":
+                        pos += 1
+                        state = _KEY
+                    elif c == ",":
+                        pos += 1
+                    else:
+                        feature, pos = value_at(pos)
+                        yield feature
+        except _Incomplete:
+            if eof:
+                raise ValueError("truncated GeoJSON document") from None
+            # drop what has been parsed, then read on
+            buf = buf[pos:]
+            pos = 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                buf += text_of(b"", final=True)
+            else:
+                buf += text_of(chunk)
+
+
+def compact(feature):
+    """The fields earthquake live.py needs, as a Quake tuple."""
+    props = feature["properties"]
+    coords = (feature.get("geometry") or {}).get("coordinates") or (None, None, None)
+    lon, lat, depth = (list(coords) + [None, None, None])[:3]
+    return Quake(feature.get("id"), props.get("time"), props.get("mag"), props.get("place"),
+                 lon, lat, depth, props.get("updated"))
+
+
+def iter_quakes(chunks, limit=None, min_mag=None):
+    """Compact records from chunks; stops reading after `limit` matches."""
+    if limit is not None and limit <= 0:
+        return
+    count = 0
+    for feature in iter_features(chunks):
+        quake = compact(feature)
+        if min_mag is not None and (quake.mag is None or quake.mag < min_mag):
+            continue
+        yield quake
+        count += 1
+        if limit is not None and count >= limit:
+            return
+
+
+def stream_url(url, session=None, limit=None, min_mag=None, chunk_size=CHUNK_SIZE,
+               timeout=quakefetch.TIMEOUT):
+    """Stream a feed straight off the network (gzip is decoded on the fly)."""
+    session = quakefetch.get_session() if session is None else session
+    with session.get(url, stream=True, timeout=timeout) as resp:
+        resp.raise_for_status()
+        yield from iter_quakes(resp.iter_content(chunk_size), limit, min_mag)
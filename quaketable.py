@@ -0,0 +1,154 @@
+# quaketable.py
+"""
+Columnar earthquake table on NumPy arrays.
+
+    import quaketable
+    table = quaketable.EventTable.from_features(features)
+    strong = table.filter(min_mag=4.5, since=now_ms - 86400000)
+    table.top_k(10)                        # strongest ten, strongest first
+    edges, counts = table.mag_histogram(0.5)
+    table.time_buckets(3600 * 1000)        # per-hour count / max / mean mag
+
+One array per field (id, time, mag, depth, lon, lat) replaces a list of
+nested dicts. Filters are boolean masks built from whole-column
+comparisons. Top-k uses argpartition, so only the k winners get
+sorted. Histograms and time buckets are computed with
+np.histogram / np.bincount instead of Python loops. A missing mag or
+depth is stored as NaN, so every comparison against it is False.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # the rest of the quake tools work without it
+    np = None
+
+import quakestream
+
+
+def _require():
+    if np is None:
+        raise RuntimeError("EventTable needs NumPy installed")
+
+
+def _float(value):
+    return float("nan") if value is None else value
+
+
+class EventTable:
+    def __init__(self, ids, time, mag, depth, lon, lat):
+        _require()
+        self.ids = np.asarray(ids, dtype="S")        # ASCII ids, 1 byte per char
+        self.time = np.asarray(time, dtype=np.int64)  # ms since the epoch
+        self.mag = np.asarray(mag, dtype=np.float64)
+        self.depth = np.asarray(depth, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.lat = np.asarray(lat, dtype=np.float64)
+
+    @classmethod
+    def from_quakes(cls, quakes):
+        ids, time, mag, depth, lon, lat = [], [], [], [], [], []
+        for q in quakes:
+            ids.append(q.id)
+            time.append(q.time)
+            mag.append(_float(q.mag))
+            depth.append(_float(q.depth))
+            lon.append(_float(q.lon))
+            lat.append(_float(q.lat))
+        return cls(ids, time, mag, depth, lon, lat)
+
+    @classmethod
+    def from_features(cls, features):
+        return cls.from_quakes(map(quakestream.compact, features))
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """Straight from the response bytes; no feature list is ever held."""
+        return cls.from_quakes(quakestream.iter_quakes(chunks))
+
+    def __len__(self):
+        return len(self.time)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.ids, self.time, self.mag, self.depth, self.lon, self.lat))
+
+    def take(self, index):
+        """New table with the rows picked by a mask or index array."""
+        return EventTable(self.ids[index], self.time[index], self.mag[index],
+                          self.depth[index], self.lon[index], self.lat[index])
+
+    def rows(self):
+        """(id, time, mag, depth, lon, lat) tuples, for printing."""
+        return [(i.decode(), *rest) for i, *rest in zip(
+            self.ids, self.time.tolist(), self.mag.tolist(), self.depth.tolist(),
+            self.lon.tolist(), self.lat.tolist())]
+
+    # ---------------------- filters ----------------------
+    def mask(self, min_mag=None, max_mag=None, since=None, until=None,
+             max_depth=None, bbox=None):
+        """Boolean row mask; bbox is (min_lon, min_lat, max_lon, max_lat)."""
+        keep = np.ones(len(self), dtype=bool)
+        if min_mag is not None:
+            keep &= self.mag >= min_mag
+        if max_mag is not None:
+            keep &= self.mag <= max_mag
+        if since is not None:
+            keep &= self.time >= since
+        if until is not None:
+            keep &= self.time < until
+        if max_depth is not None:
+            keep &= self.depth <= max_depth
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            if min_lon <= max_lon:
+                keep &= (self.lon >= min_lon) & (self.lon <= max_lon)
+            else:  # across the dateline
+                keep &= (self.lon >= min_lon) | (self.lon <= max_lon)
+            keep &= (self.lat >= min_lat) & (self.lat <= max_lat)
+        return keep
+
+    def filter(self, **conditions):
+        return self.take(self.mask(**conditions))
+
+    # ---------------------- aggregates ----------------------
+    def top_k(self, k=10, by="mag"):
+        """The k rows with the largest `by`, largest first (NaN never wins)."""
+        column = getattr(self, by)
+        if column.dtype.kind == "f":
+            column = np.where(np.isnan(column), -np.inf, column)
+        k = min(k, len(column))
+        if k <= 0:
+            return self.take(np.array([], dtype=np.intp))
+        part = np.argpartition(column, len(column) - k)[len(column) - k:]
+        return self.take(part[np.argsort(column[part])[::-1]])
+
+    def mag_histogram(self, bin_width=0.5):
+        """(bin edges, counts) over the known magnitudes."""
+        mags = self.mag[~np.isnan(self.mag)]
+        if not len(mags):
+            return np.array([0.0, bin_width]), np.array([0])
+        lo = np.floor(mags.min() / bin_width) * bin_width
+        hi = (np.floor(mags.max() / bin_width) + 1) * bin_width
+        edges = np.arange(lo, hi + bin_width / 2, bin_width)
+        counts, edges = np.histogram(mags, bins=edges)
+        return edges, counts
+
+    def time_buckets(self, bucket_ms=3600 * 1000):
+        """Per-bucket count, max and mean mag, oldest bucket first.
+
+        Returns a dict of equal-length arrays: start (ms), count,
+        max_mag, mean_mag. Only non-empty buckets appear.
+        """
+        keys = self.time // bucket_ms
+        starts, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(starts))
+        known = ~np.isnan(self.mag)
+        mag_sum = np.bincount(inverse[known], weights=self.mag[known], minlength=len(starts))
+        mag_n = np.bincount(inverse[known], minlength=len(starts))
+        max_mag = np.full(len(starts), -np.inf)
+        np.maximum.at(max_mag, inverse[known], self.mag[known])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_mag = mag_sum / mag_n
+        max_mag[mag_n == 0] = np.nan
+        return {"start": starts * bucket_ms, "count": counts,
+                "max_mag": max_mag, "mean_mag": mean_mag}
@@ -0,0 +1,270 @@
+# usgs_standin.py
+"""
+Local stand-in for the USGS GeoJSON summary feeds.
+
+Lets earthquake live.py and its helpers run without the network:
+
+    import usgs_standin
+    server = usgs_standin.StandinServer(latency=0.05).start()
+    url = server.url("all_day")          # http://127.0.0.1:<port>/.../all_day.geojson
+    ...
+    server.stop()
+
+Serves <level>_<period>.geojson for the levels all, 1.0, 2.5, 4.5 and
+significant, and the periods hour, day, week and month. Each feed is
+cut from one generated catalog in the real feed's layout, with
+"metadata" first, then "features" (newest first), then "bbox". Like
+the real server it sends ETag, Last-Modified and Cache-Control
+max-age, answers conditional requests with 304, and gzips the body
+when asked. rate= limits the send speed (bytes per second) so that
+streaming clients see the body arrive over time, and fail_rate= answers
+that fraction of requests with 503 to exercise client retries.
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FEED_PATH = "/earthquakes/feed/v1.0/summary/"
+PERIODS = {"hour": 3600, "day": 86400, "week": 7 * 86400, "month": 30 * 86400}
+LEVELS = {"all": None, "1.0": 1.0, "2.5": 2.5, "4.5": 4.5, "significant": 6.0}
+FEEDS = [f"{level}_{period}" for level in LEVELS for period in PERIODS]
+
+_PLACES = ["CA", "Alaska", "Hawaii", "Nevada", "Puerto Rico", "Japan", "Chile",
+           "Indonesia", "Tonga", "Peru", "Mexico", "Greece", "Turkey", "Iceland"]
+_NETS = ["ci", "ak", "hv", "nc", "nn", "pr", "us", "uw"]
+
+
+def make_feature(rng, now_ms, period_s, seq):
+    """One feature in the USGS summary format."""
+    net = rng.choice(_NETS)
+    code = f"{40000000 + seq}"
+    mag = round(min(9.0, rng.expovariate(1.1)), 2)
+    t = now_ms - rng.randrange(period_s * 1000)
+    lon = round(rng.uniform(-180, 180), 4)
+    lat = round(rng.uniform(-70, 70), 4)
+    depth = round(rng.uniform(-2, 300), 2)
+    place = f"{rng.randrange(1, 120)} km {rng.choice(['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW'])} of Somewhere, {rng.choice(_PLACES)}"
+    return {
+        "type": "Feature",
+        "properties": {
+            "mag": mag, "place": place, "time": t, "updated": t + rng.randrange(600000),
+            "tz": None,
+            "url": f"https://earthquake.usgs.gov/earthquakes/eventpage/{net}{code}",
+            "detail": f"https://earthquake.usgs.gov/earthquakes/feed/v1.0/detail/{net}{code}.geojson",
+            "felt": None, "cdi": None, "mmi": None, "alert": None,
+            "status": rng.choice(["automatic", "reviewed"]), "tsunami": 0,
+            "sig": int(mag * mag * 20), "net": net, "code": code,
+            "ids": f",{net}{code},", "sources": f",{net},",
+            "types": ",origin,phase-data,", "nst": rng.randrange(3, 80),
+            "dmin": round(rng.uniform(0, 2), 4), "rms": round(rng.uniform(0, 1), 2),
+            "gap": rng.randrange(20, 300), "magType": rng.choice(["ml", "md", "mb", "mww"]),
+            "type": "earthquake", "title": f"M {mag} - {place}",
+        },
+        "geometry": {"type": "Point", "coordinates": [lon, lat, depth]},
+        "id": f"{net}{code}",
+    }
+
+
+def make_catalog(count=10000, seed=1, now_ms=None, period="month"):
+    """count generated features spread over `period`, newest first."""
+    rng = random.Random(seed)
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    features = [make_feature(rng, now_ms, PERIODS[period], i) for i in range(count)]
+    features.sort(key=lambda f: f["properties"]["time"], reverse=True)
+    return features
+
+
+def feed_document(catalog, feed, now_ms=None):
+    """The FeatureCollection for feed (e.g. "2.5_week") cut from catalog."""
+    level, period = feed.rsplit("_", 1)
+    min_mag = LEVELS[level]
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    since = now_ms - PERIODS[period] * 1000
+    features = [f for f in catalog
+                if f["properties"]["time"] >= since
+                and (min_mag is None or f["properties"]["mag"] >= min_mag)]
+    coords = [f["geometry"]["coordinates"] for f in features] or [[0, 0, 0]]
+    return {
+        "type": "FeatureCollection",
+        "metadata": {
+            "generated": now_ms,
+            "url": f"https://earthquake.usgs.gov{FEED_PATH}{feed}.geojson",
+            "title": f"USGS {level} Earthquakes, Past {period.title()}",
+            "status": 200, "api": "1.10.3", "count": len(features),
+        },
+        "features": features,
+        "bbox": [min(c[0] for c in coords), min(c[1] for c in coords), min(c[2] for c in coords),
+                 max(c[0] for c in coords), max(c[1] for c in coords), max(c[2] for c in coords)],
+    }
+
+
+class StandinServer:
+    """Threaded HTTP server for the feeds. port=0 picks a free port."""
+
+    def __init__(self, catalog=None, latency=0.0, max_age=60, port=0, rate=None,
+                 fail_rate=0.0, seed=None):
+        self.latency = latency
+        self.rate = rate
+        self.fail_rate = fail_rate
+        self._rng = random.Random(seed)
+        self.max_age = max_age
+        self.hits = {}           # feed -> requests served
+        self.status_counts = {}  # HTTP status -> count
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._bodies = {}
+        self.set_catalog(make_catalog() if catalog is None else catalog)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}{FEED_PATH}"
+
+    def url(self, feed="all_day"):
+        return f"{self.base_url}{feed}.geojson"
+
+    def should_fail(self):
+        with self._lock:
+            return self.fail_rate and self._rng.random() < self.fail_rate
+
+    def set_catalog(self, catalog):
+        """Swap the data; every feed gets a new ETag and Last-Modified."""
+        with self._lock:
+            self._catalog = catalog
+            self._modified = time.time()
+            self._bodies.clear()
+
+    def body(self, feed):
+        """(json bytes, gzip bytes, etag, last-modified) for feed, built once per catalog."""
+        with self._lock:
+            entry = self._bodies.get(feed)
+            if entry is None:
+                raw = json.dumps(feed_document(self._catalog, feed)).encode()
+                etag = '"%s"' % hashlib.sha1(raw).hexdigest()[:16]
+                entry = (raw, gzip.compress(raw, 6), etag, self._modified)
+                self._bodies[feed] = entry
+            return entry
+
+    def _count(self, feed, status, sent):
+        with self._lock:
+            self.hits[feed] = self.hits.get(feed, 0) + 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.bytes_sent += sent
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _not_modified(headers, etag, modified):
+    tags = headers.get("If-None-Match")
+    if tags is not None:
+        return etag in [t.strip() for t in tags.split(",")] or tags.strip() == "*"
+    since = headers.get("If-Modified-Since")
+    if since is not None:
+        try:
+            return int(modified) <= parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so client pools are exercised
+
+        def handle_one_request(self):
+            try:
+                super().handle_one_request()
+            except (BrokenPipeError, ConnectionResetError):
+                # the client hung up mid-request or before the headers went out
+                self.close_connection = True
+
+        def do_GET(self):
+            if server.latency:
+                time.sleep(server.latency)
+            feed = self.path.split("?")[0]
+            if not (feed.startswith(FEED_PATH) and feed.endswith(".geojson")):
+                return self._send(404, None, b"not found")
+            feed = feed[len(FEED_PATH):-len(".geojson")]
+            if feed not in FEEDS:
+                return self._send(404, feed, b"not found")
+            if server.should_fail():
+                return self._send(503, feed, b"try again")
+            raw, packed, etag, modified = server.body(feed)
+            headers = {
+                "ETag": etag,
+                "Last-Modified": formatdate(modified, usegmt=True),
+                "Cache-Control": f"max-age={server.max_age}, public",
+            }
+            if _not_modified(self.headers, etag, modified):
+                return self._send(304, feed, b"", headers)
+            headers["Content-Type"] = "application/json"
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                headers["Content-Encoding"] = "gzip"
+                return self._send(200, feed, packed, headers)
+            return self._send(200, feed, raw, headers)
+
+        def _send(self, status, feed, body, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                if server.rate:
+                    piece = max(1, server.rate // 20)  # ~20 writes a second
+                    for start in range(0, len(body), piece):
+                        self.wfile.write(body[start:start + piece])
+                        time.sleep(piece / server.rate)
+                else:
+                    self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # client stopped reading early (e.g. a streaming parser with limit=)
+                self.close_connection = True
+            server._count(feed, status, len(body))
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    srv = StandinServer(make_catalog(args.events), latency=args.latency, port=args.port).start()
+    print("serving", srv.url("all_day"))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.stop()